@@ -0,0 +1,165 @@
+"""Load test: concurrent WebSocket sessions against the API with a stubbed LLM.
+
+Drives the ASGI app in-process — every session and a /health prober share
+one event loop, as they would under uvicorn — with the compiled agent chain
+replaced by ``StubChain``, whose "LLM calls" are blocking sleeps. Reports
+how long sessions waited for their first event and their full turn, the
+wall time against the fully serialized time, and /health latency under load.
+
+Usage:
+    python api/load_test.py                                 # 50 sessions, 3 x 200 ms LLM steps
+    python api/load_test.py --sessions 100 --llm-latency 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'cauldron-app'))
+
+import numpy as np
+
+# The stub chain never calls out, but agent modules check for keys at import
+os.environ.setdefault("OPENAI_API_KEY", "load-test")
+os.environ.setdefault("TAVILY_API_KEY", "load-test")
+
+
+class StubChain:
+    """Stands in for the compiled agent graph: each step blocks like an LLM call.
+
+    The final response names the graph file the chain saw through the
+    session ContextVars, so callers can check per-session isolation.
+    """
+
+    def __init__(self, llm_latency: float = 0.2, steps: int = 3):
+        self.llm_latency = llm_latency
+        self.steps = steps
+
+    def stream(self, inputs: dict, config: dict):
+        from agent_tools import _graph_file
+        for step in range(self.steps):
+            time.sleep(self.llm_latency)
+            yield {f"Agent{step}": {"sender": f"Agent{step}", "next": "Frontman"}}
+        yield {"Frontman": {"messages": [_Message(_graph_file.get())]}}
+
+
+class _Message:
+    def __init__(self, content: str):
+        self.content = content
+
+
+async def websocket_turn(app, session_id: str, content: str = "Make me a cake") -> list[tuple[float, dict]]:
+    """Run one user turn over an in-process ASGI WebSocket.
+
+    Returns:
+        (seconds since connect, message) for every message the server sent.
+    """
+    inbound: asyncio.Queue = asyncio.Queue()
+    received = []
+    start = time.perf_counter()
+
+    async def receive():
+        return await inbound.get()
+
+    async def send(message):
+        if message["type"] == "websocket.accept":
+            await inbound.put({"type": "websocket.receive",
+                               "text": json.dumps({"type": "user_message", "content": content})})
+        elif message["type"] == "websocket.send":
+            data = json.loads(message["text"])
+            received.append((time.perf_counter() - start, data))
+            # The recipe update (or an error) ends the turn
+            if data["type"] in ("recipe_update", "error"):
+                await inbound.put({"type": "websocket.disconnect", "code": 1000})
+        elif message["type"] == "websocket.close":
+            await inbound.put({"type": "websocket.disconnect", "code": 1000})
+
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "scheme": "ws",
+        "path": f"/ws/{session_id}",
+        "raw_path": f"/ws/{session_id}".encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+        "subprotocols": [],
+    }
+    await inbound.put({"type": "websocket.connect"})
+    await app(scope, receive, send)
+    return received
+
+
+async def probe_health(app, latencies: list[float], stop: asyncio.Event, period: float = 0.01):
+    """Hit /health repeatedly until ``stop`` is set."""
+    import httpx
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        while not stop.is_set():
+            start = time.perf_counter()
+            await client.get("/health")
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(period)
+
+
+async def run_load(app, n_sessions: int) -> dict:
+    """Run ``n_sessions`` concurrent turns plus a /health prober."""
+    health, stop = [], asyncio.Event()
+    prober = asyncio.create_task(probe_health(app, health, stop))
+    start = time.perf_counter()
+    turns = await asyncio.gather(*(websocket_turn(app, f"load-{i}") for i in range(n_sessions)))
+    wall = time.perf_counter() - start
+    stop.set()
+    await prober
+    return {"wall": wall, "turns": turns, "health": health}
+
+
+def load_server(stub: StubChain, sessions_dir: str):
+    """Import the API server with the stub chain and a scratch sessions directory."""
+    import importlib
+    from session import SessionManager
+    with patch("chain_factory.compile_chain", return_value=stub):
+        import server
+        server = importlib.reload(server)
+    server.session_manager = SessionManager(sessions_dir)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="seconds per stubbed LLM call")
+    parser.add_argument("--steps", type=int, default=3, help="LLM calls per turn")
+    args = parser.parse_args()
+
+    stub = StubChain(args.llm_latency, args.steps)
+    with tempfile.TemporaryDirectory() as sessions_dir:
+        server = load_server(stub, sessions_dir)
+        result = asyncio.run(run_load(server.app, args.sessions))
+
+    first = [received[0][0] for received in result["turns"]]
+    full = [received[-1][0] for received in result["turns"]]
+    serial = args.sessions * args.steps * args.llm_latency
+    ms = lambda values, q: np.percentile(np.asarray(values) * 1000, q)
+    print(f"{args.sessions} sessions x {args.steps} LLM calls of {args.llm_latency * 1000:.0f} ms "
+          f"({server.CHAIN_WORKERS} chain workers)")
+    print(f"  wall time           {result['wall']:8.2f} s   (serialized: {serial:.2f} s)")
+    print(f"  first event   p50   {ms(first, 50):8.0f} ms   p99 {ms(first, 99):8.0f} ms")
+    print(f"  full turn     p50   {ms(full, 50):8.0f} ms   p99 {ms(full, 99):8.0f} ms")
+    print(f"  /health       p99   {ms(result['health'], 99):8.1f} ms   ({len(result['health'])} probes)")
+    turns = server.turn_scheduler.stats()
+    print(f"  queue wait    p95   {turns['wait_ms']['p95']:8.0f} ms   "
+          f"(max depth {turns['max_queue_depth']}, {turns['max_concurrent']} concurrent turns)")
+
+
+if __name__ == "__main__":
+    main()
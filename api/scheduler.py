@@ -0,0 +1,129 @@
+"""Turn scheduling for the Caldron API: global concurrency limit, per-session FIFO."""
+
+import asyncio
+import statistics
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Optional
+
+
+class _Ticket:
+    """One turn waiting for, or holding, a slot."""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.enqueued = time.monotonic()
+        self.started = False
+        self.changed = asyncio.Event()
+
+
+class TurnScheduler:
+    """Admits agent turns in arrival order, at most ``max_concurrent`` at once.
+
+    Turns of the same session never overlap — each session's turns run one
+    after another, in order — so a session's state files are never written
+    by two turns at the same time. A turn blocked only by its own session
+    does not hold up other sessions queued behind it.
+
+    Waiting turns are kept in a list of tickets in arrival order, each with
+    an ``asyncio.Event`` that is set when the turn starts or its queue
+    position changes.
+
+    All methods must be called from the event loop thread.
+    """
+
+    def __init__(self, max_concurrent: int = 16, wait_samples: int = 1000):
+        self.max_concurrent = max_concurrent
+        self._running: set[str] = set()
+        self._queue: list[_Ticket] = []
+        self._waits: deque = deque(maxlen=wait_samples)
+        self.turns_started = 0
+        self.turns_completed = 0
+        self.max_queue_depth = 0
+
+    def _dispatch(self):
+        i = 0
+        while i < len(self._queue) and len(self._running) < self.max_concurrent:
+            ticket = self._queue[i]
+            if ticket.session_id in self._running:
+                i += 1
+                continue
+            self._queue.pop(i)
+            self._running.add(ticket.session_id)
+            ticket.started = True
+            self.turns_started += 1
+            self._waits.append(time.monotonic() - ticket.enqueued)
+            ticket.changed.set()
+        # Wake the turns still waiting: their queue position may have moved
+        for ticket in self._queue:
+            ticket.changed.set()
+
+    def position(self, ticket: _Ticket) -> int:
+        """1-based position of a waiting turn in the queue."""
+        return self._queue.index(ticket) + 1
+
+    @asynccontextmanager
+    async def turn(
+        self,
+        session_id: str,
+        on_queued: Optional[Callable[[int], Awaitable[None]]] = None,
+    ):
+        """Hold a turn slot for ``session_id`` for the duration of the block.
+
+        Args:
+            session_id: Session the turn belongs to.
+            on_queued: Awaited with the queue position whenever the turn has
+                to wait, and again each time that position changes.
+        """
+        ticket = _Ticket(session_id)
+        self._queue.append(ticket)
+        self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+        self._dispatch()
+        try:
+            reported = None
+            while not ticket.started:
+                position = self.position(ticket)
+                if on_queued is not None and position != reported:
+                    reported = position
+                    await on_queued(position)
+                    if ticket.started:
+                        break
+                ticket.changed.clear()
+                await ticket.changed.wait()
+        except BaseException:
+            # Cancelled (e.g. client gone) while queued: give up the place
+            if not ticket.started:
+                self._queue.remove(ticket)
+                self._dispatch()
+                raise
+            self._release(ticket)
+            raise
+        try:
+            yield
+        finally:
+            self._release(ticket)
+
+    def _release(self, ticket: _Ticket):
+        self._running.discard(ticket.session_id)
+        self.turns_completed += 1
+        self._dispatch()
+
+    def stats(self) -> dict:
+        """Queue depth, running turns and recent queue-wait percentiles."""
+        waits = [wait * 1000.0 for wait in self._waits]
+        # Inclusive method: same linear interpolation as numpy.percentile
+        cuts = statistics.quantiles(waits, n=100, method="inclusive") if len(waits) > 1 else waits * 99
+        return {
+            "max_concurrent": self.max_concurrent,
+            "running": len(self._running),
+            "queued": len(self._queue),
+            "max_queue_depth": self.max_queue_depth,
+            "turns_started": self.turns_started,
+            "turns_completed": self.turns_completed,
+            "wait_ms": {
+                "p50": round(cuts[49], 2) if waits else 0.0,
+                "p95": round(cuts[94], 2) if waits else 0.0,
+                "max": round(max(waits), 2) if waits else 0.0,
+            },
+        }
@@ -3,23 +3,52 @@
 import sys
 import os
 import json
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing, asynccontextmanager
 
 # Add cauldron-app to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'cauldron-app'))
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 
 from chain_factory import compile_chain
 from session import SessionManager
-from ws_protocol import AgentEvent, AgentResponse, RecipeUpdate, GraphUpdate, ErrorMessage
-from class_defs import load_graph_from_file
-from agent_tools import _graph_file
+from scheduler import TurnScheduler
+from ws_protocol import AgentEvent, AgentResponse, RecipeUpdate, GraphUpdate, ErrorMessage, QueuedEvent
+from agent_tools import graph_context
 from langchain_core.messages import HumanMessage
 from logging_util import logger
-from config import LLM_MODEL
+from config import LLM_MODEL, CHAIN_WORKERS, MAX_CONCURRENT_TURNS, ML_WARMUP, ML_REQUIRE_WARM, ML_RELOAD_INTERVAL
+from ml_service import CulinaryMLService
 
-app = FastAPI(title="Caldron API", version="0.1.0")
+
+def _warmup_models() -> list[str] | None:
+    """Models named by CALDRON_ML_WARMUP (None means all of them)."""
+    return None if "all" in ML_WARMUP else ML_WARMUP
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if ML_WARMUP:
+        # Loads run in background threads; the server accepts requests meanwhile
+        CulinaryMLService().warmup(_warmup_models())
+    if ML_RELOAD_INTERVAL > 0:
+        CulinaryMLService().start_watching(ML_RELOAD_INTERVAL)
+    _chain_executor()
+    yield
+    if ML_RELOAD_INTERVAL > 0:
+        CulinaryMLService().stop_watching()
+    # This lifespan's executor only; the next one starts a fresh pool
+    executor, app.state.chain_executor = app.state.chain_executor, None
+    executor.shutdown(wait=False, cancel_futures=True)
+    session_manager.flush_all()
+
+
+app = FastAPI(title="Caldron API", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -32,22 +61,198 @@ app.add_middleware(
 chain = compile_chain(LLM_MODEL)
 session_manager = SessionManager()
 
+# Caps concurrent turns and serializes each session's turns
+turn_scheduler = TurnScheduler(max_concurrent=MAX_CONCURRENT_TURNS)
+
+_END = object()
+
+
+def _chain_executor() -> ThreadPoolExecutor:
+    """The app's pool for agent turns, created on first use after startup.
+
+    Turns run there, off the event loop, so one session's LLM and tool
+    calls never stall the others. Only called from the event loop thread.
+    """
+    executor = getattr(app.state, "chain_executor", None)
+    if executor is None:
+        executor = app.state.chain_executor = ThreadPoolExecutor(
+            max_workers=CHAIN_WORKERS, thread_name_prefix="chain")
+    return executor
+
+
+async def stream_chain(inputs: dict, config: dict):
+    """Async iterator over ``chain.stream`` events, produced in a worker thread.
+
+    The worker runs in a copy of the caller's context, so the per-session
+    ContextVars set by ``session_scope`` are the ones the chain's tools see.
+    Events are forwarded as soon as they are produced; exceptions raised by
+    the chain are re-raised here. Closing the iterator early stops the
+    worker at its next event.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def emit(item):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # Event loop already closed: nobody is listening any more
+            stop.set()
+
+    def produce():
+        try:
+            for event in chain.stream(inputs, config):
+                if stop.is_set():
+                    break
+                emit(event)
+        except Exception as e:
+            emit(e)
+        finally:
+            emit(_END)
+
+    loop.run_in_executor(_chain_executor(), contextvars.copy_context().run, produce)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def _event_message(event: dict) -> str:
+    """Serialize one chain event for the client."""
+    # Each event is a dict with one key (the agent name)
+    agent_name = list(event.keys())[0]
+    agent_data = event[agent_name]
+
+    if agent_name == "Frontman":
+        # Final user-facing response
+        response_content = agent_data["messages"][0].content
+        return AgentResponse(content=response_content).model_dump_json()
+    if "next" in agent_data:
+        # Routing event — show which agent is working
+        return AgentEvent(
+            agent=agent_data.get("sender", agent_name),
+            status="working",
+            content=None,
+        ).model_dump_json()
+    # Agent completed its work
+    msg_content = None
+    if "messages" in agent_data and agent_data["messages"]:
+        msg_content = str(agent_data["messages"][0].content)[:500]
+    return AgentEvent(
+        agent=agent_name,
+        status="done",
+        content=msg_content,
+    ).model_dump_json()
+
 
 @app.get("/health")
 async def health():
     return {"status": "ok"}
 
 
+@app.get("/ready")
+async def ready(response: Response):
+    """Readiness: 503 until every model selected for warmup has loaded."""
+    if not ML_WARMUP:
+        return {"ready": True, "warmup": "disabled", "models": {}}
+    service = CulinaryMLService()
+    is_warm = service.warm
+    if not is_warm:
+        response.status_code = 503
+    return {"ready": is_warm, "warmup": "enabled", "version": service.version,
+            "models": service.warmup_status()}
+
+
+@app.get("/metrics")
+async def metrics():
+    return {"turns": turn_scheduler.stats()}
+
+
+def _graph_updates() -> tuple[dict, dict | None]:
+    """The session's recipe graph and foundational recipe, as JSON-safe dicts."""
+    with graph_context(readonly=True) as recipe_graph:
+        foundational = recipe_graph.get_foundational_recipe()
+        recipe_dict = foundational.model_dump(mode="json") if foundational else None
+        return recipe_graph.to_dict(), recipe_dict
+
+
+async def run_turn(websocket: WebSocket, session_id: str, content: str):
+    """Run one agent turn once the scheduler admits it, streaming events to the client."""
+
+    async def notify_queued(position: int):
+        await websocket.send_text(QueuedEvent(position=position).model_dump_json())
+
+    async with turn_scheduler.turn(session_id, on_queued=notify_queued):
+        with session_manager.session_scope(session_id):
+            try:
+                events = stream_chain(
+                    {
+                        "messages": [HumanMessage(content=content)],
+                        "sender": "User",
+                        "next": "Caldron\nPostman",
+                    },
+                    {"recursion_limit": 50},
+                )
+                async with aclosing(events):
+                    async for event in events:
+                        await websocket.send_text(_event_message(event))
+
+                # After chain completes, send recipe and graph updates
+                try:
+                    graph_dict, recipe_dict = await asyncio.to_thread(_graph_updates)
+
+                    # Send graph update
+                    await websocket.send_text(
+                        GraphUpdate(graph=graph_dict).model_dump_json()
+                    )
+
+                    # Send recipe update (foundational recipe)
+                    await websocket.send_text(
+                        RecipeUpdate(recipe=recipe_dict).model_dump_json()
+                    )
+                except (FileNotFoundError, Exception) as e:
+                    logger.warning(f"Could not load graph for updates: {e}")
+
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                logger.error(f"Chain error in session {session_id}: {e}")
+                await websocket.send_text(
+                    ErrorMessage(detail=f"Agent error: {str(e)[:200]}").model_dump_json()
+                )
+
+
+def _turn_done(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Turn ended early: {task.exception()!r}")
+
+
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
     await websocket.accept()
 
+    if ML_REQUIRE_WARM and ML_WARMUP and not CulinaryMLService().warm:
+        await websocket.send_text(
+            ErrorMessage(detail="Server is warming up, try again shortly").model_dump_json()
+        )
+        # 1013: try again later
+        await websocket.close(code=1013)
+        return
+
     # Create session if it doesn't exist
     try:
         session_manager.get_session_dir(session_id)
     except KeyError:
         session_manager.create_session(session_id)
 
+    turns: set[asyncio.Task] = set()
     try:
         while True:
             data = await websocket.receive_text()
@@ -68,76 +273,18 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
             content = message.get("content", "")
             logger.info(f"Session {session_id}: received message: {content[:100]}")
 
-            with session_manager.session_scope(session_id):
-                try:
-                    for event in chain.stream(
-                        {
-                            "messages": [HumanMessage(content=content)],
-                            "sender": "User",
-                            "next": "Caldron\nPostman",
-                        },
-                        {"recursion_limit": 50},
-                    ):
-                        # Each event is a dict with one key (the agent name)
-                        agent_name = list(event.keys())[0]
-                        agent_data = event[agent_name]
-
-                        if agent_name == "Frontman":
-                            # Final user-facing response
-                            response_content = agent_data["messages"][0].content
-                            await websocket.send_text(
-                                AgentResponse(content=response_content).model_dump_json()
-                            )
-                        elif "next" in agent_data:
-                            # Routing event — show which agent is working
-                            await websocket.send_text(
-                                AgentEvent(
-                                    agent=agent_data.get("sender", agent_name),
-                                    status="working",
-                                    content=None,
-                                ).model_dump_json()
-                            )
-                        else:
-                            # Agent completed its work
-                            msg_content = None
-                            if "messages" in agent_data and agent_data["messages"]:
-                                msg_content = str(agent_data["messages"][0].content)[:500]
-                            await websocket.send_text(
-                                AgentEvent(
-                                    agent=agent_name,
-                                    status="done",
-                                    content=msg_content,
-                                ).model_dump_json()
-                            )
-
-                    # After chain completes, send recipe and graph updates
-                    graph_file = _graph_file.get()
-                    try:
-                        recipe_graph = load_graph_from_file(graph_file)
-                        graph_dict = recipe_graph.to_dict()
-
-                        # Send graph update
-                        await websocket.send_text(
-                            GraphUpdate(graph=graph_dict).model_dump_json()
-                        )
-
-                        # Send recipe update (foundational recipe)
-                        foundational = recipe_graph.get_foundational_recipe()
-                        recipe_dict = json.loads(foundational.model_dump_json()) if foundational else None
-                        await websocket.send_text(
-                            RecipeUpdate(recipe=recipe_dict).model_dump_json()
-                        )
-                    except (FileNotFoundError, Exception) as e:
-                        logger.warning(f"Could not load graph for updates: {e}")
-
-                except Exception as e:
-                    logger.error(f"Chain error in session {session_id}: {e}")
-                    await websocket.send_text(
-                        ErrorMessage(detail=f"Agent error: {str(e)[:200]}").model_dump_json()
-                    )
+            # Turns run as tasks so this loop keeps reading; the scheduler
+            # runs them one at a time per session, in arrival order
+            turn = asyncio.create_task(run_turn(websocket, session_id, content))
+            turns.add(turn)
+            turn.add_done_callback(turns.discard)
+            turn.add_done_callback(_turn_done)
 
     except WebSocketDisconnect:
         logger.info(f"Session {session_id}: client disconnected")
+    finally:
+        for turn in list(turns):
+            turn.cancel()
 
 
 def main():
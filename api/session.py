@@ -11,19 +11,21 @@ from logging_util import logger
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'cauldron-app'))
 
-from class_defs import fresh_graph, fresh_mods_list, fresh_pot
-from agent_tools import _graph_file, _mods_file, _pot_file
+from class_defs import fresh_graph, fresh_mods_list, fresh_pot, get_state_backend
+from agent_tools import _graph_file, _mods_file, _pot_file, _session_state
+from session_state import SessionState
 
 
 SESSIONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'sessions')
 
 
 class SessionManager:
-    """Manages per-session state directories and ContextVar tokens."""
+    """Manages per-session state directories, in-memory state and ContextVar tokens."""
 
     def __init__(self, sessions_dir: str = SESSIONS_DIR):
         self.sessions_dir = sessions_dir
         self._sessions: dict[str, str] = {}  # session_id -> dir path
+        self._states: dict[str, SessionState] = {}  # session_id -> live state
 
     def create_session(self, session_id: str = None) -> str:
         """Create a new session with its own state directory."""
@@ -39,6 +41,10 @@ class SessionManager:
         fresh_mods_list(os.path.join(session_dir, "mods_list.json"))
 
         self._sessions[session_id] = session_dir
+        # Drop any state cached for an earlier session with this ID
+        stale = self._states.pop(session_id, None)
+        if stale is not None:
+            stale.discard()
         logger.info(f"Session {session_id} created at {session_dir}")
         return session_id
 
@@ -53,14 +59,26 @@ class SessionManager:
                 raise KeyError(f"Session {session_id} not found")
         return self._sessions[session_id]
 
+    def get_state(self, session_id: str) -> SessionState:
+        """The session's in-memory state, created on first use."""
+        if session_id not in self._states:
+            session_dir = self.get_session_dir(session_id)
+            self._states[session_id] = SessionState(
+                os.path.join(session_dir, "recipe_graph.json"),
+                os.path.join(session_dir, "mods_list.json"),
+                os.path.join(session_dir, "recipe_pot.json"),
+            )
+        return self._states[session_id]
+
     @contextmanager
     def session_scope(self, session_id: str):
-        """Context manager that sets ContextVars to this session's state files."""
+        """Context manager that sets ContextVars to this session's state files and in-memory state."""
         session_dir = self.get_session_dir(session_id)
 
         token_graph = _graph_file.set(os.path.join(session_dir, "recipe_graph.json"))
         token_mods = _mods_file.set(os.path.join(session_dir, "mods_list.json"))
         token_pot = _pot_file.set(os.path.join(session_dir, "recipe_pot.json"))
+        token_state = _session_state.set(self.get_state(session_id))
 
         try:
             yield session_dir
@@ -68,11 +86,30 @@ class SessionManager:
             _graph_file.reset(token_graph)
             _mods_file.reset(token_mods)
             _pot_file.reset(token_pot)
+            _session_state.reset(token_state)
+
+    def flush_all(self) -> None:
+        """Write every session's unsaved state to disk.
+
+        Every session is attempted; the first failure is re-raised afterwards.
+        """
+        error = None
+        for state in list(self._states.values()):
+            try:
+                state.flush()
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
 
     def remove_session(self, session_id: str) -> None:
         """Remove a session and its state directory."""
+        state = self._states.pop(session_id, None)
+        if state is not None:
+            state.discard()
         if session_id in self._sessions:
             session_dir = self._sessions.pop(session_id)
+            get_state_backend().drop_session(session_dir)
             if os.path.isdir(session_dir):
                 shutil.rmtree(session_dir)
             logger.info(f"Session {session_id} removed.")
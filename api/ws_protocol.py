@@ -34,3 +34,8 @@ class GraphUpdate(BaseModel):
 class ErrorMessage(BaseModel):
     type: str = "error"
     detail: str
+
+
+class QueuedEvent(BaseModel):
+    type: str = "queued"
+    position: int  # 1-based place in the turn queue
@@ -8,6 +8,7 @@ import requests
 from recipe_scrapers import scrape_me
 from langchain_core.messages import HumanMessage
 from class_defs import load_graph_from_file, save_graph_to_file, default_graph_file, default_mods_list_file, default_pot_file, load_mods_list_from_file, save_mods_list_to_file, load_pot_from_file, save_pot_to_file, Recipe, Ingredient, RecipeModification, RecipeGraph
+from session_state import SessionState
 from logging_util import logger
 from datetime import datetime
 
@@ -19,27 +20,33 @@ _mods_file: ContextVar[str] = ContextVar('_mods_file', default=default_mods_list
 _pot_file: ContextVar[str] = ContextVar('_pot_file', default=default_pot_file)
 
 
-# Context managers to reduce duplicated load/save patterns
-@contextmanager
-def pot_context():
-    f = _pot_file.get()
-    pot = load_pot_from_file(f)
-    yield pot
-    save_pot_to_file(pot, f)
+# In-memory state for the current API session; None means tools work on the files directly
+_session_state: ContextVar[Optional[SessionState]] = ContextVar('_session_state', default=None)
 
-@contextmanager
-def graph_context():
-    f = _graph_file.get()
-    recipe_graph = load_graph_from_file(f)
-    yield recipe_graph
-    save_graph_to_file(recipe_graph, f)
 
+# Context managers to reduce duplicated load/save patterns. With readonly=True
+# nothing is written back; in a session the live object is used as-is.
 @contextmanager
-def mods_context():
-    f = _mods_file.get()
-    mods_list = load_mods_list_from_file(f)
-    yield mods_list
-    save_mods_list_to_file(mods_list, f)
+def _state_context(kind, path_var, load, save, readonly):
+    state = _session_state.get()
+    if state is not None:
+        with (state.read(kind) if readonly else state.edit(kind)) as obj:
+            yield obj
+        return
+    f = path_var.get()
+    obj = load(f)
+    yield obj
+    if not readonly:
+        save(obj, f)
+
+def pot_context(readonly: bool = False):
+    return _state_context("pot", _pot_file, load_pot_from_file, save_pot_to_file, readonly)
+
+def graph_context(readonly: bool = False):
+    return _state_context("graph", _graph_file, load_graph_from_file, save_graph_to_file, readonly)
+
+def mods_context(readonly: bool = False):
+    return _state_context("mods", _mods_file, load_mods_list_from_file, save_mods_list_to_file, readonly)
 
 ## Datetime Tool (mainly for dummy use)
 
@@ -157,8 +164,8 @@ def pop_url_from_pot() -> Annotated[Optional[str], "The URL popped from the Pot.
 def examine_pot() -> Annotated[str, "The string representation of the Pot's contents."]:
     """Get the contents of the Pot."""
     logger.debug("Dumping pot.")
-    pot = load_pot_from_file()
-    return str(''.join([str(pot.get_all_recipes()),str(pot.get_all_urls())]))
+    with pot_context(readonly=True) as pot:
+        return str(''.join([str(pot.get_all_recipes()),str(pot.get_all_urls())]))
 
 @tool
 def clear_pot() -> Annotated[str, "Message indicating success or failure."]:
@@ -186,8 +193,8 @@ def get_recipe(
 ) -> Annotated[str, "String representation of the Recipe object."]:
     """Get the Recipe object at the specified node ID."""
     logger.debug("Getting recipe from recipe graph.")
-    recipe_graph = load_graph_from_file(_graph_file.get())
-    recipe = recipe_graph.get_recipe(node_id)
+    with graph_context(readonly=True) as recipe_graph:
+        recipe = recipe_graph.get_recipe(node_id)
     return str(recipe)
 
 @tool
@@ -207,16 +214,16 @@ def get_node_id(
 ) -> Annotated[Optional[str], "The node ID of the recipe."]:
     """Get the node ID of the foundational recipe."""
     logger.debug("Getting node ID from recipe graph.")
-    recipe_graph = load_graph_from_file(_graph_file.get())
-    # TODO - see if the given recipe matches any recipe in the graph
-    return str(recipe_graph.get_node_id())
+    with graph_context(readonly=True) as recipe_graph:
+        # TODO - see if the given recipe matches any recipe in the graph
+        return str(recipe_graph.get_node_id())
 
 @tool
 def get_foundational_recipe() -> Annotated[str, "String representation of the current foundational recipe."]:
     """Get the current foundational recipe."""
     logger.debug("Getting foundational recipe from recipe graph.")
-    recipe_graph = load_graph_from_file(_graph_file.get())
-    recipe = recipe_graph.get_foundational_recipe()
+    with graph_context(readonly=True) as recipe_graph:
+        recipe = recipe_graph.get_foundational_recipe()
     return str(recipe)
 
 @tool
@@ -234,18 +241,18 @@ def set_foundational_recipe(
 def get_graph() -> Annotated[str, "A representation of the current recipe graph."]:
     """Get a representation of the current recipe graph."""
     logger.debug("Getting recipe graph.")
-    recipe_graph = load_graph_from_file(_graph_file.get())
-    graph = recipe_graph.get_graph()
-    nodes = [(node, data['recipe'].to_json()) for node, data in graph.nodes(data=True)]
-    edges = list(graph.edges(data=True))
+    with graph_context(readonly=True) as recipe_graph:
+        graph = recipe_graph.get_graph()
+        nodes = [(node, data['recipe'].to_json()) for node, data in graph.nodes(data=True)]
+        edges = list(graph.edges(data=True))
     return f"Recipe Graph: Nodes - {nodes}, Edges - {edges}"
 
 @tool
 def get_graph_size() -> Annotated[str, "The number of nodes in the recipe graph."]:
     """Get the number of nodes in the recipe graph."""
     logger.debug("Getting the number of nodes in the recipe graph.")
-    recipe_graph = load_graph_from_file(_graph_file.get())
-    return f"Number of nodes in recipe graph: {recipe_graph.get_graph_size()}"
+    with graph_context(readonly=True) as recipe_graph:
+        return f"Number of nodes in recipe graph: {recipe_graph.get_graph_size()}"
 
 ## Modifications List Tools ##
 
@@ -285,9 +292,8 @@ def suggest_mod(
 def get_mods_list() -> Annotated[str, "String representation of the current list of suggested modifications."]:
     """Get the current list of suggested modifications."""
     logger.debug("Getting mods list.")
-    mods_list = load_mods_list_from_file(_mods_file.get())
-    current_mods_list = mods_list.get_mods_list()
-    return str(current_mods_list)
+    with mods_context(readonly=True) as mods_list:
+        return str(mods_list.get_mods_list())
 
 @tool
 def apply_mod() -> Annotated[str, "The result of applying the modification."]:
@@ -298,12 +304,8 @@ def apply_mod() -> Annotated[str, "The result of applying the modification."]:
         str: A message describing the result of applying the modification.
     """
     try:
-        gf, mf = _graph_file.get(), _mods_file.get()
-        recipe_graph = load_graph_from_file(gf)
-        mods_list = load_mods_list_from_file(mf)
-        mod, success = mods_list.apply_mod(recipe_graph)
-        save_mods_list_to_file(mods_list, mf)
-        save_graph_to_file(recipe_graph, gf)
+        with graph_context() as recipe_graph, mods_context() as mods_list:
+            mod, success = mods_list.apply_mod(recipe_graph)
         if mod is not None and success:
             return f"Modification applied successfully: {mod}"
         elif mod is not None:
@@ -0,0 +1,162 @@
+"""Async facade over CulinaryMLService for code running on the event loop.
+
+Every call is dispatched to a dedicated, bounded executor so the event
+loop — and every other WebSocket session on it — keeps running while
+embeddings are scored. Batch (``*_many``) calls get their own executor so
+single lookups never queue behind them. Identical calls that overlap in
+time share one computation (single-flight).
+"""
+
+import asyncio
+import copy
+import functools
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from ml_service import CulinaryMLService
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_KINDS = ("thread", "process")
+
+BATCH_METHODS = frozenset({
+    "suggest_substitutions_many", "score_affinity_many",
+    "suggest_techniques_many", "explain_pairing_many",
+})
+
+# Process-pool workers: when the service in this process last checked for a new model version
+_last_reload_check = 0.0
+
+
+def _init_process_worker(models_dir: str, ann_backend: str):
+    """Create the worker process's own service singleton."""
+    CulinaryMLService(models_dir=models_dir, ann_backend=ann_backend)
+
+
+def _call_in_process(method: str, args: tuple, kwargs: dict):
+    """Run one service call inside a process-pool worker."""
+    global _last_reload_check
+    from config import ML_RELOAD_INTERVAL
+    service = CulinaryMLService()
+    # Workers have no watcher thread; poll the registry on the same cadence
+    if ML_RELOAD_INTERVAL > 0 and time.monotonic() - _last_reload_check >= ML_RELOAD_INTERVAL:
+        _last_reload_check = time.monotonic()
+        service.reload()
+    return getattr(service, method)(*args, **kwargs)
+
+
+def _freeze(value):
+    """Hashable form of call arguments (lists and tuples become tuples)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class AsyncCulinaryMLService:
+    """Awaitable versions of the ``CulinaryMLService`` query methods.
+
+    Args:
+        service: Service to wrap in thread mode (default: the singleton).
+        max_workers: Executor size for single lookups.
+        batch_workers: Executor size for ``*_many`` batch calls.
+        executor: ``"thread"`` shares the in-process models (NumPy releases
+            the GIL in the matrix products); ``"process"`` gives each worker
+            its own model copy and sidesteps the GIL for Python-heavy work.
+    """
+
+    def __init__(
+        self,
+        service: Optional[CulinaryMLService] = None,
+        max_workers: Optional[int] = None,
+        executor: Optional[str] = None,
+        batch_workers: Optional[int] = None,
+    ):
+        from config import ML_EXECUTOR, ML_WORKERS, ML_BATCH_WORKERS
+        self._service = service or CulinaryMLService()
+        self.kind = executor or ML_EXECUTOR
+        self.max_workers = max_workers or ML_WORKERS
+        self.batch_workers = batch_workers or ML_BATCH_WORKERS
+        if self.kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor: {self.kind!r} (expected one of {EXECUTOR_KINDS})")
+        self._executor = self._make_executor(self.max_workers, "ml")
+        self._batch_executor = self._make_executor(self.batch_workers, "ml-batch")
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def _make_executor(self, max_workers: int, name: str) -> Executor:
+        if self.kind == "thread":
+            return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_process_worker,
+            initargs=(str(self._service._registry.root), self._service._ann_backend),
+        )
+
+    @property
+    def available(self) -> bool:
+        return self._service.available
+
+    def stats(self) -> dict:
+        """Call, coalescing and in-flight counters."""
+        return {
+            "executor": self.kind,
+            "max_workers": self.max_workers,
+            "batch_workers": self.batch_workers,
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+        self._batch_executor.shutdown(wait=wait)
+
+    async def _call(self, method: str, *args, **kwargs):
+        self.calls += 1
+        key = (method, _freeze(args), _freeze(sorted(kwargs.items())))
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if self.kind == "thread":
+                job = functools.partial(getattr(self._service, method), *args, **kwargs)
+            else:
+                job = functools.partial(_call_in_process, method, args, kwargs)
+            executor = self._batch_executor if method in BATCH_METHODS else self._executor
+            future = loop.run_in_executor(executor, job)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # shield: a cancelled caller must not cancel the call others share
+        result = await asyncio.shield(future)
+        return copy.deepcopy(result)
+
+    async def suggest_substitutions(self, ingredient: str, n: int = 5) -> list[dict]:
+        return await self._call("suggest_substitutions", ingredient, n=n)
+
+    async def complete_recipe(self, ingredients: list[str], n: int = 5) -> list[dict]:
+        return await self._call("complete_recipe", ingredients, n=n)
+
+    async def score_affinity(self, ing_a: str, ing_b: str) -> dict:
+        return await self._call("score_affinity", ing_a, ing_b)
+
+    async def suggest_techniques(self, ingredient: str, n: int = 5) -> list[dict]:
+        return await self._call("suggest_techniques", ingredient, n=n)
+
+    async def explain_pairing(self, ing_a: str, ing_b: str) -> dict:
+        return await self._call("explain_pairing", ing_a, ing_b)
+
+    async def suggest_substitutions_many(self, ingredients: list[str], n: int = 5) -> list[list[dict]]:
+        return await self._call("suggest_substitutions_many", ingredients, n=n)
+
+    async def score_affinity_many(self, pairs: list[tuple[str, str]]) -> list[dict]:
+        return await self._call("score_affinity_many", pairs)
+
+    async def suggest_techniques_many(self, ingredients: list[str], n: int = 5) -> list[list[dict]]:
+        return await self._call("suggest_techniques_many", ingredients, n=n)
+
+    async def explain_pairing_many(self, pairs: list[tuple[str, str]]) -> list[dict]:
+        return await self._call("explain_pairing_many", pairs)
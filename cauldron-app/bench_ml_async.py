@@ -0,0 +1,131 @@
+"""
+Benchmark: concurrent sessions against the ML service on one event loop
+
+Simulates N WebSocket sessions issuing ML queries at once. A share of the
+sessions sends heavy batch requests (substitutions for a whole ingredient
+list); the rest send light single-pair affinity lookups. Compares:
+
+- blocking: sessions call CulinaryMLService directly on the event loop,
+  as tool code running inside the WebSocket handler does today;
+- async: sessions await AsyncCulinaryMLService (thread executor).
+
+Reports per-request latency for light and heavy sessions, total wall time,
+and event-loop lag (how late a 5 ms heartbeat fires). In blocking mode a
+light request waits for every heavy request scheduled before it.
+
+Usage:
+    python bench_ml_async.py                      # 50 sessions, 50k-ingredient store
+    python bench_ml_async.py --sessions 200 --workers 8
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from async_ml_service import AsyncCulinaryMLService
+from ml_service import CulinaryMLService
+from bench_common import percentile_ms, synthetic_embeddings
+from food2vec import EmbeddingStore
+
+
+def letter_name(i: int) -> str:
+    """Digit-free one-word ingredient name (the normalizer strips quantities)."""
+    letters = ""
+    while True:
+        i, r = divmod(i, 26)
+        letters = chr(ord("a") + r) + letters
+        if i == 0:
+            return f"herb{letters}"
+
+
+async def heartbeat(lags: list[float], stop: asyncio.Event, period: float = 0.005):
+    """Record how late each tick of a periodic timer fires."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + period
+        await asyncio.sleep(period)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def session(call, request, arrived: float, latencies: list[float]):
+    # Latency counts from arrival, so time spent waiting behind others is included
+    await call(*request)
+    latencies.append(time.perf_counter() - arrived)
+
+
+async def run(label: str, call, requests: list[tuple[str, tuple]]):
+    light, heavy, lags = [], [], []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        session(call, (method, *args), start, heavy if method.endswith("_many") else light)
+        for method, args in requests
+    ))
+    wall = time.perf_counter() - start
+    stop.set()
+    await beat
+    print(f"{label:>18} {percentile_ms(light, 50):9.1f} {percentile_ms(light, 99):9.1f} "
+          f"{percentile_ms(heavy, 50):9.1f} {wall * 1000:9.1f} {max(lags, default=0) * 1000:11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=50_000)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--heavy-share", type=float, default=0.2)
+    parser.add_argument("--batch", type=int, default=100, help="ingredients per heavy request")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-workers", type=int, default=2)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        names = [letter_name(i) for i in range(args.vectors)]
+        EmbeddingStore(synthetic_embeddings(args.vectors), names).save(Path(models_dir))
+
+        CulinaryMLService.reset()
+        service = CulinaryMLService(models_dir=models_dir)
+        # Distinct queries per session: measure compute, not the result cache
+        service._cache.maxsize = 0
+        service._load_food2vec()
+
+        rng = np.random.default_rng(0)
+        requests = []
+        for i in range(args.sessions):
+            if i < args.sessions * args.heavy_share:
+                batch = list(rng.choice(names, size=args.batch, replace=False))
+                requests.append(("suggest_substitutions_many", (batch,)))
+            else:
+                a, b = rng.choice(names, size=2, replace=False)
+                requests.append(("score_affinity", (a, b)))
+        # Heavy requests arrive first, the worst case for light ones
+        print(f"{args.sessions} sessions ({sum(m.endswith('_many') for m, _ in requests)} heavy "
+              f"x {args.batch} ingredients), {args.vectors:,} vectors, "
+              f"{args.workers}+{args.batch_workers} workers")
+        print(f"\n{'mode':>18} {'light p50':>9} {'light p99':>9} {'heavy p50':>9} "
+              f"{'wall ms':>9} {'max lag ms':>11}")
+
+        async def blocking(method, *call_args):
+            return getattr(service, method)(*call_args)
+
+        facade = AsyncCulinaryMLService(service, max_workers=args.workers, executor="thread",
+                                        batch_workers=args.batch_workers)
+
+        async def offloaded(method, *call_args):
+            return await getattr(facade, method)(*call_args)
+
+        asyncio.run(run("blocking", blocking, requests))
+        asyncio.run(run("async (thread)", offloaded, requests))
+        facade.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: RecipeGraph.get_recipe copy cost
+
+get_recipe hands every caller its own copy of the stored recipe. Compares
+the former JSON round trip (serialize the model, validate it back) and a
+generic deep copy with Recipe.clone, which get_recipe now uses: new lists,
+shared immutable ingredients. Recipes are the size of a long development
+session's (default 50 ingredients, 40 instructions). Also times
+get_foundational_recipe on a graph, the path apply_mod and the server's
+post-turn recipe update go through.
+
+Usage:
+    python bench_recipe_copy.py
+    python bench_recipe_copy.py --ingredients 100 --instructions 80 --repeat 5000
+"""
+
+import argparse
+import logging
+import time
+
+from class_defs import Ingredient, Recipe, RecipeGraph
+
+
+def make_recipe(n_ingredients: int, n_instructions: int) -> Recipe:
+    return Recipe(
+        name="Long Session Loaf",
+        ingredients=[Ingredient(name=f"ingredient {i}", quantity=i + 0.5, unit="g")
+                     for i in range(n_ingredients)],
+        instructions=[f"Step {i}: fold, rest and check the dough before continuing." for i in range(n_instructions)],
+        tags=["bread", "iterated"],
+        sources=["https://example.com/loaf"],
+    )
+
+
+def per_call_us(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ingredients", type=int, default=50)
+    parser.add_argument("--instructions", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    # get_recipe logs every call at DEBUG; keep logging out of the timings
+    logging.disable(logging.CRITICAL)
+
+    recipe = make_recipe(args.ingredients, args.instructions)
+    graph = RecipeGraph()
+    graph.add_node(recipe)
+
+    json_copy = per_call_us(lambda: Recipe.from_json(recipe), args.repeat)
+    deep_copy = per_call_us(lambda: recipe.model_copy(deep=True), args.repeat)
+    clone = per_call_us(recipe.clone, args.repeat)
+    foundational = per_call_us(graph.get_foundational_recipe, args.repeat)
+
+    print(f"{args.ingredients} ingredients, {args.instructions} instructions, {args.repeat} calls")
+    print(f"\n{'copy':>28} {'us/call':>9}")
+    print(f"{'JSON round trip (before)':>28} {json_copy:9.1f}")
+    print(f"{'model_copy(deep=True)':>28} {deep_copy:9.1f}   ({json_copy / deep_copy:.1f}x)")
+    print(f"{'Recipe.clone (now)':>28} {clone:9.1f}   ({json_copy / clone:.1f}x)")
+    print(f"{'get_foundational_recipe':>28} {foundational:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,13 @@ import json
 import os
 import networkx as nx
 import heapq
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
 from typing import List, Dict, Optional, Any, Tuple, Type, TypeVar
 from logging_util import logger
+from config import GRAPH_COMPACT_EVERY, GRAPH_FSYNC, RECIPE_CHECKPOINT_EVERY
+from recipe_delta import list_delta, apply_list_delta
 from pydantic import BaseModel, Field, PrivateAttr, ConfigDict
 
 T = TypeVar('T')
@@ -13,7 +18,8 @@ default_graph_file = "recipe_graph.json"
 default_pot_file = "recipe_pot.json"
 
 class Ingredient(BaseModel):
-    """Model for an ingredient in a recipe."""
+    """Model for an ingredient in a recipe. Immutable, so recipe copies can share ingredients."""
+    model_config = ConfigDict(frozen=True)
     name: str = Field(description="Name of the ingredient")
     quantity: float = Field(description="Quantity of the ingredient")
     unit: Optional[str] = Field(description="Unit of measurement for the ingredient")
@@ -82,12 +88,49 @@ class Recipe(BaseModel):
     
     def tiny(self) -> str:
         return f"{self.name} ({self._id})"
+
+    def clone(self) -> 'Recipe':
+        """Independent copy with the same ID: new lists, shared (immutable) ingredients."""
+        return self.model_copy(update={
+            "ingredients": list(self.ingredients),
+            "instructions": list(self.instructions),
+            "tags": None if self.tags is None else list(self.tags),
+            "sources": None if self.sources is None else list(self.sources),
+        })
     
     @classmethod
     def from_json(cls, data: Dict[str, Any]) -> 'Recipe':
         logger.debug("Creating Recipe object from JSON string.")
         return Recipe.model_validate_json(str(data))
 
+    def delta_from(self, base: 'Recipe') -> Dict[str, Any]:
+        """JSON-safe changes that turn ``base`` into this recipe (see ``apply_delta``)."""
+        delta: Dict[str, Any] = {}
+        for field in ("name", "tags", "sources"):
+            if getattr(self, field) != getattr(base, field):
+                delta[field] = getattr(self, field)
+        ingredients = list_delta(base.ingredients, self.ingredients)
+        if ingredients:
+            delta["ingredients"] = [[start, end, [ing.model_dump(mode="json") for ing in items]]
+                                    for start, end, items in ingredients]
+        instructions = list_delta(base.instructions, self.instructions)
+        if instructions:
+            delta["instructions"] = instructions
+        return delta
+
+    def apply_delta(self, delta: Dict[str, Any]) -> 'Recipe':
+        """New recipe (with its own ID): this one with ``delta`` applied, sharing unchanged items."""
+        recipe = self.clone()
+        if "name" in delta:
+            recipe.name = delta["name"]
+        for field in ("tags", "sources"):
+            if field in delta:
+                setattr(recipe, field, None if delta[field] is None else list(delta[field]))
+        recipe.ingredients = apply_list_delta(self.ingredients, delta.get("ingredients", []), Ingredient.model_validate)
+        recipe.instructions = apply_list_delta(self.instructions, delta.get("instructions", []))
+        recipe.new_ID()
+        return recipe
+
     def apply_modification(self, modification: RecipeModification) -> bool:
         logger.debug("Applying modification to Recipe object.")
         if modification.add_ingredient:
@@ -100,10 +143,15 @@ class Recipe(BaseModel):
             return True
         if modification.update_ingredient:
             logger.debug("Updating ingredient in Recipe object.")
-            for ing in self.ingredients:
-                if ing.name == modification.update_ingredient.name:
-                    ing.quantity = modification.update_ingredient.quantity if modification.update_ingredient.quantity is not None else ing.quantity
-                    ing.unit = modification.update_ingredient.unit if modification.update_ingredient.unit is not None else ing.unit
+            update = modification.update_ingredient
+            # Replace rather than mutate: other recipe versions may share the ingredient
+            self.ingredients = [
+                ing.model_copy(update={
+                    "quantity": update.quantity if update.quantity is not None else ing.quantity,
+                    "unit": update.unit if update.unit is not None else ing.unit,
+                }) if ing.name == update.name else ing
+                for ing in self.ingredients
+            ]
             return True
         if modification.add_instruction:
             logger.debug("Adding instruction to Recipe object.")
@@ -132,11 +180,100 @@ class Recipe(BaseModel):
         return False
 
 class RecipeGraph:
-    """Model for a recipe graph."""
+    """Model for a recipe graph.
+
+    Changes made through the methods below are also recorded as journal
+    events, so ``save_graph_to_file`` can append them to the graph's file
+    instead of rewriting the whole graph.
+
+    Versions share structure: equal ingredients and instructions are one
+    object across all nodes, and storage encodes each node as a delta
+    against its parent, with a full checkpoint every
+    ``RECIPE_CHECKPOINT_EVERY`` nodes along a chain so any version is
+    rebuilt from at most that many deltas.
+    """
     def __init__(self) -> None:
         logger.info("Initializing RecipeGraph object.")
         self.graph = nx.DiGraph()
         self.foundational_recipe_node: Optional[Recipe] = None
+        # Journal bookkeeping: unsaved events, last event number, the file the
+        # graph is in sync with and how many records its journal holds
+        self._events: List[Dict[str, Any]] = []
+        self._seq = 0
+        self._journal_file: Optional[str] = None
+        self._journal_records = 0
+        # Version of the stored graph when this graph last loaded or saved it:
+        # graph_state_stamp of the files (JSON) or the stored seq (SQLite)
+        self._journal_stamp: Optional[Any] = None
+        # Canonical instances of every ingredient and instruction in the graph
+        self._shared: Dict[Any, Any] = {}
+        # Position of each node in its delta chain (0 = stored in full)
+        self._depth: Dict[str, int] = {}
+
+    def _intern(self, recipe: Optional[Recipe]) -> Optional[Recipe]:
+        if recipe is not None:
+            recipe.ingredients = [self._shared.setdefault(ing, ing) for ing in recipe.ingredients]
+            recipe.instructions = [self._shared.setdefault(step, step) for step in recipe.instructions]
+        return recipe
+
+    def _chain_depth(self, node_id: str) -> int:
+        # Depends only on the first parent's depth, so it never changes once computed
+        chain, seen = [], set()
+        while node_id not in self._depth and node_id not in seen:
+            seen.add(node_id)
+            chain.append(node_id)
+            parents = list(self.graph.predecessors(node_id))
+            if not parents:
+                self._depth[node_id] = 0
+                chain.pop()
+                break
+            node_id = parents[0]
+        depth = self._depth.get(node_id, 0)
+        for child in reversed(chain):
+            depth = (depth + 1) % RECIPE_CHECKPOINT_EVERY
+            self._depth[child] = depth
+        return depth if chain else self._depth[node_id]
+
+    def encode_node(self, node_id: str) -> Dict[str, Any]:
+        """Storage form of a node's recipe: ``{"recipe": ...}`` or ``{"base": parent, "delta": ...}``."""
+        recipe = self.graph.nodes[node_id].get('recipe')
+        parents = list(self.graph.predecessors(node_id))
+        base = self.graph.nodes[parents[0]].get('recipe') if parents else None
+        if recipe is None or base is None or self._chain_depth(node_id) == 0:
+            return {"recipe": recipe.model_dump(mode="json") if recipe else None}
+        return {"base": parents[0], "delta": recipe.delta_from(base)}
+
+    def _add_encoded_nodes(self, nodes: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Add nodes given in ``encode_node`` form; a delta's base may be any node here or already in the graph."""
+        pending = {node_id: encoded for node_id, encoded in nodes}
+        recipes: Dict[str, Optional[Recipe]] = {}
+
+        def resolve(node_id: str) -> Optional[Recipe]:
+            # Walk down to the nearest checkpoint or known node, then apply deltas on the way back
+            chain = []
+            while node_id not in recipes and node_id in pending and "delta" in pending[node_id]:
+                chain.append(node_id)
+                node_id = pending[node_id]["base"]
+                if len(chain) > len(pending):
+                    raise ValueError("Cycle in recipe delta chain")
+            if node_id not in recipes:
+                if node_id in pending:
+                    data = pending[node_id].get("recipe")
+                    recipes[node_id] = self._intern(Recipe.model_validate(data)) if data else None
+                else:
+                    recipes[node_id] = self.graph.nodes[node_id].get('recipe')
+            recipe = recipes[node_id]
+            for child in reversed(chain):
+                recipe = self._intern(recipe.apply_delta(pending[child]["delta"]))
+                recipes[child] = recipe
+            return recipe
+
+        for node_id, _ in nodes:
+            self.graph.add_node(node_id, recipe=resolve(node_id))
+
+    def _record(self, op: str, **fields: Any) -> None:
+        self._seq += 1
+        self._events.append({"seq": self._seq, "op": op, **fields})
 
     def get_graph_size(self) -> int:
         logger.debug("Getting the number of nodes in the recipe graph.")
@@ -145,8 +282,10 @@ class RecipeGraph:
     def create_recipe_graph(self, recipe: Recipe) -> str:
         logger.debug("Creating recipe graph with foundational recipe.")
         node_id = str(uuid.uuid4())
-        self.graph.add_node(node_id, recipe=recipe)
+        self.graph.add_node(node_id, recipe=self._intern(recipe))
         self.foundational_recipe_node = node_id
+        self._record("add_node", node_id=node_id)
+        self._record("set_foundational", node_id=node_id)
         return node_id
 
     def get_recipe(self, node_id: Optional[str] = None) -> Optional[Recipe]:
@@ -155,7 +294,9 @@ class RecipeGraph:
             node_id = self.foundational_recipe_node
         if self.get_graph_size() == 0:
             return None
-        return Recipe.from_json(self.graph.nodes[node_id].get('recipe', None))
+        recipe = self.graph.nodes[node_id].get('recipe', None)
+        # Callers get their own copy to modify, without a JSON round trip
+        return recipe.clone() if recipe is not None else None
     
     def get_node_id(self, node_id: Optional[str] = None) -> Optional[str]:
         logger.debug("Getting node ID from recipe graph.")
@@ -167,10 +308,13 @@ class RecipeGraph:
         logger.debug("Adding node to recipe graph.")
         node_id = recipe._id
         logger.debug(f"Node ID: {node_id}")
-        self.graph.add_node(node_id, recipe=recipe)
+        self.graph.add_node(node_id, recipe=self._intern(recipe))
+        self._record("add_node", node_id=node_id)
         if self.foundational_recipe_node is not None:
             self.graph.add_edge(self.foundational_recipe_node, node_id)
+            self._record("add_edge", source=self.foundational_recipe_node, target=node_id)
         self.foundational_recipe_node = node_id
+        self._record("set_foundational", node_id=node_id)
         return node_id
 
     def get_foundational_recipe(self) -> Optional[Recipe]:
@@ -183,6 +327,7 @@ class RecipeGraph:
             self.create_recipe_graph(recipe)
         if self.get_graph_size() != 0 and recipe.get_ID() in self.graph.nodes:
             self.foundational_recipe_node = recipe.get_ID()
+            self._record("set_foundational", node_id=recipe.get_ID())
         else:
             return "Node not found in graph."
 
@@ -190,14 +335,20 @@ class RecipeGraph:
         logger.debug("Getting recipe graph.")
         return self.graph
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Serialize the recipe graph to a JSON-safe dictionary."""
+    def to_dict(self, deltas: bool = False) -> Dict[str, Any]:
+        """Serialize the recipe graph to a JSON-safe dictionary.
+
+        With ``deltas``, nodes are in ``encode_node`` form rather than full recipes.
+        """
         nodes = []
         for node_id, data in self.graph.nodes(data=True):
+            if deltas:
+                nodes.append({"node_id": node_id, **self.encode_node(node_id)})
+                continue
             recipe = data.get('recipe')
             nodes.append({
                 "node_id": node_id,
-                "recipe": json.loads(recipe.model_dump_json()) if recipe else None
+                "recipe": recipe.model_dump(mode="json") if recipe else None
             })
         edges = [{"source": u, "target": v} for u, v in self.graph.edges()]
         return {
@@ -208,16 +359,27 @@ class RecipeGraph:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'RecipeGraph':
-        """Deserialize a recipe graph from a dictionary."""
+        """Deserialize a recipe graph from a dictionary (full or delta-encoded nodes)."""
         graph = cls()
-        for node_data in data.get("nodes", []):
-            recipe = Recipe.model_validate(node_data["recipe"]) if node_data["recipe"] else None
-            graph.graph.add_node(node_data["node_id"], recipe=recipe)
+        graph._add_encoded_nodes([(node_data["node_id"], node_data) for node_data in data.get("nodes", [])])
         for edge_data in data.get("edges", []):
             graph.graph.add_edge(edge_data["source"], edge_data["target"])
         graph.foundational_recipe_node = data.get("foundational_recipe_node")
         return graph
 
+    def apply_event(self, event: Dict[str, Any]) -> None:
+        """Apply one journal event (as written by ``save_graph_to_file``) without recording it."""
+        op = event["op"]
+        if op == "add_node":
+            self._add_encoded_nodes([(event["node_id"], event)])
+        elif op == "add_edge":
+            self.graph.add_edge(event["source"], event["target"])
+        elif op == "set_foundational":
+            self.foundational_recipe_node = event["node_id"]
+        else:
+            raise ValueError(f"Unknown graph journal event: {op}")
+        self._seq = event["seq"]
+
 class ModsList(BaseModel):
     """Model for a list of recipe modifications."""
     queue: List[Tuple[int, RecipeModification]] = Field(default=[], description="Priority queue of recipe modifications")
@@ -357,6 +519,356 @@ class Pot(BaseModel):
         self.recipes = []
         self.urlList = []
 
+## Storage Backends
+class StateBackend(ABC):
+    """Where recipe graphs, mods lists and pots are stored.
+
+    Every method takes the state file path callers already pass around
+    (the defaults above, or a session's paths from its ContextVars).
+    Loading state that was never saved raises ``FileNotFoundError``.
+    Subclasses implement every load and save method.
+    """
+    @abstractmethod
+    def load_graph(self, location: str) -> RecipeGraph:
+        ...
+
+    @abstractmethod
+    def save_graph(self, recipe_graph: RecipeGraph, location: str) -> None:
+        ...
+
+    @abstractmethod
+    def load_mods_list(self, location: str) -> ModsList:
+        ...
+
+    @abstractmethod
+    def save_mods_list(self, mods_list: ModsList, location: str) -> None:
+        ...
+
+    @abstractmethod
+    def load_pot(self, location: str) -> Pot:
+        ...
+
+    @abstractmethod
+    def save_pot(self, pot: Pot, location: str) -> None:
+        ...
+
+    def drop_session(self, session_dir: str) -> None:
+        """Forget the state of the session whose files live in ``session_dir``.
+
+        Nothing to do by default: state stored in the directory goes with it.
+        """
+
+class JsonBackend(StateBackend):
+    """State in JSON files at the given paths; graphs as snapshot plus journal."""
+    def load_graph(self, location: str) -> RecipeGraph:
+        """Load a recipe graph: the snapshot, then every newer journal record.
+
+        A record cut short by a crash mid-write ends the replay and is
+        truncated from the journal.
+        """
+        logger.info("Loading RecipeGraph from file.")
+        if not os.path.exists(location):
+            raise FileNotFoundError(f"{location} does not exist.")
+        with open(location, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        graph = RecipeGraph.from_dict(data)
+        graph._seq = data.get("seq", 0)
+        journal = graph_journal_file(location)
+        if os.path.exists(journal):
+            damaged_at = None
+            with open(journal, 'rb') as f:
+                offset = 0
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("incomplete record")
+                        event = json.loads(line)
+                    except ValueError as e:
+                        logger.warning(f"Discarding damaged journal tail of {journal} at byte {offset}: {e}")
+                        damaged_at = offset
+                        break
+                    offset += len(line)
+                    graph._journal_records += 1
+                    if event["seq"] > graph._seq:
+                        graph.apply_event(event)
+                    elif event["op"] == "add_node" and event["node_id"] not in graph.graph:
+                        # Appended by a writer that had not seen the snapshot
+                        logger.warning(f"Skipping journal record {event['seq']} of {journal}: "
+                                       f"older than snapshot seq {graph._seq} but not in the snapshot")
+            if damaged_at is not None:
+                os.truncate(journal, damaged_at)
+        graph._journal_file = location
+        graph._journal_stamp = graph_state_stamp(location)
+        return graph
+
+    def save_graph(self, recipe_graph: RecipeGraph, location: str) -> None:
+        """Save a recipe graph.
+
+        A graph loaded from (or last saved to) ``location`` has only its new
+        events appended to the journal, one JSON line each, so the cost of a
+        save does not grow with the graph. Any other graph, or a journal that
+        has reached ``GRAPH_COMPACT_EVERY`` records, is written as a fresh
+        snapshot and the journal is emptied.
+
+        Raises ``RuntimeError`` if another writer changed the files since
+        this graph loaded or saved them: its event numbers would collide
+        with that writer's and its edits could be dropped at the next load.
+        """
+        if recipe_graph._journal_file == location and os.path.exists(location):
+            if graph_state_stamp(location) != recipe_graph._journal_stamp:
+                raise RuntimeError(f"{location} was changed by another writer; reload the graph before saving")
+            if recipe_graph._journal_records + len(recipe_graph._events) < GRAPH_COMPACT_EVERY:
+                _append_graph_events(recipe_graph, location)
+                return
+        compact_graph_file(recipe_graph, location)
+
+    def load_mods_list(self, location: str) -> ModsList:
+        logger.info("Loading ModsList from file.")
+        if os.path.exists(location):
+            with open(location, 'r', encoding='utf-8') as f:
+                return ModsList.model_validate_json(f.read())
+        else:
+            raise FileNotFoundError(f"{location} does not exist.")
+
+    def save_mods_list(self, mods_list: ModsList, location: str) -> None:
+        logger.info("Saving ModsList to file.")
+        with open(location, 'w', encoding='utf-8') as f:
+            f.write(mods_list.model_dump_json())
+
+    def load_pot(self, location: str) -> Pot:
+        logger.info("Loading Pot from file.")
+        if os.path.exists(location):
+            with open(location, 'r', encoding='utf-8') as f:
+                return Pot.model_validate_json(f.read())
+        else:
+            raise FileNotFoundError(f"{location} does not exist.")
+
+    def save_pot(self, pot: Pot, location: str) -> None:
+        logger.info("Saving Pot to file.")
+        with open(location, 'w', encoding='utf-8') as f:
+            f.write(pot.model_dump_json())
+
+class SqliteBackend(StateBackend):
+    """State for every session in one SQLite database (WAL mode).
+
+    Rows are keyed by the directory a state path points into (the session,
+    made absolute) and the file name, so ``sessions/abc/recipe_graph.json``
+    is stored under session id ``sessions/abc``, file ``recipe_graph.json``,
+    and two graphs saved into one directory stay separate. Graph saves
+    insert only the nodes and edges added since the last save; mods lists
+    and pots replace their rows. A recipe row with ``base_node`` set holds
+    a delta against that node (see ``RecipeGraph.encode_node``).
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS graphs (
+            session_id TEXT NOT NULL,
+            file TEXT NOT NULL,
+            foundational_node TEXT,
+            seq INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (session_id, file)
+        );
+        CREATE TABLE IF NOT EXISTS recipes (
+            session_id TEXT NOT NULL,
+            file TEXT NOT NULL,
+            node_id TEXT NOT NULL,
+            name TEXT,
+            recipe TEXT,
+            base_node TEXT,
+            PRIMARY KEY (session_id, file, node_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_recipes_node ON recipes (node_id);
+        CREATE TABLE IF NOT EXISTS graph_edges (
+            session_id TEXT NOT NULL,
+            file TEXT NOT NULL,
+            source TEXT NOT NULL,
+            target TEXT NOT NULL,
+            PRIMARY KEY (session_id, file, source, target)
+        );
+        CREATE INDEX IF NOT EXISTS idx_graph_edges_target ON graph_edges (session_id, file, target);
+        CREATE TABLE IF NOT EXISTS mods_lists (
+            session_id TEXT NOT NULL,
+            file TEXT NOT NULL,
+            PRIMARY KEY (session_id, file)
+        );
+        CREATE TABLE IF NOT EXISTS modifications (
+            session_id TEXT NOT NULL,
+            file TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            priority INTEGER NOT NULL,
+            modification TEXT NOT NULL,
+            PRIMARY KEY (session_id, file, position)
+        );
+        CREATE TABLE IF NOT EXISTS pots (
+            session_id TEXT NOT NULL,
+            file TEXT NOT NULL,
+            urls TEXT NOT NULL,
+            PRIMARY KEY (session_id, file)
+        );
+        CREATE TABLE IF NOT EXISTS pot_recipes (
+            session_id TEXT NOT NULL,
+            file TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            recipe TEXT NOT NULL,
+            PRIMARY KEY (session_id, file, position)
+        );
+    """
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        # One connection shared by the tool, flush and event-loop threads
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(f"PRAGMA synchronous={'FULL' if GRAPH_FSYNC else 'NORMAL'}")
+            self._conn.executescript(self.SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def state_key(location: str) -> Tuple[str, str]:
+        """(session id, file name) the rows for ``location`` are stored under."""
+        location = os.path.abspath(location)
+        return os.path.dirname(location), os.path.basename(location)
+
+    def load_graph(self, location: str) -> RecipeGraph:
+        logger.info("Loading RecipeGraph from database.")
+        key = self.state_key(location)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT foundational_node, seq FROM graphs WHERE session_id = ? AND file = ?", key).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"{location} does not exist.")
+            nodes = self._conn.execute(
+                "SELECT node_id, base_node, recipe FROM recipes WHERE session_id = ? AND file = ? ORDER BY rowid",
+                key).fetchall()
+            edges = self._conn.execute(
+                "SELECT source, target FROM graph_edges WHERE session_id = ? AND file = ? ORDER BY rowid", key).fetchall()
+        graph = RecipeGraph()
+        # With base_node set, the recipe column holds a delta against that node
+        graph._add_encoded_nodes([
+            (node_id, {"base": base, "delta": json.loads(recipe)} if base
+             else {"recipe": json.loads(recipe) if recipe else None})
+            for node_id, base, recipe in nodes])
+        graph.graph.add_edges_from(edges)
+        graph.foundational_recipe_node, graph._seq = row
+        graph._journal_file = location
+        graph._journal_stamp = graph._seq
+        return graph
+
+    def save_graph(self, recipe_graph: RecipeGraph, location: str) -> None:
+        """Save a recipe graph; same contract as ``JsonBackend.save_graph``.
+
+        Raises ``RuntimeError`` if another writer saved the graph since this
+        one loaded or saved it (the stored seq moved on).
+        """
+        logger.info("Saving RecipeGraph to database.")
+        key = self.state_key(location)
+        g = recipe_graph.graph
+        with self._lock, self._conn:
+            # Take the write lock now, so the seq check and the writes are one transaction
+            self._conn.execute("BEGIN IMMEDIATE")
+            stored = self._conn.execute("SELECT seq FROM graphs WHERE session_id = ? AND file = ?", key).fetchone()
+            if recipe_graph._journal_file == location and stored:
+                if stored[0] != recipe_graph._journal_stamp:
+                    raise RuntimeError(f"{location} was changed by another writer; reload the graph before saving")
+                # In sync with the stored graph: write only what changed since
+                nodes = [e["node_id"] for e in recipe_graph._events if e["op"] == "add_node"]
+                edges = [(e["source"], e["target"]) for e in recipe_graph._events if e["op"] == "add_edge"]
+            else:
+                self._conn.execute("DELETE FROM recipes WHERE session_id = ? AND file = ?", key)
+                self._conn.execute("DELETE FROM graph_edges WHERE session_id = ? AND file = ?", key)
+                nodes, edges = list(g.nodes), list(g.edges)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO recipes (session_id, file, node_id, name, base_node, recipe) VALUES (?, ?, ?, ?, ?, ?)",
+                [(*key, n, *self._recipe_row(recipe_graph, n)) for n in nodes])
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO graph_edges (session_id, file, source, target) VALUES (?, ?, ?, ?)",
+                [(*key, u, v) for u, v in edges])
+            self._conn.execute(
+                "INSERT OR REPLACE INTO graphs (session_id, file, foundational_node, seq) VALUES (?, ?, ?, ?)",
+                (*key, recipe_graph.foundational_recipe_node, recipe_graph._seq))
+        recipe_graph._journal_file = location
+        recipe_graph._journal_stamp = recipe_graph._seq
+        recipe_graph._events = []
+
+    @staticmethod
+    def _recipe_row(recipe_graph: RecipeGraph, node_id: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        recipe = recipe_graph.graph.nodes[node_id].get('recipe')
+        encoded = recipe_graph.encode_node(node_id)
+        if "delta" in encoded:
+            return recipe.name, encoded["base"], json.dumps(encoded["delta"])
+        return (recipe.name, None, recipe.model_dump_json()) if recipe else (None, None, None)
+
+    def load_mods_list(self, location: str) -> ModsList:
+        logger.info("Loading ModsList from database.")
+        key = self.state_key(location)
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM mods_lists WHERE session_id = ? AND file = ?", key).fetchone() is None:
+                raise FileNotFoundError(f"{location} does not exist.")
+            rows = self._conn.execute(
+                "SELECT priority, modification FROM modifications WHERE session_id = ? AND file = ? ORDER BY position",
+                key).fetchall()
+        # Rows keep heap order, so the queue comes back exactly as saved
+        return ModsList(queue=[(priority, RecipeModification.model_validate_json(mod)) for priority, mod in rows])
+
+    def save_mods_list(self, mods_list: ModsList, location: str) -> None:
+        logger.info("Saving ModsList to database.")
+        key = self.state_key(location)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO mods_lists (session_id, file) VALUES (?, ?)", key)
+            self._conn.execute("DELETE FROM modifications WHERE session_id = ? AND file = ?", key)
+            self._conn.executemany(
+                "INSERT INTO modifications (session_id, file, position, priority, modification) VALUES (?, ?, ?, ?, ?)",
+                [(*key, i, priority, mod.model_dump_json()) for i, (priority, mod) in enumerate(mods_list.queue)])
+
+    def load_pot(self, location: str) -> Pot:
+        logger.info("Loading Pot from database.")
+        key = self.state_key(location)
+        with self._lock:
+            row = self._conn.execute("SELECT urls FROM pots WHERE session_id = ? AND file = ?", key).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"{location} does not exist.")
+            recipes = self._conn.execute(
+                "SELECT recipe FROM pot_recipes WHERE session_id = ? AND file = ? ORDER BY position", key).fetchall()
+        return Pot(recipes=[Recipe.model_validate_json(r) for r, in recipes], urlList=json.loads(row[0]))
+
+    def save_pot(self, pot: Pot, location: str) -> None:
+        logger.info("Saving Pot to database.")
+        key = self.state_key(location)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO pots (session_id, file, urls) VALUES (?, ?, ?)",
+                               (*key, json.dumps(pot.urlList)))
+            self._conn.execute("DELETE FROM pot_recipes WHERE session_id = ? AND file = ?", key)
+            self._conn.executemany(
+                "INSERT INTO pot_recipes (session_id, file, position, recipe) VALUES (?, ?, ?, ?)",
+                [(*key, i, recipe.model_dump_json()) for i, recipe in enumerate(pot.recipes)])
+
+    def drop_session(self, session_dir: str) -> None:
+        sid = os.path.abspath(session_dir)
+        with self._lock, self._conn:
+            for table in ("graphs", "recipes", "graph_edges", "mods_lists", "modifications", "pots", "pot_recipes"):
+                self._conn.execute(f"DELETE FROM {table} WHERE session_id = ?", (sid,))
+
+STATE_BACKENDS = {"json": JsonBackend, "sqlite": SqliteBackend}
+_state_backend: Optional[StateBackend] = None
+
+def get_state_backend() -> StateBackend:
+    """The backend the wrapper functions below use, chosen by CALDRON_STATE_BACKEND."""
+    global _state_backend
+    if _state_backend is None:
+        from config import STATE_BACKEND, STATE_DB_FILE
+        if STATE_BACKEND not in STATE_BACKENDS:
+            raise ValueError(f"Unknown state backend: {STATE_BACKEND!r} (expected one of {list(STATE_BACKENDS)})")
+        _state_backend = SqliteBackend(STATE_DB_FILE) if STATE_BACKEND == "sqlite" else JsonBackend()
+    return _state_backend
+
+def set_state_backend(backend: Optional[StateBackend]) -> None:
+    """Use ``backend`` from now on (None goes back to the configured one)."""
+    global _state_backend
+    _state_backend = backend
+
 # General utility functions
 
 ## Graph Wrapper Functions
@@ -366,18 +878,66 @@ def fresh_graph(filename: str = default_graph_file) -> str:
     save_graph_to_file(graph, filename)
     return filename
 
+def graph_journal_file(filename: str = default_graph_file) -> str:
+    """Path of the append-only journal kept next to a graph snapshot file."""
+    return filename + ".journal"
+
+def graph_state_stamp(filename: str = default_graph_file) -> tuple:
+    """Modification time and size of a graph snapshot and of its journal (None where missing)."""
+    stamps = []
+    for path in (filename, graph_journal_file(filename)):
+        try:
+            st = os.stat(path)
+            stamps.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            stamps.append(None)
+    return tuple(stamps)
+
 def save_graph_to_file(recipe_graph: RecipeGraph, filename: str = default_graph_file) -> None:
+    get_state_backend().save_graph(recipe_graph, filename)
+
+def _append_graph_events(recipe_graph: RecipeGraph, filename: str) -> None:
+    if not recipe_graph._events:
+        return
+    logger.info("Appending RecipeGraph events to journal.")
+    lines = []
+    for event in recipe_graph._events:
+        if event["op"] == "add_node":
+            event = {**event, **recipe_graph.encode_node(event["node_id"])}
+        lines.append(json.dumps(event) + "\n")
+    with open(graph_journal_file(filename), 'a', encoding='utf-8') as f:
+        f.write("".join(lines))
+        f.flush()
+        if GRAPH_FSYNC:
+            os.fsync(f.fileno())
+    recipe_graph._journal_records += len(lines)
+    recipe_graph._journal_stamp = graph_state_stamp(filename)
+    recipe_graph._events = []
+
+def compact_graph_file(recipe_graph: RecipeGraph, filename: str = default_graph_file) -> None:
+    """Write the whole graph as a JSON snapshot and empty its journal."""
     logger.info("Saving RecipeGraph to file.")
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(recipe_graph.to_dict(), f, indent=2)
+    data = recipe_graph.to_dict(deltas=True)
+    # Journal records up to this number are contained in the snapshot
+    data["seq"] = recipe_graph._seq
+    tmp = f"{filename}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        if GRAPH_FSYNC:
+            os.fsync(f.fileno())
+    os.replace(tmp, filename)
+    # A crash before this point leaves only records the snapshot already holds
+    journal = graph_journal_file(filename)
+    if os.path.exists(journal):
+        os.remove(journal)
+    recipe_graph._journal_file = filename
+    recipe_graph._journal_records = 0
+    recipe_graph._journal_stamp = graph_state_stamp(filename)
+    recipe_graph._events = []
 
 def load_graph_from_file(filename: str = default_graph_file) -> RecipeGraph:
-    logger.info("Loading RecipeGraph from file.")
-    if os.path.exists(filename):
-        with open(filename, 'r', encoding='utf-8') as f:
-            return RecipeGraph.from_dict(json.load(f))
-    else:
-        raise FileNotFoundError(f"{filename} does not exist.")
+    return get_state_backend().load_graph(filename)
 
 ## ModsList Wrapper Functions
 def fresh_mods_list(filename: str = default_mods_list_file) -> str:
@@ -387,17 +947,10 @@ def fresh_mods_list(filename: str = default_mods_list_file) -> str:
     return filename
 
 def save_mods_list_to_file(mods_list: ModsList, filename: str = default_mods_list_file) -> None:
-    logger.info("Saving ModsList to file.")
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(mods_list.model_dump_json())
+    get_state_backend().save_mods_list(mods_list, filename)
 
 def load_mods_list_from_file(filename: str = default_mods_list_file) -> ModsList:
-    logger.info("Loading ModsList from file.")
-    if os.path.exists(filename):
-        with open(filename, 'r', encoding='utf-8') as f:
-            return ModsList.model_validate_json(f.read())
-    else:
-        raise FileNotFoundError(f"{filename} does not exist.")
+    return get_state_backend().load_mods_list(filename)
 
 ## Pot Wrapper Functions
 def fresh_pot(filename: str = default_pot_file) -> str:
@@ -407,14 +960,7 @@ def fresh_pot(filename: str = default_pot_file) -> str:
     return filename
 
 def save_pot_to_file(pot: Pot, filename: str = default_pot_file) -> None:
-    logger.info("Saving Pot to file.")
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(pot.model_dump_json())
+    get_state_backend().save_pot(pot, filename)
 
 def load_pot_from_file(filename: str = default_pot_file) -> Pot:
-    logger.info("Loading Pot from file.")
-    if os.path.exists(filename):
-        with open(filename, 'r', encoding='utf-8') as f:
-            return Pot.model_validate_json(f.read())
-    else:
-        raise FileNotFoundError(f"{filename} does not exist.")
\ No newline at end of file
+    return get_state_backend().load_pot(filename)
@@ -21,12 +21,27 @@ LANGCHAIN_TRACING_V2 = os.getenv("LANGCHAIN_TRACING_V2", "false").lower() == "tr
 # --- Application Settings ---
 DB_PATH = os.getenv("CALDRON_DB_PATH", "sqlite:///sql/recipes_0514_1658_views.db")
 LLM_MODEL = os.getenv("CALDRON_LLM_MODEL", "gpt-3.5-turbo")
+# Worker threads for agent chain turns in the API server (bounds concurrent turns)
+CHAIN_WORKERS = int(os.getenv("CALDRON_CHAIN_WORKERS", "32"))
+# Agent turns allowed to run at once across all sessions; the rest queue
+MAX_CONCURRENT_TURNS = int(os.getenv("CALDRON_MAX_CONCURRENT_TURNS", "16"))
 
 # --- State Persistence ---
 STATE_DIR = os.getenv("CALDRON_STATE_DIR", ".")
 MODS_LIST_FILE = os.path.join(STATE_DIR, "mods_list.json")
 RECIPE_GRAPH_FILE = os.path.join(STATE_DIR, "recipe_graph.json")
 RECIPE_POT_FILE = os.path.join(STATE_DIR, "recipe_pot.json")
+# Where session state is stored: json (files in STATE_DIR / session directories) | sqlite
+STATE_BACKEND = os.getenv("CALDRON_STATE_BACKEND", "json")
+STATE_DB_FILE = os.getenv("CALDRON_STATE_DB", os.path.join(STATE_DIR, "caldron_state.db"))
+# Recipe graphs are saved by appending to a journal; after this many records it is compacted into the snapshot
+GRAPH_COMPACT_EVERY = int(os.getenv("CALDRON_GRAPH_COMPACT_EVERY", "200"))
+# fsync graph journal appends and snapshots before returning
+GRAPH_FSYNC = os.getenv("CALDRON_GRAPH_FSYNC", "true").lower() == "true"
+# Stored recipe versions are deltas against their parent, with a full copy every this many along a chain
+RECIPE_CHECKPOINT_EVERY = max(1, int(os.getenv("CALDRON_RECIPE_CHECKPOINT_EVERY", "16")))
+# Seconds API session state may stay in memory unsaved after an edit (0 = write through)
+STATE_FLUSH_DELAY = float(os.getenv("CALDRON_STATE_FLUSH_DELAY", "0.5"))
 
 # --- ML Models ---
 ML_MODELS_DIR = os.getenv(
@@ -34,6 +49,21 @@ ML_MODELS_DIR = os.getenv(
     os.path.join(os.path.dirname(__file__), '..', 'research', 'phase7', 'data')
 )
 ML_ENABLED = os.getenv("CALDRON_ML_ENABLED", "true").lower() == "true"
+# Nearest-neighbor backend for substitution lookups: exact | ivf | faiss | hnswlib | auto
+ML_ANN_BACKEND = os.getenv("CALDRON_ML_ANN_BACKEND", "exact")
+# Models to preload at API startup: comma-separated names, "all", or empty (lazy loading)
+ML_WARMUP = [m.strip() for m in os.getenv("CALDRON_ML_WARMUP", "").split(",") if m.strip()]
+# Refuse WebSocket sessions until warmup has finished
+ML_REQUIRE_WARM = os.getenv("CALDRON_ML_REQUIRE_WARM", "false").lower() == "true"
+# Seconds between checks for a new model version under ML_MODELS_DIR (0 disables hot reload)
+ML_RELOAD_INTERVAL = float(os.getenv("CALDRON_ML_RELOAD_INTERVAL", "0"))
+# Result cache for ML queries: max entries (0 disables) and entry lifetime in seconds (0 = no expiry)
+ML_CACHE_SIZE = int(os.getenv("CALDRON_ML_CACHE_SIZE", "4096"))
+ML_CACHE_TTL = float(os.getenv("CALDRON_ML_CACHE_TTL", "3600"))
+# Executors behind AsyncCulinaryMLService: thread | process, sized for single and batch calls
+ML_EXECUTOR = os.getenv("CALDRON_ML_EXECUTOR", "thread")
+ML_WORKERS = int(os.getenv("CALDRON_ML_WORKERS", "4"))
+ML_BATCH_WORKERS = int(os.getenv("CALDRON_ML_BATCH_WORKERS", "2"))
 
 
 def validate_required_keys() -> None:
@@ -4,11 +4,16 @@ Provides lazy-loaded, thread-safe access to trained ML models for
 ingredient substitution, recipe completion, and affinity scoring.
 """
 
+import copy
+import functools
 import json
 import logging
 import os
 import sys
 import threading
+import time
+import weakref
+from contextvars import ContextVar
 from pathlib import Path
 from typing import Optional
 
@@ -20,18 +25,74 @@ if _RESEARCH_DIR not in sys.path:
     sys.path.insert(0, _RESEARCH_DIR)
 
 
+# Models preloadable by ``CulinaryMLService.warmup``: name → loader method
+WARMUP_LOADERS = {
+    "food2vec": "_load_food2vec",
+    "cf": "_load_cf",
+    "techniques": "_load_technique_data",
+    "flavor_profiles": "_load_flavor_profiles",
+    "normalizer": "_load_normalizer",
+}
+
+
+class _ModelSet:
+    """The models of one registry version, each loaded lazily on first use."""
+
+    MODELS = ("vocab", "canonical_map", "food2vec", "cf", "normalizer",
+              "techniques", "flavor_profiles")
+
+    def __init__(self, path: Path, version: str):
+        self.path = Path(path)
+        self.version = version
+        for name in self.MODELS:
+            setattr(self, name, None)
+        # One lock per model so independent models can load in parallel
+        self.locks = {name: threading.Lock() for name in self.MODELS}
+
+    def loaded(self) -> list[str]:
+        """Names of the models loaded so far."""
+        return [name for name in self.MODELS if getattr(self, name) is not None]
+
+
+# Model set pinned for the duration of a public service call
+_pinned_models: ContextVar[Optional[_ModelSet]] = ContextVar("ml_pinned_models", default=None)
+
+
+def _pinned(method):
+    """Run a service call against one model version from start to finish.
+
+    A hot reload swaps ``CulinaryMLService._models`` between two loads of a
+    call; pinning keeps every load in the call on the version it started on.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if _pinned_models.get() is not None:
+            return method(self, *args, **kwargs)
+        token = _pinned_models.set(self._models)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            _pinned_models.reset(token)
+    return wrapper
+
+
 class CulinaryMLService:
     """Singleton service providing ML-backed culinary intelligence.
 
     Models are loaded lazily on first access and cached. Thread-safe
     for use in FastAPI async contexts. Degrades gracefully when models
     are unavailable.
+
+    Models come from the newest version in the ``ModelRegistry`` under
+    ``models_dir``. ``reload()`` (or the ``start_watching`` thread) loads a
+    newer version in the background and swaps it in; calls already running
+    finish on the version they started with.
     """
 
     _instance: Optional["CulinaryMLService"] = None
     _lock = threading.Lock()
 
-    def __new__(cls, models_dir: Optional[str] = None):
+    def __new__(cls, models_dir: Optional[str] = None, ann_backend: Optional[str] = None):
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:
@@ -40,17 +101,32 @@ class CulinaryMLService:
                     cls._instance = instance
         return cls._instance
 
-    def __init__(self, models_dir: Optional[str] = None):
+    def __init__(self, models_dir: Optional[str] = None, ann_backend: Optional[str] = None):
         if self._initialized:
             return
-        from config import ML_MODELS_DIR, ML_ENABLED
-        self._models_dir = Path(models_dir or ML_MODELS_DIR)
+        from config import ML_MODELS_DIR, ML_ENABLED, ML_ANN_BACKEND, ML_CACHE_SIZE, ML_CACHE_TTL
+        from model_registry import ModelRegistry
+        from result_cache import ResultCache
+        self._registry = ModelRegistry(models_dir or ML_MODELS_DIR)
         self._enabled = ML_ENABLED
-        self._food2vec = None
-        self._cf = None
-        self._vocab = None
-        self._canonical_map = None
-        self._model_lock = threading.Lock()
+        self._ann_backend = ann_backend or ML_ANN_BACKEND
+        if self._ann_backend != "exact":
+            # Checked once here rather than on every food2vec load
+            from ann_index import ANN_BACKENDS
+            if self._ann_backend not in ANN_BACKENDS and self._ann_backend != "auto":
+                raise ValueError(f"Unknown ANN backend: {self._ann_backend!r} "
+                                 f"(expected one of {sorted(ANN_BACKENDS)} or 'auto')")
+        current = self._registry.resolve()
+        self._models = _ModelSet(current.path, current.version)
+        self._retired: weakref.WeakSet = weakref.WeakSet()
+        self._reload_lock = threading.Lock()
+        self._failed_versions: set[str] = set()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        # Query results keyed by (model version, method, canonical arguments)
+        self._cache = ResultCache(ML_CACHE_SIZE, ML_CACHE_TTL)
+        self._warmup_status: dict[str, dict] = {}
+        self._warmup_lock = threading.Lock()
         self._initialized = True
 
     @classmethod
@@ -63,72 +139,292 @@ class CulinaryMLService:
         """Check if ML models are available."""
         if not self._enabled:
             return False
-        return (self._models_dir / "food2vec.model").exists()
+        from food2vec import EMBEDDING_VECTORS
+        models_dir = self._current().path
+        return (
+            (models_dir / EMBEDDING_VECTORS).exists()
+            or (models_dir / "food2vec.model").exists()
+        )
+
+    @property
+    def version(self) -> str:
+        """Registry version currently served."""
+        return self._models.version
+
+    def _current(self) -> _ModelSet:
+        """Model set for this call: the pinned one, else the active one."""
+        return _pinned_models.get() or self._models
 
     def _load_vocab(self):
-        if self._vocab is None:
-            with self._model_lock:
-                if self._vocab is None:
+        models = self._current()
+        if models.vocab is None:
+            with models.locks["vocab"]:
+                if models.vocab is None:
                     from data_pipeline import IngredientVocab
-                    vocab_path = self._models_dir / "vocab.json"
+                    vocab_path = models.path / "vocab.json"
                     if vocab_path.exists():
-                        self._vocab = IngredientVocab.load(vocab_path)
-                        logger.info(f"Loaded vocab: {self._vocab.size} ingredients")
+                        models.vocab = IngredientVocab.load(vocab_path)
+                        logger.info(f"Loaded vocab: {models.vocab.size} ingredients")
                     else:
                         logger.warning(f"Vocab not found: {vocab_path}")
-        return self._vocab
+        return models.vocab
 
     def _load_canonical_map(self):
-        if self._canonical_map is None:
-            with self._model_lock:
-                if self._canonical_map is None:
+        models = self._current()
+        if models.canonical_map is None:
+            with models.locks["canonical_map"]:
+                if models.canonical_map is None:
                     from vocab_canonicalize import CanonicalMap
-                    cmap_path = self._models_dir / "canonical_map.json"
+                    cmap_path = models.path / "canonical_map.json"
                     if cmap_path.exists():
-                        self._canonical_map = CanonicalMap.load(cmap_path)
+                        models.canonical_map = CanonicalMap.load(cmap_path)
                     else:
                         # Return empty map — no canonicalization
-                        self._canonical_map = CanonicalMap()
-        return self._canonical_map
+                        models.canonical_map = CanonicalMap()
+        return models.canonical_map
 
     def _load_food2vec(self):
-        if self._food2vec is None:
-            with self._model_lock:
-                if self._food2vec is None:
-                    from food2vec import Food2Vec
-                    model_path = self._models_dir / "food2vec.model"
-                    if model_path.exists():
-                        self._food2vec = Food2Vec.load(model_path)
-                        logger.info(f"Loaded food2vec: {len(self._food2vec.vocabulary)} ingredients")
+        models = self._current()
+        if models.food2vec is None:
+            with models.locks["food2vec"]:
+                if models.food2vec is None:
+                    from food2vec import EMBEDDING_VECTORS, EmbeddingStore, Food2Vec
+                    model_path = models.path / "food2vec.model"
+                    model = None
+                    if (models.path / EMBEDDING_VECTORS).exists():
+                        # Exported unit vectors: memory-mapped, no gensim import
+                        model = EmbeddingStore.load(models.path)
+                        logger.info(f"Loaded food2vec embedding store: {len(model.vocabulary)} ingredients")
+                    elif model_path.exists():
+                        model = Food2Vec.load(model_path)
+                        logger.info(f"Loaded food2vec: {len(model.vocabulary)} ingredients")
                     else:
                         logger.warning(f"food2vec model not found: {model_path}")
-        return self._food2vec
+                    if model is not None and self._ann_backend != "exact":
+                        model.build_index(self._ann_backend)
+                    models.food2vec = model
+        return models.food2vec
 
     def _load_cf(self):
-        if self._cf is None:
-            with self._model_lock:
-                if self._cf is None:
-                    vocab = self._load_vocab()
-                    if vocab is None:
-                        return None
-                    ri_path = self._models_dir / "recipe_ingredient.npz"
-                    if ri_path.exists():
+        models = self._current()
+        if models.cf is None:
+            # Resolve the vocab before taking the (non-reentrant) model lock
+            vocab = self._load_vocab()
+            if vocab is None:
+                return None
+            with models.locks["cf"]:
+                if models.cf is None:
+                    from affinity_models import IngredientCF, CF_NEIGHBOR_INDICES
+                    ri_path = models.path / "recipe_ingredient.npz"
+                    if (models.path / CF_NEIGHBOR_INDICES).exists():
+                        # Precomputed neighbor table: memory-mapped, no refit
+                        models.cf = IngredientCF.load_neighbors(models.path, vocab)
+                        logger.info("Loaded collaborative filtering neighbor table")
+                    elif ri_path.exists():
                         from scipy.sparse import load_npz
-                        from affinity_models import IngredientCF
                         ri_matrix = load_npz(ri_path)
-                        self._cf = IngredientCF(n_neighbors=20)
-                        self._cf.fit(ri_matrix, vocab)
+                        cf = IngredientCF(n_neighbors=20)
+                        cf.fit(ri_matrix, vocab)
+                        models.cf = cf
                         logger.info("Loaded collaborative filtering model")
                     else:
                         logger.warning(f"Recipe-ingredient matrix not found: {ri_path}")
-        return self._cf
+        return models.cf
+
+    def _load_normalizer(self):
+        models = self._current()
+        if models.normalizer is None:
+            cmap = self._load_canonical_map()
+            with models.locks["normalizer"]:
+                if models.normalizer is None:
+                    from data_pipeline import IngredientNormalizer
+                    models.normalizer = IngredientNormalizer(canonical_map=cmap)
+        return models.normalizer
+
+    # ── Warmup ───────────────────────────────────────────────────────────
+
+    def warmup(self, models: Optional[list[str]] = None, wait: bool = False) -> dict[str, dict]:
+        """Preload models in parallel background threads.
+
+        Each model loads in its own thread, so warmup takes as long as the
+        slowest model. Progress is reported by ``warmup_status``.
+
+        Args:
+            models: Names from ``WARMUP_LOADERS`` (None = all of them).
+            wait: Block until every requested load has finished.
+
+        Returns:
+            The warmup status snapshot after starting (or finishing) the loads.
+        """
+        if not self._enabled:
+            return {}
+        models = list(WARMUP_LOADERS) if models is None else models
+        unknown = [m for m in models if m not in WARMUP_LOADERS]
+        if unknown:
+            raise ValueError(f"Unknown models for warmup: {unknown} (expected {sorted(WARMUP_LOADERS)})")
+
+        threads = []
+        with self._warmup_lock:
+            for name in models:
+                if name in self._warmup_status:
+                    continue
+                self._warmup_status[name] = {"status": "pending", "seconds": None, "error": None}
+                thread = threading.Thread(target=self._warmup_one, args=(name,),
+                                          name=f"ml-warmup-{name}", daemon=True)
+                threads.append(thread)
+        for thread in threads:
+            thread.start()
+        if wait:
+            for thread in threads:
+                thread.join()
+        return self.warmup_status()
+
+    def _warmup_one(self, name: str):
+        self._set_warmup_status(name, status="loading")
+        start = time.perf_counter()
+        try:
+            model = getattr(self, WARMUP_LOADERS[name])()
+        except Exception as e:
+            logger.error(f"Warmup of {name} failed: {e}")
+            self._set_warmup_status(name, status="failed", error=str(e)[:200],
+                                    seconds=round(time.perf_counter() - start, 3))
+            return
+        seconds = round(time.perf_counter() - start, 3)
+        # Missing artifacts load as None/empty: the service degrades for that model
+        status = "ready" if model is not None else "unavailable"
+        self._set_warmup_status(name, status=status, seconds=seconds)
+        logger.info(f"Warmup: {name} {status} in {seconds:.2f}s")
+
+    def _set_warmup_status(self, name: str, **fields):
+        with self._warmup_lock:
+            self._warmup_status[name] = {**self._warmup_status[name], **fields}
+
+    def warmup_status(self) -> dict[str, dict]:
+        """Per-model warmup state: status, load seconds and error, if any."""
+        with self._warmup_lock:
+            return {name: dict(entry) for name, entry in self._warmup_status.items()}
+
+    @property
+    def warm(self) -> bool:
+        """True once every model requested by ``warmup`` has finished loading."""
+        return all(entry["status"] not in ("pending", "loading")
+                   for entry in self.warmup_status().values())
+
+    # ── Hot reload ───────────────────────────────────────────────────────
+
+    def reload(self) -> bool:
+        """Swap in the newest registry version if it differs from the served one.
+
+        The new version is loaded before the swap — every model the current
+        version has loaded is preloaded — so the first requests after the
+        swap are as warm as the last ones before it. The old model set is
+        released once the calls pinned to it have finished.
+
+        Returns:
+            True if a new version was swapped in.
+        """
+        if not self._enabled:
+            return False
+        with self._reload_lock:
+            target = self._registry.resolve()
+            current = self._models
+            if target.version == current.version or target.version in self._failed_versions:
+                return False
+
+            candidate = _ModelSet(target.path, target.version)
+            token = _pinned_models.set(candidate)
+            try:
+                for name in current.loaded():
+                    if name in WARMUP_LOADERS:
+                        getattr(self, WARMUP_LOADERS[name])()
+            except Exception as e:
+                logger.error(f"Loading model version {target.version} failed, "
+                             f"keeping {current.version}: {e}")
+                self._failed_versions.add(target.version)
+                return False
+            finally:
+                _pinned_models.reset(token)
+
+            self._models = candidate
+            self._cache.clear()
+            self._retired.add(current)
+            weakref.finalize(current, logger.info, f"Released ML model version {current.version}")
+            logger.info(f"Swapped ML models {current.version} -> {candidate.version}")
+            return True
+
+    @property
+    def retired_versions(self) -> list[str]:
+        """Replaced versions still referenced by in-flight calls."""
+        return sorted(models.version for models in self._retired)
+
+    def start_watching(self, interval: float = 60.0):
+        """Poll the registry every ``interval`` seconds and reload on change."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_watching.clear()
+
+        def watch():
+            while not self._stop_watching.wait(interval):
+                try:
+                    self.reload()
+                except Exception as e:
+                    logger.error(f"Model registry watch failed: {e}")
+
+        self._watcher = threading.Thread(target=watch, name="ml-model-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        """Stop the registry watcher thread."""
+        self._stop_watching.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    # ── Result cache ─────────────────────────────────────────────────────
+
+    def cache_stats(self) -> dict:
+        """Result cache size and hit/miss/eviction counters."""
+        return self._cache.stats()
+
+    def _cached(self, method: str, args: tuple, compute):
+        """Return the cached result for ``method(*args)``, computing it on a miss.
+
+        ``args`` must already be canonical (normalized ingredient names).
+        Results are copied out so callers cannot mutate cached entries.
+        """
+        key = (self._current().version, method, args)
+        found, value = self._cache.get(key)
+        if not found:
+            value = compute()
+            self._cache.put(key, value)
+        return copy.deepcopy(value)
+
+    def _cached_many(self, method: str, args_list: list[tuple], compute_missing) -> list:
+        """Batch ``_cached``: ``compute_missing(positions)`` scores only the misses."""
+        version = self._current().version
+        results = [None] * len(args_list)
+        missing = []
+        for i, args in enumerate(args_list):
+            found, value = self._cache.get((version, method, args))
+            if found:
+                results[i] = value
+            else:
+                missing.append(i)
+        if missing:
+            for i, value in zip(missing, compute_missing(missing)):
+                self._cache.put((version, method, args_list[i]), value)
+                results[i] = value
+        return copy.deepcopy(results)
 
     def _normalize(self, ingredient: str) -> str:
         """Normalize and canonicalize an ingredient name."""
-        from data_pipeline import normalize_ingredient
-        cmap = self._load_canonical_map()
-        return normalize_ingredient(ingredient, canonical_map=cmap)
+        return self._load_normalizer()(ingredient)
+
+    def _normalize_many(self, ingredients: list[str]) -> list[str]:
+        """Normalize and canonicalize a batch of ingredient names in one pass."""
+        return self._load_normalizer().normalize_many(ingredients)
 
+    @_pinned
     def suggest_substitutions(
         self, ingredient: str, n: int = 5
     ) -> list[dict]:
@@ -152,12 +448,12 @@ class CulinaryMLService:
         if not normalized:
             return []
 
-        neighbors = model.most_similar(normalized, topn=n)
-        return [
+        return self._cached("suggest_substitutions", (normalized, n), lambda: [
             {"name": name, "score": round(score, 4), "source": "food2vec"}
-            for name, score in neighbors
-        ]
+            for name, score in model.most_similar(normalized, topn=n)
+        ])
 
+    @_pinned
     def complete_recipe(
         self, ingredients: list[str], n: int = 5
     ) -> list[dict]:
@@ -183,12 +479,12 @@ class CulinaryMLService:
         if len(normalized) < 1:
             return []
 
-        suggestions = cf.suggest_ingredients(normalized, topn=n)
-        return [
+        return self._cached("complete_recipe", (tuple(normalized), n), lambda: [
             {"name": name, "score": round(score, 4), "source": "collaborative_filtering"}
-            for name, score in suggestions
-        ]
+            for name, score in cf.suggest_ingredients(normalized, topn=n)
+        ])
 
+    @_pinned
     def score_affinity(self, ing_a: str, ing_b: str) -> dict:
         """Score how well two ingredients pair together.
 
@@ -211,53 +507,42 @@ class CulinaryMLService:
         if not a or not b:
             return {"score": 0.0, "food2vec_score": 0.0, "source": "unknown_ingredient"}
 
-        f2v_score = model.similarity(a, b)
-        return {
-            "score": round(f2v_score, 4),
-            "food2vec_score": round(f2v_score, 4),
-            "source": "food2vec",
-        }
+        def compute():
+            f2v_score = model.similarity(a, b)
+            return {
+                "score": round(f2v_score, 4),
+                "food2vec_score": round(f2v_score, 4),
+                "source": "food2vec",
+            }
+
+        # Similarity is symmetric: (a, b) and (b, a) share one entry
+        return self._cached("score_affinity", tuple(sorted((a, b))), compute)
 
     def _load_technique_data(self):
-        """Load technique co-occurrence data from recipes."""
-        if not hasattr(self, '_technique_data') or self._technique_data is None:
-            with self._model_lock:
-                if not hasattr(self, '_technique_data') or self._technique_data is None:
-                    meta_path = self._models_dir / "recipes_meta.json"
-                    if not meta_path.exists():
-                        self._technique_data = {}
-                        return self._technique_data
-
-                    import json as _json
-                    with open(meta_path) as f:
-                        recipes = _json.load(f)
-
-                    # Check if directions exist
-                    has_directions = any(r.get("directions") for r in recipes[:100])
-                    if not has_directions:
-                        self._technique_data = {}
-                        return self._technique_data
-
-                    # Build ingredient → technique counts
-                    from affinity_models import extract_techniques_from_instructions
-                    from collections import Counter
-
-                    ing_tech_counts: dict[str, Counter] = {}
-                    for recipe in recipes:
-                        directions = recipe.get("directions", "")
-                        if not directions:
-                            continue
-                        techniques = extract_techniques_from_instructions(directions)
-                        for ing in recipe.get("ingredients", []):
-                            if ing not in ing_tech_counts:
-                                ing_tech_counts[ing] = Counter()
-                            for tech in techniques:
-                                ing_tech_counts[ing][tech] += 1
-
-                    self._technique_data = ing_tech_counts
-                    logger.info(f"Loaded technique data for {len(ing_tech_counts)} ingredients")
-        return self._technique_data
+        """Load the ingredient×technique count index."""
+        models = self._current()
+        if models.techniques is None:
+            with models.locks["techniques"]:
+                if models.techniques is None:
+                    from affinity_models import TECHNIQUE_COUNTS, TechniqueIndex
+                    meta_path = models.path / "recipes_meta.json"
+                    if (models.path / TECHNIQUE_COUNTS).exists():
+                        models.techniques = TechniqueIndex.load(models.path)
+                    elif meta_path.exists():
+                        # No precomputed artifact: extract from every recipe (slow)
+                        logger.warning(
+                            f"{TECHNIQUE_COUNTS} not found; rebuilding technique counts "
+                            f"from {meta_path}"
+                        )
+                        with open(meta_path) as f:
+                            recipes = json.load(f)
+                        models.techniques = TechniqueIndex.from_recipes(recipes)
+                    else:
+                        models.techniques = TechniqueIndex.from_counts({})
+                    logger.info(f"Loaded technique data for {len(models.techniques)} ingredients")
+        return models.techniques
 
+    @_pinned
     def suggest_techniques(
         self, ingredient: str, n: int = 5
     ) -> list[dict]:
@@ -273,42 +558,36 @@ class CulinaryMLService:
         if not self._enabled:
             return []
 
-        technique_data = self._load_technique_data()
-        if not technique_data:
+        techniques = self._load_technique_data()
+        if not techniques:
             return []
 
         normalized = self._normalize(ingredient)
-        if not normalized or normalized not in technique_data:
-            return []
-
-        counts = technique_data[normalized]
-        total = sum(counts.values())
-        if total == 0:
+        if not normalized:
             return []
 
-        ranked = counts.most_common(n)
-        return [
-            {"technique": tech, "score": round(count / total, 4), "source": "technique_cooccurrence"}
-            for tech, count in ranked
-        ]
+        return self._cached("suggest_techniques", (normalized, n), lambda: [
+            {"technique": tech, "score": round(share, 4), "source": "technique_cooccurrence"}
+            for tech, share in techniques.top_techniques(normalized, n)
+        ])
 
     def _load_flavor_profiles(self):
         """Load ingredient flavor profiles from FlavorDB data."""
-        if not hasattr(self, '_flavor_profiles') or self._flavor_profiles is None:
-            with self._model_lock:
-                if not hasattr(self, '_flavor_profiles') or self._flavor_profiles is None:
-                    profiles_path = self._models_dir / "ingredient_flavor_profiles.json"
+        models = self._current()
+        if models.flavor_profiles is None:
+            with models.locks["flavor_profiles"]:
+                if models.flavor_profiles is None:
+                    profiles_path = models.path / "ingredient_flavor_profiles.json"
                     if profiles_path.exists():
                         import json as _json
                         with open(profiles_path) as f:
                             profiles_data = _json.load(f)
                         from affinity_models import FlavorProfileAffinity
-                        self._flavor_profiles = FlavorProfileAffinity(profiles_data)
-                        logger.info(f"Loaded flavor profiles: {self._flavor_profiles.coverage} ingredients")
-                    else:
-                        self._flavor_profiles = None
-        return self._flavor_profiles
+                        models.flavor_profiles = FlavorProfileAffinity(profiles_data)
+                        logger.info(f"Loaded flavor profiles: {models.flavor_profiles.coverage} ingredients")
+        return models.flavor_profiles
 
+    @_pinned
     def explain_pairing(self, ing_a: str, ing_b: str) -> dict:
         """Explain why two ingredients pair well at a molecular/sensory level.
 
@@ -326,11 +605,148 @@ class CulinaryMLService:
         if not a or not b:
             return {"error": "Unknown ingredient(s)"}
 
-        explanation = fpa.explain_pairing(a, b)
+        def compute():
+            explanation = fpa.explain_pairing(a, b)
+
+            # Add overall affinity score if food2vec is available
+            model = self._load_food2vec()
+            if model:
+                explanation["embedding_similarity"] = round(model.similarity(a, b), 4)
+            return explanation
+
+        # Shared compounds and descriptors are symmetric in (a, b)
+        return self._cached("explain_pairing", tuple(sorted((a, b))), compute)
+
+    # ── Batch API ────────────────────────────────────────────────────────
+
+    @_pinned
+    def suggest_substitutions_many(
+        self, ingredients: list[str], n: int = 5
+    ) -> list[list[dict]]:
+        """Batch ``suggest_substitutions``: one result list per ingredient.
+
+        All queries are normalized in one pass and scored against the
+        embedding matrix with a single matrix product.
+        """
+        if not self._enabled:
+            return [[] for _ in ingredients]
+
+        model = self._load_food2vec()
+        if model is None:
+            return [[] for _ in ingredients]
+
+        normalized = self._normalize_many(ingredients)
+        known = [i for i, name in enumerate(normalized) if name]
+
+        def compute(missing):
+            neighbors = model.most_similar_many([normalized[known[j]] for j in missing], topn=n)
+            return [
+                [{"name": name, "score": round(score, 4), "source": "food2vec"} for name, score in row]
+                for row in neighbors
+            ]
+
+        rows = self._cached_many("suggest_substitutions",
+                                 [(normalized[i], n) for i in known], compute)
+        results: list[list[dict]] = [[] for _ in ingredients]
+        for i, row in zip(known, rows):
+            results[i] = row
+        return results
+
+    @_pinned
+    def score_affinity_many(self, pairs: list[tuple[str, str]]) -> list[dict]:
+        """Batch ``score_affinity``: one score dict per (a, b) pair.
+
+        Scoring every pair of a 20-ingredient recipe (190 pairs) costs one
+        normalization pass and one Gram-matrix product.
+        """
+        if not self._enabled:
+            return [{"score": 0.0, "food2vec_score": 0.0, "source": "unavailable"} for _ in pairs]
 
-        # Add overall affinity score if food2vec is available
         model = self._load_food2vec()
-        if model:
-            explanation["embedding_similarity"] = round(model.similarity(a, b), 4)
+        if model is None:
+            return [{"score": 0.0, "food2vec_score": 0.0, "source": "unavailable"} for _ in pairs]
+
+        normalized = self._normalize_many([ing for pair in pairs for ing in pair])
+        norm_pairs = list(zip(normalized[0::2], normalized[1::2]))
+        known = [i for i, (a, b) in enumerate(norm_pairs) if a and b]
+        keys = [tuple(sorted(norm_pairs[i])) for i in known]
+
+        def compute(missing):
+            sims = model.similarity_many([norm_pairs[known[j]] for j in missing])
+            return [
+                {
+                    "score": round(float(sim), 4),
+                    "food2vec_score": round(float(sim), 4),
+                    "source": "food2vec",
+                }
+                for sim in sims
+            ]
+
+        results = [
+            {"score": 0.0, "food2vec_score": 0.0, "source": "unknown_ingredient"}
+            for _ in pairs
+        ]
+        for i, scored in zip(known, self._cached_many("score_affinity", keys, compute)):
+            results[i] = scored
+        return results
+
+    @_pinned
+    def suggest_techniques_many(
+        self, ingredients: list[str], n: int = 5
+    ) -> list[list[dict]]:
+        """Batch ``suggest_techniques``: one result list per ingredient."""
+        if not self._enabled:
+            return [[] for _ in ingredients]
+
+        techniques = self._load_technique_data()
+        if not techniques:
+            return [[] for _ in ingredients]
+
+        normalized = self._normalize_many(ingredients)
+        known = [i for i, name in enumerate(normalized) if name]
+
+        def compute(missing):
+            return [
+                [
+                    {"technique": tech, "score": round(share, 4), "source": "technique_cooccurrence"}
+                    for tech, share in techniques.top_techniques(normalized[known[j]], n)
+                ]
+                for j in missing
+            ]
+
+        rows = self._cached_many("suggest_techniques",
+                                 [(normalized[i], n) for i in known], compute)
+        results: list[list[dict]] = [[] for _ in ingredients]
+        for i, row in zip(known, rows):
+            results[i] = row
+        return results
+
+    @_pinned
+    def explain_pairing_many(self, pairs: list[tuple[str, str]]) -> list[dict]:
+        """Batch ``explain_pairing``: one explanation dict per (a, b) pair."""
+        if not self._enabled:
+            return [{"error": "ML features disabled"} for _ in pairs]
 
-        return explanation
+        fpa = self._load_flavor_profiles()
+        if fpa is None:
+            return [{"error": "Flavor profile data not available"} for _ in pairs]
+
+        normalized = self._normalize_many([ing for pair in pairs for ing in pair])
+        norm_pairs = list(zip(normalized[0::2], normalized[1::2]))
+        known = [i for i, (a, b) in enumerate(norm_pairs) if a and b]
+        keys = [tuple(sorted(norm_pairs[i])) for i in known]
+
+        def compute(missing):
+            explanations = [fpa.explain_pairing(*norm_pairs[known[j]]) for j in missing]
+            # Add overall affinity scores if food2vec is available
+            model = self._load_food2vec()
+            if model:
+                sims = model.similarity_many([norm_pairs[known[j]] for j in missing])
+                for explanation, sim in zip(explanations, sims):
+                    explanation["embedding_similarity"] = round(float(sim), 4)
+            return explanations
+
+        results = [{"error": "Unknown ingredient(s)"} for _ in pairs]
+        for i, explanation in zip(known, self._cached_many("explain_pairing", keys, compute)):
+            results[i] = explanation
+        return results
@@ -0,0 +1,155 @@
+"""Versioned registry of trained ML model artifacts.
+
+Each version is a subdirectory of the models directory holding the usual
+artifacts (vocab.json, food2vec_vectors.npy, cf_neighbor_*.npy, ...) plus
+a ``manifest.json`` written last::
+
+    ML_MODELS_DIR/
+        20261017T0300/manifest.json, vocab.json, ...
+        20261018T0300/manifest.json, vocab.json, ...
+
+A directory without a valid manifest is ignored, so a version that is
+still being copied is never picked up. When no version exists the models
+directory itself is used as a single unversioned set (the flat layout
+written by ``research/phase7/run_experiment.py``).
+
+Usage:
+    python model_registry.py publish <artifacts_dir> [--root DIR] [--version V]
+    python model_registry.py list [--root DIR]
+"""
+
+import json
+import logging
+import os
+import shutil
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+UNVERSIONED = "unversioned"
+
+
+@dataclass(frozen=True)
+class ModelVersion:
+    """One published set of model artifacts."""
+
+    version: str
+    path: Path
+    created: str = ""
+
+
+class ModelRegistry:
+    """Discovers and publishes model versions under a models directory."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def _read_manifest(self, path: Path) -> Optional[ModelVersion]:
+        """The version in ``path``, or None if its manifest is missing or incomplete."""
+        try:
+            with open(path / MANIFEST) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        for name, size in manifest.get("files", {}).items():
+            artifact = path / name
+            if not artifact.is_file() or artifact.stat().st_size != size:
+                logger.warning(f"Model version {path.name}: {name} missing or truncated")
+                return None
+        return ModelVersion(manifest.get("version", path.name), path, manifest.get("created", ""))
+
+    def versions(self) -> list[ModelVersion]:
+        """Complete versions, oldest first."""
+        if not self.root.is_dir():
+            return []
+        found = []
+        for path in self.root.iterdir():
+            if path.is_dir() and not path.name.startswith("."):
+                version = self._read_manifest(path)
+                if version is not None:
+                    found.append(version)
+        return sorted(found, key=lambda v: (v.created, v.version))
+
+    def latest(self) -> Optional[ModelVersion]:
+        """The newest complete version, or None if nothing is published."""
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def resolve(self) -> ModelVersion:
+        """The version to serve: the latest one, else the flat models directory."""
+        return self.latest() or ModelVersion(UNVERSIONED, self.root)
+
+    def publish(self, source_dir, version: Optional[str] = None) -> ModelVersion:
+        """Copy the artifacts in ``source_dir`` into a new version.
+
+        Files are staged in a hidden directory that is renamed into place
+        before the manifest is written, so watchers only ever see complete
+        versions.
+        """
+        source_dir = Path(source_dir)
+        created = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        version = version or created[:19].replace("-", "").replace(":", "")
+        target = self.root / version
+        if target.exists():
+            raise FileExistsError(f"Model version already exists: {target}")
+
+        staging = self.root / f".staging-{version}"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        files = {}
+        for artifact in sorted(source_dir.iterdir()):
+            if artifact.is_file() and artifact.name != MANIFEST:
+                shutil.copy2(artifact, staging / artifact.name)
+                files[artifact.name] = artifact.stat().st_size
+        os.replace(staging, target)
+
+        manifest = {"version": version, "created": created, "files": files}
+        tmp = target / f"{MANIFEST}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, target / MANIFEST)
+        logger.info(f"Published model version {version} ({len(files)} files)")
+        return ModelVersion(version, target, created)
+
+    def prune(self, keep: int = 2, in_use: Iterable[str] = ()) -> list[str]:
+        """Delete all but the newest ``keep`` versions, sparing those in use.
+
+        Returns:
+            The versions that were removed.
+        """
+        in_use = set(in_use)
+        removed = []
+        for version in self.versions()[:-keep or None]:
+            if version.version in in_use:
+                continue
+            shutil.rmtree(version.path)
+            removed.append(version.version)
+        return removed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from config import ML_MODELS_DIR
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description="Manage versioned ML model artifacts")
+    sub = parser.add_subparsers(dest="command", required=True)
+    publish = sub.add_parser("publish", help="Publish a directory of artifacts as a new version")
+    publish.add_argument("source")
+    publish.add_argument("--root", default=ML_MODELS_DIR)
+    publish.add_argument("--version", default=None)
+    listing = sub.add_parser("list", help="List published versions")
+    listing.add_argument("--root", default=ML_MODELS_DIR)
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    if args.command == "publish":
+        print(registry.publish(args.source, args.version).path)
+    else:
+        for v in registry.versions():
+            print(f"{v.version}\t{v.created}\t{v.path}")
@@ -0,0 +1,23 @@
+"""List deltas for storing recipe versions as edits against their parent version."""
+
+import difflib
+from typing import Any, Callable, List, Optional
+
+
+def list_delta(old: List[Any], new: List[Any]) -> List[list]:
+    """Edits that turn ``old`` into ``new``.
+
+    Returns ``[start, end, items]`` triples in ascending order, each meaning
+    ``old[start:end]`` is replaced by ``items``. Items must be hashable.
+    """
+    matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+    return [[i1, i2, new[j1:j2]] for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+
+
+def apply_list_delta(old: List[Any], delta: List[list], decode: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+    """Apply a ``list_delta`` result to ``old``; ``decode`` maps stored items back to objects."""
+    out = list(old)
+    # Right to left, so earlier offsets stay valid
+    for start, end, items in reversed(delta):
+        out[start:end] = [decode(item) for item in items] if decode else items
+    return out
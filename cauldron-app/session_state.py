@@ -0,0 +1,176 @@
+"""In-memory session state with write-behind persistence.
+
+A ``SessionState`` keeps one session's live ``RecipeGraph``, ``ModsList``
+and ``Pot`` between tool calls instead of parsing and rewriting their JSON
+files on every call. Edits mark an object dirty; dirty objects are written
+back after ``STATE_FLUSH_DELAY`` seconds, so a burst of edits within a turn
+costs one write per file. Read-only access never serializes anything.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
+
+from class_defs import (
+    graph_state_stamp, load_graph_from_file, save_graph_to_file,
+    load_mods_list_from_file, save_mods_list_to_file,
+    load_pot_from_file, save_pot_to_file,
+)
+from logging_util import logger
+
+# Longest wait between write-behind retries after a failed flush
+MAX_RETRY_DELAY = 30.0
+
+
+def _stamp(path: str) -> Optional[tuple[int, int]]:
+    """File modification time and size, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+class _Entry:
+    """One state file and, once loaded, its live object."""
+
+    def __init__(self, path: str, load: Callable[[str], Any], save: Callable[[Any, str], None],
+                 stamp: Callable[[str], Any] = _stamp):
+        self.path = path
+        self.load = load
+        self.save = save
+        self.file_stamp = stamp
+        self.obj = None
+        self.dirty = False
+        self.stamp = None  # file stamp when obj was loaded or last written
+
+    def current(self) -> Any:
+        # A clean object is dropped if the file was rewritten behind our back
+        if self.obj is None or (not self.dirty and self.file_stamp(self.path) != self.stamp):
+            self.obj = self.load(self.path)
+            self.stamp = self.file_stamp(self.path)
+        return self.obj
+
+    def write(self):
+        self.save(self.obj, self.path)
+        self.stamp = self.file_stamp(self.path)
+        self.dirty = False
+
+
+class SessionState:
+    """Live state objects for one session, written back to disk lazily.
+
+    Args:
+        graph_file: Path of the session's recipe graph file.
+        mods_file: Path of the session's mods list file.
+        pot_file: Path of the session's pot file.
+        flush_delay: Seconds between the first unsaved edit and the write;
+            0 writes at the end of every edit.
+
+    Objects are shared by every thread working on the session; callers
+    hold them only inside ``read`` or ``edit`` blocks. A failed write-behind
+    flush is kept in ``flush_error`` and retried with doubling delays; the
+    edits stay dirty until a flush succeeds.
+    """
+
+    def __init__(self, graph_file: str, mods_file: str, pot_file: str, flush_delay: Optional[float] = None):
+        if flush_delay is None:
+            from config import STATE_FLUSH_DELAY
+            flush_delay = STATE_FLUSH_DELAY
+        self.flush_delay = flush_delay
+        self._entries = {
+            "graph": _Entry(graph_file, load_graph_from_file, save_graph_to_file, graph_state_stamp),
+            "mods": _Entry(mods_file, load_mods_list_from_file, save_mods_list_to_file),
+            "pot": _Entry(pot_file, load_pot_from_file, save_pot_to_file),
+        }
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self._retry_delay: Optional[float] = None
+        self.writes = 0
+        self.flush_error: Optional[Exception] = None
+
+    @contextmanager
+    def read(self, kind: str):
+        """Yield the live ``"graph"``, ``"mods"`` or ``"pot"`` object without marking it dirty."""
+        with self._lock:
+            yield self._entries[kind].current()
+
+    @contextmanager
+    def edit(self, kind: str):
+        """Yield the live object and schedule it to be written back.
+
+        If the block raises, an object that had no unsaved edits is dropped
+        and re-read from disk on next use, discarding the partial change.
+        """
+        with self._lock:
+            entry = self._entries[kind]
+            obj = entry.current()
+            try:
+                yield obj
+            except BaseException:
+                if entry.dirty:
+                    logger.warning(f"Edit to {entry.path} failed; keeping earlier unsaved changes")
+                else:
+                    entry.obj = None
+                raise
+            entry.dirty = True
+            if self.flush_delay <= 0:
+                self.flush()
+            elif self._timer is None:
+                self._schedule(self.flush_delay)
+
+    def _schedule(self, delay: float):
+        self._timer = threading.Timer(delay, self._flush_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    @property
+    def dirty(self) -> bool:
+        return any(entry.dirty for entry in self._entries.values())
+
+    def flush(self):
+        """Write every dirty object to its file now.
+
+        Every dirty object is attempted; the first failure is re-raised
+        afterwards. The failed objects stay dirty, and with a write-behind
+        delay set another flush is scheduled.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            error = None
+            for entry in self._entries.values():
+                if entry.dirty:
+                    try:
+                        entry.write()
+                    except Exception as e:
+                        logger.error(f"Saving {entry.path} failed: {e}")
+                        error = error or e
+                        continue
+                    self.writes += 1
+            self.flush_error = error
+            if error is None:
+                self._retry_delay = None
+                return
+            if self.flush_delay > 0:
+                self._retry_delay = min(max(self.flush_delay, (self._retry_delay or 0) * 2), MAX_RETRY_DELAY)
+                logger.error(f"Flush failed; retrying in {self._retry_delay:g} s")
+                self._schedule(self._retry_delay)
+            raise error
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        except Exception:
+            # Logged, kept in flush_error and rescheduled by flush
+            pass
+
+    def discard(self):
+        """Drop the in-memory objects and any unsaved edits."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            for entry in self._entries.values():
+                entry.obj, entry.dirty, entry.stamp = None, False, None
@@ -7,11 +7,16 @@ ingredient×technique matrix to discover latent culinary patterns.
 
 import json
 import logging
+import os
+import re
+import threading
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 import numpy as np
-from scipy.sparse import load_npz, csr_matrix
+from scipy.sparse import load_npz, save_npz, csr_matrix
 from sklearn.decomposition import NMF, TruncatedSVD
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.neighbors import NearestNeighbors
@@ -23,19 +28,41 @@ DATA_DIR = Path(__file__).parent / "data"
 
 # ── Collaborative Filtering ─────────────────────────────────────────────
 
+CF_NEIGHBOR_INDICES = "cf_neighbor_indices.npy"
+CF_NEIGHBOR_SCORES = "cf_neighbor_scores.npy"
+CF_ITEM_VECTORS = "cf_item_vectors.npz"
+
+
 class IngredientCF:
     """Item-based collaborative filtering for ingredient affinity.
 
     Treats recipes as "users" and ingredients as "items".
     Learns which ingredients tend to co-occur across recipes.
+
+    ``fit`` precomputes a top-K neighbor table (indices + similarities,
+    self excluded, sorted by descending similarity) so lookups are array
+    slices. The table can be saved and memory-mapped back without the
+    recipe matrix.
     """
 
-    def __init__(self, n_neighbors: int = 20, metric: str = "cosine"):
+    def __init__(
+        self,
+        n_neighbors: int = 20,
+        metric: str = "cosine",
+        block_size: Optional[int] = None,
+    ):
         self.n_neighbors = n_neighbors
         self.metric = metric
+        self.block_size = block_size
         self._nn: Optional[NearestNeighbors] = None
         self._matrix: Optional[csr_matrix] = None
+        self._items: Optional[csr_matrix] = None  # L2-normalized ingredient rows
         self._vocab = None
+        self._neighbor_indices: Optional[np.ndarray] = None
+        self._neighbor_scores: Optional[np.ndarray] = None
+        self._wide_table: Optional[tuple[np.ndarray, np.ndarray]] = None
+        # Queries run on executor threads; one of them builds a wider table
+        self._wide_lock = threading.Lock()
 
     def fit(self, recipe_ingredient_matrix: csr_matrix, vocab) -> "IngredientCF":
         """Fit the model on a recipe×ingredient matrix.
@@ -46,23 +73,65 @@ class IngredientCF:
         """
         self._matrix = recipe_ingredient_matrix
         self._vocab = vocab
-
-        # Item-based: transpose so ingredients are rows
-        item_matrix = recipe_ingredient_matrix.T.tocsr()
-
-        self._nn = NearestNeighbors(
-            n_neighbors=min(self.n_neighbors + 1, item_matrix.shape[0]),
-            metric=self.metric,
-            algorithm="brute",
-        )
-        self._nn.fit(item_matrix)
+        self._wide_table = None
+
+        # Item-based: transpose so ingredients are rows. Compact bool/uint8
+        # matrices are upcast here only, for the distance computation.
+        item_matrix = recipe_ingredient_matrix.T.tocsr().astype(np.float32, copy=False)
+        n_items = item_matrix.shape[0]
+        k = min(self.n_neighbors, max(n_items - 1, 0))
+
+        if self.metric == "cosine":
+            from sklearn.preprocessing import normalize
+            self._items = normalize(item_matrix, norm="l2", axis=1).astype(np.float32)
+            self._neighbor_indices, self._neighbor_scores = self._cosine_neighbor_table(k)
+        else:
+            self._nn = NearestNeighbors(
+                n_neighbors=min(self.n_neighbors + 1, n_items),
+                metric=self.metric,
+                algorithm="brute",
+            )
+            self._nn.fit(item_matrix)
+            distances, indices = self._nn.kneighbors(item_matrix, n_neighbors=min(k + 1, n_items))
+            self._neighbor_indices, self._neighbor_scores = _drop_self(
+                indices, (1.0 / (1.0 + distances)).astype(np.float32), k
+            )
 
         logger.info(
             f"CF model fitted: {item_matrix.shape[0]} ingredients, "
-            f"{item_matrix.shape[1]} recipes"
+            f"{item_matrix.shape[1]} recipes, top-{k} neighbor table"
         )
         return self
 
+    def _cosine_neighbor_table(self, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Top-k cosine neighbors of every item from blocked X·Xᵀ products."""
+        items = self._items
+        n = items.shape[0]
+        indices = np.empty((n, k), dtype=np.int32)
+        scores = np.empty((n, k), dtype=np.float32)
+        if k == 0:
+            return indices, scores
+
+        # Bound the dense similarity block to ~64 MB of float32
+        block = self.block_size or max(1, 16_000_000 // n)
+        items_t = items.T.tocsc()
+        for start in range(0, n, block):
+            stop = min(start + block, n)
+            sims = (items[start:stop] @ items_t).toarray()
+            rows = np.arange(stop - start)
+            sims[rows, rows + start] = -np.inf  # exclude self
+            top = _top_k(sims, k)
+            indices[start:stop] = top
+            scores[start:stop] = np.take_along_axis(sims, top, axis=1)
+        return indices, scores
+
+    def _exact_neighbors(self, idx: int, topn: int) -> tuple[np.ndarray, np.ndarray]:
+        """Brute-force neighbors for requests wider than the stored table."""
+        sims = (self._items[idx] @ self._items.T).toarray().ravel()
+        sims[idx] = -np.inf
+        top = _top_k(sims[None, :], min(topn, len(sims) - 1))[0]
+        return top, sims[top]
+
     def similar_ingredients(
         self, ingredient: str, topn: int = 10
     ) -> list[tuple[str, float]]:
@@ -72,41 +141,194 @@ class IngredientCF:
             logger.warning(f"'{ingredient}' not in vocabulary")
             return []
 
-        item_matrix = self._matrix.T.tocsr()
-        n_neighbors = min(topn + 1, item_matrix.shape[0])
-        distances, indices = self._nn.kneighbors(
-            item_matrix[idx].toarray(), n_neighbors=n_neighbors
-        )
+        if topn <= self._neighbor_indices.shape[1] or self._items is None:
+            indices = self._neighbor_indices[idx, :topn]
+            sims = self._neighbor_scores[idx, :topn]
+        else:
+            indices, sims = self._exact_neighbors(idx, topn)
 
         results = []
-        for dist, neighbor_idx in zip(distances[0], indices[0]):
+        for neighbor_idx, sim in zip(indices, sims):
             name = self._vocab.decode(int(neighbor_idx))
-            if name and name != ingredient:
-                # Convert distance to similarity
-                sim = 1.0 - dist if self.metric == "cosine" else 1.0 / (1.0 + dist)
+            if name:
                 results.append((name, float(sim)))
+        return results
+
+    def similarity(self, ing_a: str, ing_b: str) -> float:
+        """Direct CF similarity between two ingredients.
 
-        return results[:topn]
+        A dot product of the two normalized item vectors, so it is exact
+        however far apart the pair ranks. Without item vectors (a table-only
+        model) it falls back to the neighbor table, in either direction,
+        and 0.0 for pairs outside it.
+        """
+        a, b = self._vocab.encode(ing_a), self._vocab.encode(ing_b)
+        if a is None or b is None:
+            return 0.0
+        if self._items is not None:
+            return float(self._items[a].multiply(self._items[b]).sum())
+        if a == b:
+            return 1.0
+        return float(self._table_similarity(np.array([a, b]))[0, 1])
+
+    def similarity_many(self, pairs: list[tuple[str, str]]) -> np.ndarray:
+        """``similarity`` for many pairs; one row-wise sparse product with item vectors."""
+        if not pairs or self._items is None:
+            return np.array([self.similarity(a, b) for a, b in pairs], dtype=np.float32)
+        a = self._encode_many([x for x, _ in pairs])
+        b = self._encode_many([y for _, y in pairs])
+        known = (a >= 0) & (b >= 0)
+
+        sims = np.zeros(len(pairs), dtype=np.float32)
+        if known.any():
+            rows_a, rows_b = self._items[a[known]], self._items[b[known]]
+            sims[known] = np.asarray(rows_a.multiply(rows_b).sum(axis=1)).ravel()
+        return sims
+
+    def similarity_matrix(self, ingredients: list[str]) -> np.ndarray:
+        """Pairwise CF similarity for a set of ingredients (unknown → zero rows)."""
+        ids = self._encode_many(ingredients)
+        known = np.flatnonzero(ids >= 0)
+        result = np.zeros((len(ids), len(ids)), dtype=np.float32)
+        if len(known) == 0:
+            return result
+
+        unique, inverse = np.unique(ids[known], return_inverse=True)
+        if self._items is not None:
+            rows = self._items[unique]
+            block = (rows @ rows.T).toarray()
+        else:
+            block = self._table_similarity(unique)
+        result[np.ix_(known, known)] = block[np.ix_(inverse, inverse)]
+        return result
+
+    def _encode_many(self, ingredients: list[str]) -> np.ndarray:
+        """Vocabulary ids, -1 where unknown."""
+        encoded = [self._vocab.encode(ing) for ing in ingredients]
+        return np.array([-1 if i is None else i for i in encoded], dtype=np.int64)
+
+    def _table_similarity(self, ids: np.ndarray) -> np.ndarray:
+        """Square similarity block over distinct ids read off the neighbor
+        table; pairs listed in neither row score 0."""
+        lookup = np.full(self._neighbor_indices.shape[0], -1, dtype=np.int64)
+        lookup[ids] = np.arange(len(ids))
+        neighbors = lookup[np.asarray(self._neighbor_indices[ids])]
+        rows = np.broadcast_to(np.arange(len(ids))[:, None], neighbors.shape)
+        hit = neighbors >= 0
+
+        block = np.zeros((len(ids), len(ids)), dtype=np.float32)
+        block[rows[hit], neighbors[hit]] = np.asarray(self._neighbor_scores[ids])[hit]
+        block = np.maximum(block, block.T)
+        np.fill_diagonal(block, 1.0)
+        return block
+
+    def save_neighbors(self, directory: Path, include_items: bool = True):
+        """Save the neighbor table as two .npy files for memory-mapping.
+
+        With ``include_items`` the normalized item vectors are saved too,
+        so a table-loaded model keeps exact pairwise ``similarity``.
+        """
+        directory = Path(directory)
+        np.save(directory / CF_NEIGHBOR_INDICES, self._neighbor_indices)
+        np.save(directory / CF_NEIGHBOR_SCORES, self._neighbor_scores)
+        if include_items and self._items is not None:
+            save_npz(directory / CF_ITEM_VECTORS, self._items)
+        logger.info(f"CF neighbor table saved to {directory}")
+
+    @classmethod
+    def load_neighbors(
+        cls, directory: Path, vocab, mmap_mode: Optional[str] = "r"
+    ) -> "IngredientCF":
+        """Load a saved neighbor table without refitting.
+
+        The recipe matrix is not loaded. Item vectors are, when they were
+        saved; without them lookups are limited to the stored table width.
+        """
+        directory = Path(directory)
+        instance = cls()
+        instance._vocab = vocab
+        instance._neighbor_indices = np.load(directory / CF_NEIGHBOR_INDICES, mmap_mode=mmap_mode)
+        instance._neighbor_scores = np.load(directory / CF_NEIGHBOR_SCORES, mmap_mode=mmap_mode)
+        instance.n_neighbors = instance._neighbor_indices.shape[1]
+        if (directory / CF_ITEM_VECTORS).exists():
+            instance._items = load_npz(directory / CF_ITEM_VECTORS).tocsr()
+        logger.info(f"CF neighbor table loaded from {directory}")
+        return instance
+
+    def _neighbor_table(self, width: int) -> tuple[np.ndarray, np.ndarray]:
+        """Neighbor table at least `width` wide where the matrix allows it."""
+        indices, scores = self._neighbor_indices, self._neighbor_scores
+        if width > indices.shape[1] and self._items is not None:
+            with self._wide_lock:
+                cached = self._wide_table
+                if cached is None or cached[0].shape[1] < min(width, indices.shape[0] - 1):
+                    cached = self._wide_table = self._cosine_neighbor_table(
+                        min(width, indices.shape[0] - 1)
+                    )
+            indices, scores = cached
+        return indices[:, :width], scores[:, :width]
 
     def suggest_ingredients(
         self,
         current_ingredients: list[str],
         topn: int = 10,
+        neighbors_per_ingredient: int = 20,
     ) -> list[tuple[str, float]]:
         """Given a partial ingredient list, suggest what else belongs.
 
-        Aggregates neighbor scores across all current ingredients.
+        Sums, for every candidate, its similarity to each current ingredient
+        that lists it among its top `neighbors_per_ingredient` neighbors.
+        This is the product of the recipe's sparse indicator vector with
+        the item-similarity matrix, computed by gathering only the rows of
+        the ingredients present; ingredients already in the recipe are
+        masked out.
         """
-        scores: dict[str, float] = {}
+        ids = [self._vocab.encode(ing) for ing in current_ingredients]
+        ids = np.array([i for i in ids if i is not None], dtype=np.int64)
+        if len(ids) == 0:
+            return []
+
+        indices, scores = self._neighbor_table(neighbors_per_ingredient)
+        n = indices.shape[0]
+        neighbor_ids = np.asarray(indices[ids]).ravel()
+        totals = np.bincount(neighbor_ids, weights=np.asarray(scores[ids]).ravel(),
+                             minlength=n)
+
+        candidates = np.zeros(n, dtype=bool)
+        candidates[neighbor_ids] = True
+        candidates[ids] = False
+        candidate_ids = np.flatnonzero(candidates)
+        if len(candidate_ids) == 0:
+            return []
+
+        top = _top_k(totals[candidate_ids][None, :], min(topn, len(candidate_ids)))[0]
+        return [
+            (self._vocab.decode(int(candidate_ids[i])), float(totals[candidate_ids[i]]))
+            for i in top
+        ]
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k largest scores per row, sorted descending."""
+    if k < scores.shape[1]:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1)
 
-        for ing in current_ingredients:
-            neighbors = self.similar_ingredients(ing, topn=20)
-            for name, sim in neighbors:
-                if name not in current_ingredients:
-                    scores[name] = scores.get(name, 0) + sim
 
-        ranked = sorted(scores.items(), key=lambda x: -x[1])
-        return ranked[:topn]
+def _drop_self(
+    indices: np.ndarray, scores: np.ndarray, k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Remove each row's own index from kneighbors output, keeping k columns."""
+    keep = indices != np.arange(len(indices))[:, None]
+    # Rows where self did not come back (ties) drop their last column instead
+    missing = keep.all(axis=1)
+    keep[missing, -1] = False
+    n = len(indices)
+    return (indices[keep].reshape(n, -1)[:, :k].astype(np.int32),
+            scores[keep].reshape(n, -1)[:, :k])
 
 
 # ── NMF Technique-Ingredient Decomposition ───────────────────────────────
@@ -226,26 +448,69 @@ COOKING_TECHNIQUES = [
 ]
 
 
+# `\btechnique\w*\b` reduces to "technique starts at a word boundary":
+# the trailing \w*\b always matches at the end of the word run. A lookahead
+# finds every such start in one scan, including overlapping ones ("fry"
+# inside "deep fry"); longest-first alternation plus the prefix closure
+# below covers techniques sharing a start position.
+_TECHNIQUE_RE = re.compile(
+    r"\b(?=("
+    + "|".join(re.escape(t) for t in sorted(COOKING_TECHNIQUES, key=len, reverse=True))
+    + "))"
+)
+_TECHNIQUE_CLOSURE = {
+    t: frozenset(p for p in COOKING_TECHNIQUES if t.startswith(p)) for t in COOKING_TECHNIQUES
+}
+
+
+def _strip_accents(text: str) -> str:
+    """NFKD + drop combining marks (é → e); ASCII text is returned as-is."""
+    if text.isascii():
+        return text
+    normalized = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in normalized if not unicodedata.combining(c))
+
+
 def extract_techniques_from_instructions(instructions: str) -> list[str]:
     """Extract cooking techniques mentioned in recipe instructions."""
-    import unicodedata
     # Normalize accented chars (é → e) for matching
-    instructions_normalized = unicodedata.normalize("NFKD", instructions.lower())
-    instructions_normalized = "".join(
-        c for c in instructions_normalized if not unicodedata.combining(c)
-    )
-    found = []
-    for technique in COOKING_TECHNIQUES:
-        import re
-        if re.search(rf"\b{re.escape(technique)}\w*\b", instructions_normalized):
-            found.append(technique)
-    return found
+    text = _strip_accents(instructions.lower())
+    found: set[str] = set()
+    for technique in set(_TECHNIQUE_RE.findall(text)):
+        found |= _TECHNIQUE_CLOSURE[technique]
+    return [t for t in COOKING_TECHNIQUES if t in found]
+
+
+def _extract_techniques_chunk(texts: list[str]) -> list[list[str]]:
+    return [extract_techniques_from_instructions(text) for text in texts]
+
+
+def extract_techniques_many(
+    instructions: list[str],
+    workers: Optional[int] = 1,
+    chunk_size: int = 2_000,
+) -> list[list[str]]:
+    """``extract_techniques_from_instructions`` over many texts, in order.
+
+    Args:
+        instructions: Instruction strings (empty strings yield []).
+        workers: Extractor processes (None = os.cpu_count(), 1 = in-process)
+        chunk_size: Texts per task sent to a worker process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(instructions) <= chunk_size:
+        return _extract_techniques_chunk(instructions)
+
+    chunks = [instructions[i:i + chunk_size] for i in range(0, len(instructions), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [found for chunk in pool.map(_extract_techniques_chunk, chunks) for found in chunk]
 
 
 def build_ingredient_technique_matrix(
     recipes: list[dict],
     vocab,
     instructions_key: str = "instructions",
+    workers: Optional[int] = 1,
 ) -> tuple[np.ndarray, list[str], list[str]]:
     """Build ingredient×technique co-occurrence matrix from recipes.
 
@@ -253,18 +518,18 @@ def build_ingredient_technique_matrix(
         recipes: List of recipe dicts with 'ingredients' and 'instructions'.
         vocab: IngredientVocab for filtering.
         instructions_key: Key for recipe instructions text.
+        workers: Technique extractor processes (see extract_techniques_many).
 
     Returns:
         (matrix, ingredient_names, technique_names)
     """
     technique_counts: dict[tuple[str, str], int] = {}
 
-    for recipe in recipes:
-        instructions = recipe.get(instructions_key, "")
-        if not instructions:
-            continue
-
-        techniques = extract_techniques_from_instructions(instructions)
+    recipes = [recipe for recipe in recipes if recipe.get(instructions_key, "")]
+    all_techniques = extract_techniques_many(
+        [recipe[instructions_key] for recipe in recipes], workers=workers
+    )
+    for recipe, techniques in zip(recipes, all_techniques):
         ingredients = recipe.get("ingredients", [])
 
         for ing in ingredients:
@@ -291,10 +556,129 @@ def build_ingredient_technique_matrix(
     return matrix, ingredient_names, technique_names
 
 
+TECHNIQUE_COUNTS = "technique_counts.npz"
+TECHNIQUE_INDEX = "technique_index.json"
+
+
+class TechniqueIndex:
+    """Ingredient×technique recipe counts for serving technique suggestions.
+
+    Built once by the pipeline and saved as a sparse count matrix plus a
+    JSON index of row (ingredient) and column (technique) names, so the
+    service loads it in milliseconds instead of re-extracting techniques
+    from every recipe at startup.
+    """
+
+    def __init__(self, counts: csr_matrix, ingredients: list[str], techniques: list[str]):
+        self.counts = counts
+        self.ingredients = ingredients
+        self.techniques = techniques
+        self._row = {ing: i for i, ing in enumerate(ingredients)}
+
+    @classmethod
+    def from_counts(cls, counts: dict[str, dict[str, int]]) -> "TechniqueIndex":
+        """Build from {ingredient: {technique: count}} mappings."""
+        ingredients = sorted(counts)
+        columns = {t: j for j, t in enumerate(COOKING_TECHNIQUES)}
+        rows, cols, data = [], [], []
+        for i, ing in enumerate(ingredients):
+            for tech, count in counts[ing].items():
+                rows.append(i)
+                cols.append(columns[tech])
+                data.append(count)
+        matrix = csr_matrix(
+            (np.array(data, dtype=np.int32), (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))),
+            shape=(len(ingredients), len(COOKING_TECHNIQUES)),
+        )
+        return cls(matrix, ingredients, list(COOKING_TECHNIQUES))
+
+    @classmethod
+    def from_recipes(
+        cls,
+        recipes: list[dict],
+        directions_key: str = "directions",
+        workers: Optional[int] = 1,
+    ) -> "TechniqueIndex":
+        """Count, per ingredient, the recipes whose directions use each technique."""
+        recipes = [recipe for recipe in recipes if recipe.get(directions_key, "")]
+        all_techniques = extract_techniques_many(
+            [recipe[directions_key] for recipe in recipes], workers=workers
+        )
+        columns = {t: j for j, t in enumerate(COOKING_TECHNIQUES)}
+        row_of: dict[str, int] = {}
+        rows, cols = [], []
+        for recipe, techniques in zip(recipes, all_techniques):
+            tech_cols = [columns[t] for t in techniques]
+            for ing in recipe.get("ingredients", []):
+                row = row_of.setdefault(ing, len(row_of))
+                rows.extend([row] * len(tech_cols))
+                cols.extend(tech_cols)
+
+        # Rows in sorted-name order; duplicate (row, col) entries sum to counts
+        ingredients = sorted(row_of)
+        remap = np.empty(len(row_of), dtype=np.int64)
+        remap[[row_of[ing] for ing in ingredients]] = np.arange(len(ingredients))
+        matrix = csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (remap[np.array(rows, dtype=np.int64)], np.array(cols, dtype=np.int64))),
+            shape=(len(ingredients), len(COOKING_TECHNIQUES)),
+        )
+        matrix.sum_duplicates()
+        logger.info(f"Technique index: {len(ingredients)} ingredients, {matrix.nnz} non-zero counts")
+        return cls(matrix, ingredients, list(COOKING_TECHNIQUES))
+
+    def save(self, directory: Path):
+        directory = Path(directory)
+        save_npz(directory / TECHNIQUE_COUNTS, self.counts)
+        with open(directory / TECHNIQUE_INDEX, "w") as f:
+            json.dump({"ingredients": self.ingredients, "techniques": self.techniques}, f)
+        logger.info(f"Technique index saved to {directory}")
+
+    @classmethod
+    def load(cls, directory: Path) -> "TechniqueIndex":
+        directory = Path(directory)
+        counts = load_npz(directory / TECHNIQUE_COUNTS).tocsr()
+        with open(directory / TECHNIQUE_INDEX) as f:
+            index = json.load(f)
+        return cls(counts, index["ingredients"], index["techniques"])
+
+    def __len__(self) -> int:
+        return len(self.ingredients)
+
+    def __contains__(self, ingredient: str) -> bool:
+        return ingredient in self._row
+
+    def top_techniques(self, ingredient: str, n: int = 5) -> list[tuple[str, float]]:
+        """The n most frequent techniques for an ingredient, as shares of its
+        total technique count. Ties go to the earlier technique."""
+        row = self._row.get(ingredient)
+        if row is None or n <= 0:
+            return []
+        start, stop = self.counts.indptr[row], self.counts.indptr[row + 1]
+        counts = self.counts.data[start:stop].astype(np.int64)
+        columns = self.counts.indices[start:stop]
+        total = counts.sum()
+        if total == 0:
+            return []
+
+        # Unique integer keys: count first, then lower column index
+        width = len(self.techniques)
+        keys = counts * width + (width - 1 - columns)
+        top = np.argpartition(-keys, n - 1)[:n] if n < len(keys) else np.arange(len(keys))
+        top = top[np.argsort(-keys[top])]
+        return [(self.techniques[columns[i]], float(counts[i] / total)) for i in top if counts[i] > 0]
+
+
 # ── Compound-based affinity ──────────────────────────────────────────────
 
 class CompoundAffinity:
-    """Flavor compound-based ingredient affinity using FlavorDB data."""
+    """Flavor compound-based ingredient affinity using FlavorDB data.
+
+    Compounds are integer-coded once at construction into a sparse
+    ingredient×compound incidence matrix plus its transpose, the inverted
+    index from compound to ingredient ids. Jaccard against every ingredient
+    is then one pass over the inverted lists, and all-pairs Jaccard one
+    sparse product divided by the set sizes.
+    """
 
     def __init__(self, flavordb: dict[str, list[str]]):
         """
@@ -302,30 +686,110 @@ class CompoundAffinity:
             flavordb: Dict mapping ingredient names to lists of compound names.
         """
         self.flavordb = flavordb
+        self._ingredients = list(flavordb)
+        self._ingredient_index = {ing: i for i, ing in enumerate(self._ingredients)}
+        self._compounds = sorted({c for compounds in flavordb.values() for c in compounds})
+        compound_index = {c: j for j, c in enumerate(self._compounds)}
+
+        # Integer-coded compound sets; ids follow name order, so sorted ids
+        # decode to sorted names
+        self._codes = [
+            frozenset(compound_index[c] for c in flavordb[ing]) for ing in self._ingredients
+        ]
+        self._sizes = np.array([len(codes) for codes in self._codes], dtype=np.int64)
+        rows = np.repeat(np.arange(len(self._codes)), self._sizes)
+        cols = np.fromiter((j for codes in self._codes for j in sorted(codes)),
+                           dtype=np.int64, count=int(self._sizes.sum()))
+        self._matrix = csr_matrix(
+            (np.ones(len(cols), dtype=np.int32), (rows, cols)),
+            shape=(len(self._ingredients), len(self._compounds)),
+        )
+        self._inverted = self._matrix.T.tocsr()
 
     def overlap(self, ing_a: str, ing_b: str) -> float:
         """Jaccard similarity of flavor compounds between two ingredients."""
-        from data_pipeline import compound_overlap_score
-        return compound_overlap_score(ing_a, ing_b, self.flavordb)
+        a = self._ingredient_index.get(ing_a)
+        b = self._ingredient_index.get(ing_b)
+        if a is None or b is None or not self._sizes[a] or not self._sizes[b]:
+            return 0.0
+        shared = len(self._codes[a] & self._codes[b])
+        return shared / int(self._sizes[a] + self._sizes[b] - shared)
+
+    def overlap_many(self, pairs: list[tuple[str, str]]) -> np.ndarray:
+        """``overlap`` for many pairs from one element-wise sparse product."""
+        if not pairs:
+            return np.zeros(0, dtype=np.float64)
+        index = self._ingredient_index
+        a = np.array([index.get(x, -1) for x, _ in pairs], dtype=np.int64)
+        b = np.array([index.get(y, -1) for _, y in pairs], dtype=np.int64)
+        known = (a >= 0) & (b >= 0)
+
+        scores = np.zeros(len(pairs), dtype=np.float64)
+        if known.any():
+            ka, kb = a[known], b[known]
+            shared = np.asarray(self._matrix[ka].multiply(self._matrix[kb]).sum(axis=1)).ravel()
+            union = self._sizes[ka] + self._sizes[kb] - shared
+            scores[known] = np.divide(shared, union, out=np.zeros(len(shared)), where=union > 0)
+        return scores
+
+    def overlap_matrix(
+        self,
+        ingredients: Optional[list[str]] = None,
+        others: Optional[list[str]] = None,
+    ) -> np.ndarray:
+        """All-pairs Jaccard from one sparse product.
+
+        Rows follow ``ingredients`` and columns ``others``; either defaults
+        to every FlavorDB ingredient. Unknown ingredients score zero.
+        """
+        rows = self._encode(ingredients)
+        cols = self._encode(others)
+        result = np.zeros((len(rows), len(cols)), dtype=np.float64)
+        known_rows, known_cols = np.flatnonzero(rows >= 0), np.flatnonzero(cols >= 0)
+        if len(known_rows) and len(known_cols):
+            r, c = rows[known_rows], cols[known_cols]
+            shared = (self._matrix[r] @ self._matrix[c].T).toarray()
+            union = self._sizes[r, None] + self._sizes[None, c] - shared
+            result[np.ix_(known_rows, known_cols)] = np.divide(
+                shared, union, out=np.zeros(shared.shape), where=union > 0
+            )
+        return result
+
+    def _encode(self, ingredients: Optional[list[str]]) -> np.ndarray:
+        if ingredients is None:
+            return np.arange(len(self._ingredients))
+        return np.array([self._ingredient_index.get(ing, -1) for ing in ingredients],
+                        dtype=np.int64)
 
     def shared_compounds(self, ing_a: str, ing_b: str) -> list[str]:
         """Return the specific compounds shared between two ingredients."""
-        compounds_a = set(self.flavordb.get(ing_a, []))
-        compounds_b = set(self.flavordb.get(ing_b, []))
-        return sorted(compounds_a & compounds_b)
+        a = self._ingredient_index.get(ing_a)
+        b = self._ingredient_index.get(ing_b)
+        if a is None or b is None:
+            return []
+        return [self._compounds[j] for j in sorted(self._codes[a] & self._codes[b])]
 
     def most_similar(self, ingredient: str, topn: int = 10) -> list[tuple[str, float]]:
         """Find ingredients with highest compound overlap."""
-        if ingredient not in self.flavordb:
+        idx = self._ingredient_index.get(ingredient)
+        if idx is None:
             return []
-        scores = []
-        for other in self.flavordb:
-            if other != ingredient:
-                score = self.overlap(ingredient, other)
-                if score > 0:
-                    scores.append((other, score))
-        scores.sort(key=lambda x: -x[1])
-        return scores[:topn]
+
+        # Walk the inverted lists of this ingredient's compounds: only
+        # ingredients sharing at least one compound are ever touched
+        compounds = self._matrix.indices[self._matrix.indptr[idx]:self._matrix.indptr[idx + 1]]
+        shared = np.bincount(self._inverted[compounds].indices,
+                             minlength=len(self._ingredients))
+        shared[idx] = 0
+        candidates = np.flatnonzero(shared)
+        if len(candidates) == 0:
+            return []
+
+        inter = shared[candidates]
+        scores = inter / (self._sizes[idx] + self._sizes[candidates] - inter)
+        # Stable sort keeps FlavorDB order among ties
+        order = np.argsort(-scores, kind="stable")[:topn]
+        return [(self._ingredients[candidates[i]], float(scores[i])) for i in order]
 
     @property
     def coverage(self) -> int:
@@ -418,6 +882,7 @@ class CombinedAffinity:
         alpha: float = 0.4,
         beta: float = 0.4,
         gamma: float = 0.2,
+        pool_size: int = 30,
     ):
         """
         Args:
@@ -427,10 +892,12 @@ class CombinedAffinity:
             alpha: Weight for food2vec.
             beta: Weight for CF.
             gamma: Weight for compound overlap (only if compound_affinity provided).
+            pool_size: Candidates retrieved per source by ``top_affinities``.
         """
         self.food2vec = food2vec
         self.cf = cf_model
         self.compound = compound_affinity
+        self.pool_size = pool_size
         if compound_affinity is None:
             # Redistribute gamma weight to food2vec and CF
             self.alpha = alpha + gamma / 2
@@ -445,12 +912,7 @@ class CombinedAffinity:
         """Combined affinity score between two ingredients."""
         f2v_score = self.food2vec.similarity(ing_a, ing_b)
 
-        cf_neighbors = self.cf.similar_ingredients(ing_a, topn=50)
-        cf_score = 0.0
-        for name, sim in cf_neighbors:
-            if name == ing_b:
-                cf_score = sim
-                break
+        cf_score = self.cf.similarity(ing_a, ing_b)
 
         compound_score = 0.0
         if self.compound is not None:
@@ -460,33 +922,66 @@ class CombinedAffinity:
                 self.beta * cf_score +
                 self.gamma * compound_score)
 
+    def affinity_matrix(self, ingredients: list[str]) -> np.ndarray:
+        """Weighted food2vec + CF + compound scores for every pair in a set.
+
+        One vectorized call per signal instead of len(ingredients)² calls
+        to ``affinity``, e.g. to score a whole recipe's internal harmony.
+        Entry [i, j] equals ``affinity(ingredients[i], ingredients[j])``;
+        the diagonal holds self-affinity.
+        """
+        f2v = self.food2vec.similarity_matrix(ingredients)
+        cf = self.cf.similarity_matrix(ingredients)
+        scores = self.alpha * np.asarray(f2v, dtype=np.float64) + self.beta * np.asarray(cf, dtype=np.float64)
+        if self.compound is not None:
+            scores += self.gamma * self.compound.overlap_matrix(ingredients, ingredients)
+        return scores
+
     def top_affinities(
-        self, ingredient: str, topn: int = 10
+        self, ingredient: str, topn: int = 10, pool_size: Optional[int] = None
     ) -> list[tuple[str, float]]:
-        """Get top affinity scores combining all models."""
-        f2v_neighbors = dict(self.food2vec.most_similar(ingredient, topn=30))
-        cf_neighbors = dict(self.cf.similar_ingredients(ingredient, topn=30))
+        """Get top affinity scores combining all models.
 
-        # Union of candidates from all sources
-        all_candidates = set(f2v_neighbors) | set(cf_neighbors)
+        Retrieve-then-rerank: each source contributes its ``pool_size``
+        nearest neighbors as candidates, then every candidate is rescored
+        exactly on all three signals, so a candidate found by one source is
+        not zeroed for missing another source's shortlist.
+        """
+        pool_size = pool_size or self.pool_size
+        retrieved = self._retrieve(ingredient, pool_size)
+        candidates = [c for c in dict.fromkeys(
+            name for neighbors in retrieved.values() for name in neighbors
+        ) if c != ingredient]
+        if not candidates:
+            return []
+
+        scores = self.score_candidates(ingredient, candidates)
+        order = np.argsort(-scores, kind="stable")[:topn]
+        return [(candidates[i], float(scores[i])) for i in order]
+
+    def _retrieve(self, ingredient: str, pool_size: int) -> dict[str, dict[str, float]]:
+        """First stage: a candidate pool (name → score) from each source."""
+        retrieved = {
+            "food2vec": dict(self.food2vec.most_similar(ingredient, topn=pool_size)),
+            "cf": dict(self.cf.similar_ingredients(ingredient, topn=pool_size)),
+        }
         if self.compound is not None:
-            compound_neighbors = dict(self.compound.most_similar(ingredient, topn=30))
-            all_candidates |= set(compound_neighbors)
-        else:
-            compound_neighbors = {}
+            retrieved["compound"] = dict(self.compound.most_similar(ingredient, topn=pool_size))
+        return retrieved
 
-        scores = []
-        for candidate in all_candidates:
-            f2v = f2v_neighbors.get(candidate, 0.0)
-            cf = cf_neighbors.get(candidate, 0.0)
-            compound = compound_neighbors.get(candidate, 0.0)
-            combined = (self.alpha * f2v +
-                        self.beta * cf +
-                        self.gamma * compound)
-            scores.append((candidate, combined))
+    def score_candidates(self, ingredient: str, candidates: list[str]) -> np.ndarray:
+        """Second stage: exact weighted scores of ``ingredient`` vs candidates.
 
-        scores.sort(key=lambda x: -x[1])
-        return scores[:topn]
+        Each signal is computed in one batched call.
+        """
+        pairs = [(ingredient, c) for c in candidates]
+        f2v = np.asarray(self.food2vec.similarity_many(pairs), dtype=np.float64)
+        cf = np.asarray(self.cf.similarity_many(pairs), dtype=np.float64)
+
+        scores = self.alpha * f2v + self.beta * cf
+        if self.compound is not None:
+            scores += self.gamma * self.compound.overlap_many(pairs)
+        return scores
 
 
 if __name__ == "__main__":
@@ -494,5 +989,13 @@ if __name__ == "__main__":
 
     logging.basicConfig(level=logging.INFO, format="%(message)s")
 
+    if len(sys.argv) > 1 and sys.argv[1] == "techniques":
+        # Build the technique index artifact from an existing recipes_meta.json
+        data_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else DATA_DIR
+        with open(data_dir / "recipes_meta.json") as f:
+            TechniqueIndex.from_recipes(json.load(f), workers=None).save(data_dir)
+        sys.exit(0)
+
     print("Affinity models module loaded. Use from notebooks or pipeline.")
-    print("Available: IngredientCF, TechniqueNMF, CombinedAffinity")
+    print("Available: IngredientCF, TechniqueNMF, CombinedAffinity, TechniqueIndex")
+    print("Usage: python affinity_models.py techniques [data_dir]")
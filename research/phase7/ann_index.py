@@ -0,0 +1,229 @@
+"""
+Phase 7 — Approximate nearest-neighbor indexes over ingredient embeddings
+
+Inner-product search over unit-normalized food2vec vectors (inner product
+equals cosine similarity). Every index exposes the same
+``search(queries, k) -> (indices, scores)`` interface, so EmbeddingStore
+can swap exact search for an approximate one:
+
+- ``exact``   — brute-force matrix product (the reference).
+- ``ivf``     — inverted-file index built in pure NumPy: spherical k-means
+                coarse quantizer, probe the ``n_probe`` closest lists.
+- ``faiss``   — faiss HNSW, when faiss is installed.
+- ``hnswlib`` — hnswlib HNSW, when hnswlib is installed.
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _top_k_rows(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Row-wise top-k (indices, scores) sorted by descending score."""
+    k = min(k, scores.shape[1])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def _pad(indices: np.ndarray, scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Pad a result row to width k with index -1 / score -inf."""
+    missing = k - len(indices)
+    if missing <= 0:
+        return indices, scores
+    return (np.concatenate([indices, np.full(missing, -1, dtype=indices.dtype)]),
+            np.concatenate([scores, np.full(missing, -np.inf, dtype=scores.dtype)]))
+
+
+class ExactIndex:
+    """Brute-force inner-product search — the ground truth for recall."""
+
+    name = "exact"
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = vectors
+
+    def search(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        return _top_k_rows(np.atleast_2d(queries) @ self.vectors.T, k)
+
+
+class IVFIndex:
+    """Inverted-file index in pure NumPy.
+
+    Vectors are clustered with spherical k-means into ``n_lists`` cells;
+    a query scores the centroids, then only the vectors in its ``n_probe``
+    best cells. Cell members are stored contiguously (a reordered copy of
+    the vectors plus offsets), so each probe is a slice, not a gather.
+
+    Args:
+        vectors: (n, d) unit-normalized vectors.
+        n_lists: Number of cells. Defaults to ~4·sqrt(n).
+        n_probe: Cells scanned per query. Recall/latency knob.
+        n_iter: k-means iterations.
+        train_size: Max vectors sampled to train the quantizer.
+    """
+
+    name = "ivf"
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        n_iter: int = 10,
+        train_size: int = 100_000,
+        seed: int = 42,
+    ):
+        self.n_probe = n_probe
+        self._vectors = vectors
+        n = vectors.shape[0]
+        self.n_lists = max(1, min(n, n_lists or int(4 * np.sqrt(n))))
+        self.centroids = self._train(n_iter, train_size, seed)
+        self._assign()
+
+    def _train(self, n_iter: int, train_size: int, seed: int) -> np.ndarray:
+        rng = np.random.default_rng(seed)
+        n = self._vectors.shape[0]
+        sample = np.asarray(self._vectors[np.sort(rng.choice(n, size=min(n, train_size), replace=False))],
+                            dtype=np.float32)
+        centroids = sample[rng.choice(len(sample), size=self.n_lists, replace=False)].copy()
+
+        for _ in range(n_iter):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(labels, kind="stable")
+            counts = np.bincount(labels, minlength=self.n_lists)
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            sums = np.zeros_like(centroids)
+            present = counts > 0
+            sums[present] = np.add.reduceat(sample[order], starts[present], axis=0)
+            norms = np.linalg.norm(sums, axis=1)
+            # Empty cells keep their previous centroid
+            filled = norms > 0
+            centroids[filled] = sums[filled] / norms[filled, None]
+        return centroids
+
+    def _assign(self, block: int = 65_536):
+        n = self._vectors.shape[0]
+        labels = np.empty(n, dtype=np.int64)
+        for start in range(0, n, block):
+            chunk = np.asarray(self._vectors[start:start + block], dtype=np.float32)
+            labels[start:start + block] = np.argmax(chunk @ self.centroids.T, axis=1)
+        self._set_lists(labels)
+
+    def _set_lists(self, labels: np.ndarray):
+        self.ids = np.argsort(labels, kind="stable").astype(np.int64)
+        self.offsets = np.zeros(self.n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(labels, minlength=self.n_lists), out=self.offsets[1:])
+        self.list_vectors = np.asarray(self._vectors[self.ids], dtype=np.float32)
+
+    def search(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        n_probe = min(self.n_probe, self.n_lists)
+        probes, _ = _top_k_rows(queries @ self.centroids.T, n_probe)
+
+        out_idx = np.empty((len(queries), k), dtype=np.int64)
+        out_scores = np.empty((len(queries), k), dtype=np.float32)
+        starts, ends = self.offsets[probes], self.offsets[probes + 1]
+        for row, query in enumerate(queries):
+            positions = np.concatenate([np.arange(s, e) for s, e in zip(starts[row], ends[row])])
+            if len(positions) == 0:
+                out_idx[row], out_scores[row] = -1, -np.inf
+                continue
+            scores = self.list_vectors[positions] @ query
+            top, top_scores = _top_k_rows(scores[None, :], k)
+            out_idx[row], out_scores[row] = _pad(self.ids[positions[top[0]]], top_scores[0], k)
+        return out_idx, out_scores
+
+
+class FaissIndex:
+    """faiss HNSW over inner product (requires ``faiss``)."""
+
+    name = "faiss"
+
+    def __init__(self, vectors: np.ndarray, m: int = 32, ef_construction: int = 200,
+                 ef_search: int = 128):
+        import faiss
+
+        self._index = faiss.IndexHNSWFlat(vectors.shape[1], m, faiss.METRIC_INNER_PRODUCT)
+        self._index.hnsw.efConstruction = ef_construction
+        self._index.hnsw.efSearch = ef_search
+        self._index.add(np.ascontiguousarray(vectors, dtype=np.float32))
+
+    def search(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        queries = np.ascontiguousarray(np.atleast_2d(queries), dtype=np.float32)
+        scores, indices = self._index.search(queries, k)
+        scores[indices < 0] = -np.inf
+        return indices.astype(np.int64), scores
+
+
+class HnswlibIndex:
+    """hnswlib HNSW over inner product (requires ``hnswlib``)."""
+
+    name = "hnswlib"
+
+    def __init__(self, vectors: np.ndarray, m: int = 32, ef_construction: int = 200,
+                 ef_search: int = 128, seed: int = 42):
+        import hnswlib
+
+        n, dim = vectors.shape
+        self._index = hnswlib.Index(space="ip", dim=dim)
+        self._index.init_index(max_elements=n, M=m, ef_construction=ef_construction,
+                               random_seed=seed)
+        self._index.add_items(np.asarray(vectors, dtype=np.float32), np.arange(n))
+        self._index.set_ef(ef_search)
+        self._size = n
+
+    def search(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        labels, distances = self._index.knn_query(np.atleast_2d(queries), k=min(k, self._size))
+        # hnswlib's "ip" space reports 1 - <q, v>
+        indices, scores = labels.astype(np.int64), (1.0 - distances).astype(np.float32)
+        if indices.shape[1] < k:
+            padded = [_pad(i, s, k) for i, s in zip(indices, scores)]
+            indices = np.stack([i for i, _ in padded])
+            scores = np.stack([s for _, s in padded])
+        return indices, scores
+
+
+ANN_BACKENDS = {
+    "exact": ExactIndex,
+    "ivf": IVFIndex,
+    "faiss": FaissIndex,
+    "hnswlib": HnswlibIndex,
+}
+
+
+def build_index(vectors: np.ndarray, backend: str = "ivf", **kwargs):
+    """Build a nearest-neighbor index over unit vectors.
+
+    ``backend="auto"`` picks faiss, then hnswlib, then the NumPy IVF index,
+    depending on what is installed (``kwargs`` then go to the IVF index
+    only). An explicitly requested optional backend that is not installed
+    falls back to IVF with a warning.
+    """
+    if backend == "auto":
+        for name in ("faiss", "hnswlib"):
+            try:
+                return ANN_BACKENDS[name](vectors)
+            except ImportError:
+                continue
+        return IVFIndex(vectors, **kwargs)
+
+    if backend not in ANN_BACKENDS:
+        raise ValueError(f"Unknown ANN backend: {backend!r} (expected one of {sorted(ANN_BACKENDS)} or 'auto')")
+    try:
+        return ANN_BACKENDS[backend](vectors, **kwargs)
+    except ImportError:
+        logger.warning(f"{backend} not installed, falling back to the NumPy IVF index")
+        return IVFIndex(vectors)
+
+
+def recall_at_k(index, exact: ExactIndex, queries: np.ndarray, k: int = 10) -> float:
+    """Fraction of the exact top-k recovered by ``index``, averaged over queries."""
+    approx_idx, _ = index.search(queries, k)
+    exact_idx, _ = exact.search(queries, k)
+    hits = sum(len(np.intersect1d(a[a >= 0], e)) for a, e in zip(approx_idx, exact_idx))
+    return hits / exact_idx.size
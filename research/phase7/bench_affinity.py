@@ -0,0 +1,107 @@
+"""
+Phase 7 -- Benchmark: CombinedAffinity.top_affinities retrieval quality
+
+Compares retrieve-then-rerank top_affinities (per-source candidate pools
+rescored exactly on all three signals) against the original union of
+per-source top-30 lists, which zero-filled signals a candidate was not
+retrieved by. Reports recall@k against an exhaustive reference that scores
+every ingredient, plus per-query latency, across pool sizes.
+
+Usage:
+    python bench_affinity.py                       # 30k synthetic recipes
+    python bench_affinity.py --pools 10 50 200     # sweep pool size
+    python bench_affinity.py --weights 0.6 0.3 0.1
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from affinity_models import CombinedAffinity, CompoundAffinity, IngredientCF
+from bench_common import percentile_ms, synthetic_recipes
+from data_pipeline import IngredientVocab, build_recipe_ingredient_matrix
+from food2vec import Food2Vec
+
+
+def legacy_top_affinities(combined: CombinedAffinity, ingredient: str, topn: int):
+    """The original union-of-top-30 scoring, zero-filling missing signals."""
+    f2v = dict(combined.food2vec.most_similar(ingredient, topn=30))
+    cf = dict(combined.cf.similar_ingredients(ingredient, topn=30))
+    compound = dict(combined.compound.most_similar(ingredient, topn=30))
+    scores = [
+        (c, combined.alpha * f2v.get(c, 0.0) + combined.beta * cf.get(c, 0.0)
+         + combined.gamma * compound.get(c, 0.0))
+        for c in set(f2v) | set(cf) | set(compound)
+    ]
+    scores.sort(key=lambda x: -x[1])
+    return scores[:topn]
+
+
+def synthetic_flavordb(names: list[str], n_compounds: int = 1_000, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    compounds = [f"compound_{i}" for i in range(n_compounds)]
+    return {name: list(rng.choice(compounds, size=rng.integers(5, 60), replace=False))
+            for name in names}
+
+
+def run(label, fn, queries, reference, k):
+    samples, hits = [], 0
+    for query in queries:
+        start = time.perf_counter()
+        result = fn(query)
+        samples.append(time.perf_counter() - start)
+        hits += len({name for name, _ in result} & reference[query])
+    print(f"{label:>16} {percentile_ms(samples, 50):9.2f} {percentile_ms(samples, 99):9.2f} "
+          f"{hits / (k * len(queries)):10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipes", type=int, default=30_000)
+    parser.add_argument("--ingredients", type=int, default=2_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--pools", type=int, nargs="+", default=[10, 30, 100])
+    parser.add_argument("--weights", type=float, nargs=3, default=[0.4, 0.4, 0.2],
+                        metavar=("ALPHA", "BETA", "GAMMA"))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    recipes = synthetic_recipes(args.recipes, n_ingredients=args.ingredients, n_cuisines=40)
+    vocab = IngredientVocab(min_count=5).fit(recipes)
+    cf = IngredientCF(n_neighbors=20).fit(build_recipe_ingredient_matrix(recipes, vocab), vocab)
+    food2vec = Food2Vec(vector_size=64, window=10, min_count=5, epochs=10).train(recipes)
+    universe = [ing for ing in food2vec.vocabulary if vocab.encode(ing) is not None]
+    compounds = CompoundAffinity(synthetic_flavordb(universe))
+
+    alpha, beta, gamma = args.weights
+    combined = CombinedAffinity(food2vec, cf, compounds, alpha=alpha, beta=beta, gamma=gamma)
+
+    rng = np.random.default_rng(0)
+    queries = list(rng.choice(universe, size=min(args.queries, len(universe)), replace=False))
+    reference = {}
+    for query in queries:
+        others = [ing for ing in universe if ing != query]
+        scores = combined.score_candidates(query, others)
+        reference[query] = {others[i] for i in np.argsort(-scores, kind="stable")[:args.k]}
+
+    print(f"{len(universe)} ingredients, {len(queries)} queries, k={args.k}, "
+          f"weights={alpha}/{beta}/{gamma}")
+    print(f"\n{'method':>16} {'p50 ms':>9} {'p99 ms':>9} {'recall@k':>10}")
+    run("legacy union", lambda q: legacy_top_affinities(combined, q, args.k),
+        queries, reference, args.k)
+    for pool in args.pools:
+        run(f"rerank pool={pool}", lambda q: combined.top_affinities(q, args.k, pool_size=pool),
+            queries, reference, args.k)
+
+
+if __name__ == "__main__":
+    main()
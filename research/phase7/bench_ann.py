@@ -0,0 +1,87 @@
+"""
+Phase 7 -- Benchmark: approximate nearest-neighbor substitution lookups
+
+Builds each available ANN backend over synthetic food2vec-like vectors and
+reports build time, per-query latency (p50/p99) and recall@k against exact
+search, sweeping the IVF n_probe knob.
+
+Usage:
+    python bench_ann.py                          # 50k ingredients, dim 100
+    python bench_ann.py --ingredients 200000     # larger vocabulary
+    python bench_ann.py --vectors data/food2vec_vectors.npy   # trained export
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ann_index import ExactIndex, IVFIndex, build_index, recall_at_k
+from bench_common import percentile_ms, synthetic_embeddings
+
+
+def measure(index, queries: np.ndarray, k: int) -> list[float]:
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query[None, :], k)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label: str, index, exact: ExactIndex, queries: np.ndarray, k: int, build_s: float):
+    samples = measure(index, queries, k)
+    recall = recall_at_k(index, exact, queries, k)
+    print(f"{label:>18} {build_s:9.2f} {percentile_ms(samples, 50):9.3f} "
+          f"{percentile_ms(samples, 99):9.3f} {recall:10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ingredients", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=100)
+    parser.add_argument("--vectors", type=Path, default=None,
+                        help="Exported food2vec_vectors.npy instead of synthetic data")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.vectors is not None:
+        vectors = np.load(args.vectors)
+    else:
+        vectors = synthetic_embeddings(args.ingredients, dim=args.dim)
+    rng = np.random.default_rng(0)
+    queries = vectors[rng.choice(len(vectors), size=args.queries, replace=False)]
+    exact = ExactIndex(vectors)
+    print(f"{len(vectors)} vectors, dim {vectors.shape[1]}, {args.queries} queries, k={args.k}")
+
+    print(f"\n{'index':>18} {'build s':>9} {'p50 ms':>9} {'p99 ms':>9} {'recall@k':>10}")
+    report("exact", exact, exact, queries, args.k, 0.0)
+
+    start = time.perf_counter()
+    ivf = IVFIndex(vectors)
+    build_s = time.perf_counter() - start
+    for n_probe in args.probes:
+        ivf.n_probe = n_probe
+        report(f"ivf n_probe={n_probe}", ivf, exact, queries, args.k, build_s)
+
+    for backend in ("faiss", "hnswlib"):
+        start = time.perf_counter()
+        index = build_index(vectors, backend=backend)
+        if index.name != backend:
+            print(f"{backend:>18}   (not installed)")
+            continue
+        report(backend, index, exact, queries, args.k, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Phase 7 -- Benchmark: recipe completion latency
+
+Measures IngredientCF.suggest_ingredients latency (p50/p99) for 5-, 15-
+and 40-ingredient recipes, comparing the vectorized completion path
+against the original per-ingredient kNN loop.
+
+Usage:
+    python bench_completion.py                    # 100k synthetic recipes
+    python bench_completion.py --recipes 20000    # smaller corpus
+    python bench_completion.py --queries 500      # more samples per size
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.neighbors import NearestNeighbors
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from affinity_models import IngredientCF
+from bench_common import percentile_ms, synthetic_recipes
+from data_pipeline import IngredientVocab, build_recipe_ingredient_matrix
+
+
+class LegacyCompletion:
+    """The original completion path: one brute-force kNN query per ingredient."""
+
+    def __init__(self, matrix, vocab):
+        self.vocab = vocab
+        self.items = matrix.T.tocsr()
+        self.nn = NearestNeighbors(metric="cosine", algorithm="brute").fit(self.items)
+
+    def similar(self, ingredient, topn):
+        idx = self.vocab.encode(ingredient)
+        if idx is None:
+            return []
+        distances, indices = self.nn.kneighbors(self.items[idx].toarray(),
+                                                n_neighbors=topn + 1)
+        return [(self.vocab.decode(int(j)), 1.0 - d)
+                for d, j in zip(distances[0], indices[0]) if int(j) != idx][:topn]
+
+    def suggest(self, current, topn):
+        scores = {}
+        for ing in current:
+            for name, sim in self.similar(ing, topn=20):
+                if name not in current:
+                    scores[name] = scores.get(name, 0) + sim
+        return sorted(scores.items(), key=lambda x: -x[1])[:topn]
+
+
+def measure(fn, queries) -> list[float]:
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipes", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 15, 40])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    recipes = synthetic_recipes(args.recipes)
+    vocab = IngredientVocab(min_count=5).fit(recipes)
+    matrix = build_recipe_ingredient_matrix(recipes, vocab)
+
+    start = time.perf_counter()
+    cf = IngredientCF(n_neighbors=20).fit(matrix, vocab)
+    print(f"Fitted neighbor table for {vocab.size} ingredients "
+          f"in {time.perf_counter() - start:.2f}s")
+    legacy = LegacyCompletion(matrix, vocab)
+
+    rng = np.random.default_rng(0)
+    words = list(vocab.word2idx)
+    print(f"\n{'ingredients':>11} {'legacy p50':>11} {'legacy p99':>11} "
+          f"{'vector p50':>11} {'vector p99':>11}   (ms)")
+    for size in args.sizes:
+        queries = [list(rng.choice(words, size=size, replace=False))
+                   for _ in range(args.queries)]
+        fast = measure(lambda q: cf.suggest_ingredients(q, topn=10), queries)
+        slow = measure(lambda q: legacy.suggest(q, topn=10), queries)
+        print(f"{size:>11} {percentile_ms(slow, 50):11.2f} {percentile_ms(slow, 99):11.2f} "
+              f"{percentile_ms(fast, 50):11.3f} {percentile_ms(fast, 99):11.3f}")
+
+
+if __name__ == "__main__":
+    main()
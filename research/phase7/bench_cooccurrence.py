@@ -0,0 +1,91 @@
+"""
+Phase 7 -- Benchmark: co-occurrence matrix construction
+
+Compares the vectorized build_cooccurrence_matrix against the original
+per-cell lil_matrix loop on synthetic recipes and checks that both
+produce identical matrices.
+
+Usage:
+    python bench_cooccurrence.py                      # 10k / 100k / 1M recipes
+    python bench_cooccurrence.py --sizes 10000 50000  # custom sizes
+    python bench_cooccurrence.py --window 3           # windowed co-occurrence
+    python bench_cooccurrence.py --legacy-max 100000  # skip slow loop above N
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from scipy.sparse import lil_matrix
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_common import synthetic_recipes, timed
+from data_pipeline import IngredientVocab, build_cooccurrence_matrix
+
+
+def legacy_cooccurrence_matrix(
+    recipes: list[dict],
+    vocab: IngredientVocab,
+    window: Optional[int] = None,
+):
+    """The original double loop, kept here as the reference implementation."""
+    n = vocab.size
+    matrix = lil_matrix((n, n), dtype=np.float32)
+
+    for recipe in recipes:
+        indices = [vocab.encode(ing) for ing in recipe["ingredients"]]
+        indices = [i for i in indices if i is not None]
+
+        for i, idx_a in enumerate(indices):
+            neighbors = indices if window is None else indices[max(0, i - window):i + window + 1]
+            for idx_b in neighbors:
+                if idx_a != idx_b:
+                    matrix[idx_a, idx_b] += 1
+
+    matrix = matrix + matrix.T
+    return matrix.tocsr()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--window", type=int, default=None)
+    parser.add_argument("--min-count", type=int, default=5)
+    parser.add_argument("--legacy-max", type=int, default=100_000,
+                        help="Skip the legacy loop for larger sizes (it takes hours at 1M)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    print(f"{'recipes':>10} {'vocab':>7} {'legacy (s)':>11} {'vectorized (s)':>15} "
+          f"{'speedup':>8} {'identical':>10}")
+    for size in args.sizes:
+        recipes = synthetic_recipes(size)
+        vocab = IngredientVocab(min_count=args.min_count).fit(recipes)
+
+        timings: dict[str, float] = {}
+        with timed("vectorized", timings):
+            fast = build_cooccurrence_matrix(recipes, vocab, window=args.window)
+
+        if size <= args.legacy_max:
+            with timed("legacy", timings):
+                slow = legacy_cooccurrence_matrix(recipes, vocab, window=args.window)
+            identical = (fast != slow).nnz == 0
+            legacy_str = f"{timings['legacy']:11.2f}"
+            speedup = f"{timings['legacy'] / timings['vectorized']:7.1f}x"
+        else:
+            identical = None
+            legacy_str, speedup = f"{'skipped':>11}", f"{'-':>8}"
+
+        print(f"{size:>10} {vocab.size:>7} {legacy_str} {timings['vectorized']:15.2f} "
+              f"{speedup} {str(identical):>10}")
+
+
+if __name__ == "__main__":
+    main()
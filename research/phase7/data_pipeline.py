@@ -10,12 +10,15 @@ import json
 import re
 import ast
 import logging
-from collections import Counter, defaultdict
+import os
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 import numpy as np
-from scipy.sparse import lil_matrix, save_npz, load_npz
+from scipy.sparse import coo_matrix, csr_matrix, save_npz, load_npz
 
 logger = logging.getLogger(__name__)
 
@@ -43,34 +46,75 @@ FRACTIONS = {"½": 0.5, "⅓": 0.33, "⅔": 0.67, "¼": 0.25, "¾": 0.75,
              "⅛": 0.125, "⅜": 0.375, "⅝": 0.625, "⅞": 0.875}
 
 
-def normalize_ingredient(raw: str, canonical_map=None) -> str:
-    """Normalize an ingredient string to a canonical name.
+# Applied in order: parenthetical notes must go before digits/punctuation
+# are stripped, otherwise "1 (x)/2" would collapse into a fraction.
+_PARENTHETICAL_RE = re.compile(r"\(.*?\)")
+# Digits plus all punctuation except hyphens (keep compound names like
+# "all-purpose"). Equivalent to stripping ASCII fractions, then numbers,
+# then punctuation: any "/" or "." left behind by the narrower numeric
+# patterns is removed by the punctuation class anyway.
+_STRIP_RE = re.compile(r"[^\w\s-]|\d+")
+_FRACTION_TABLE = str.maketrans({frac: None for frac in FRACTIONS})
 
-    Strips quantities, units, preparation instructions, and punctuation.
-    Optionally applies a CanonicalMap for synonym collapse and noise removal.
-    Returns lowercased, whitespace-collapsed ingredient name.
-    Returns empty string if the ingredient is blocked or is a compound dish.
+
+class IngredientNormalizer:
+    """Compiled, memoized ingredient normalizer.
+
+    Produces exactly the output of ``normalize_ingredient`` with a fixed
+    canonical map. Ingredient strings repeat heavily across recipes and
+    requests, so results are cached in a bounded LRU keyed by the raw
+    string. Call ``cache_clear()`` if the canonical map is mutated.
     """
-    text = raw.lower().strip()
 
-    # Remove parenthetical notes
-    text = re.sub(r"\(.*?\)", "", text)
+    def __init__(self, canonical_map=None, cache_size: int = 65_536):
+        self.canonical_map = canonical_map
+        self._canonicalize = None
+        if canonical_map is not None:
+            from vocab_canonicalize import canonicalize
+            self._canonicalize = canonicalize
+        self._cached = lru_cache(maxsize=cache_size)(self._normalize)
+
+    def _normalize(self, raw: str) -> str:
+        text = _PARENTHETICAL_RE.sub("", raw.lower().strip())
+        text = _STRIP_RE.sub("", text.translate(_FRACTION_TABLE))
 
-    # Remove fractions (unicode and ASCII)
-    for frac in FRACTIONS:
-        text = text.replace(frac, "")
-    text = re.sub(r"\d+/\d+", "", text)
+        # Tokenize and remove unit/descriptor words
+        result = " ".join(t for t in text.split() if t not in UNITS and len(t) > 1)
 
-    # Remove numbers
-    text = re.sub(r"\d+\.?\d*", "", text)
+        if self._canonicalize is not None and result:
+            mapped = self._canonicalize(result, self.canonical_map)
+            return mapped if mapped is not None else ""
+        return result
 
-    # Remove punctuation except hyphens (keep compound names like "all-purpose")
-    text = re.sub(r"[^\w\s-]", "", text)
+    def __call__(self, raw: str) -> str:
+        return self._cached(raw)
+
+    def normalize_many(self, raws: Iterable[str]) -> list[str]:
+        """Normalize a batch of ingredient strings."""
+        cached = self._cached
+        return [cached(raw) for raw in raws]
+
+    def cache_info(self):
+        return self._cached.cache_info()
+
+    def cache_clear(self) -> None:
+        self._cached.cache_clear()
+
+
+_default_normalizer = IngredientNormalizer()
+
+
+def normalize_ingredient(raw: str, canonical_map=None) -> str:
+    """Normalize an ingredient string to a canonical name.
 
-    # Tokenize and remove unit/descriptor words
-    tokens = [t for t in text.split() if t not in UNITS and len(t) > 1]
+    Strips quantities, units, preparation instructions, and punctuation.
+    Optionally applies a CanonicalMap for synonym collapse and noise removal.
+    Returns lowercased, whitespace-collapsed ingredient name.
+    Returns empty string if the ingredient is blocked or is a compound dish.
 
-    result = " ".join(tokens).strip()
+    Hot paths should hold an ``IngredientNormalizer`` bound to their map.
+    """
+    result = _default_normalizer(raw)
 
     # Apply canonical map if provided
     if canonical_map is not None and result:
@@ -109,25 +153,88 @@ def parse_recipenlg_row(row: dict) -> Optional[dict]:
         return None
 
 
-def load_recipenlg(path: Path, limit: Optional[int] = None) -> list[dict]:
+def _parse_rows(rows: list[dict]) -> list[dict]:
+    """Parse a chunk of RecipeNLG rows, dropping rejected ones (pool worker)."""
+    return [parsed for parsed in map(parse_recipenlg_row, rows) if parsed]
+
+
+def _iter_row_chunks(
+    path: Path, limit: Optional[int], chunk_size: int
+) -> Iterator[list[dict]]:
+    with open(path, "r", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        chunk = []
+        for i, row in enumerate(reader):
+            if limit and i >= limit:
+                break
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def iter_recipenlg_batches(
+    path: Path,
+    limit: Optional[int] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 2_000,
+) -> Iterator[list[dict]]:
+    """Stream parsed RecipeNLG recipes in batches, in input order.
+
+    Rows are read in chunks of `chunk_size` and parsed across a process
+    pool. At most ``2 × workers`` chunks are in flight, so memory stays
+    bounded regardless of file size.
+
+    Args:
+        path: Path to full_dataset.csv
+        limit: Max CSV rows to read (None = all)
+        workers: Parser processes (None = os.cpu_count(), 1 = in-process)
+        chunk_size: Rows per pool task; each task yields one batch.
+
+    Yields:
+        Lists of parsed recipe dicts with normalized ingredients.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _iter_row_chunks(path, limit, chunk_size)
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield _parse_rows(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_parse_rows, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def load_recipenlg(
+    path: Path,
+    limit: Optional[int] = None,
+    workers: Optional[int] = 1,
+    chunk_size: int = 2_000,
+) -> list[dict]:
     """Load and parse RecipeNLG CSV file.
 
     Args:
         path: Path to full_dataset.csv
         limit: Max recipes to load (None = all)
+        workers: Parser processes (None = os.cpu_count(), 1 = in-process)
+        chunk_size: Rows per parser task
 
     Returns:
         List of parsed recipe dicts with normalized ingredients.
     """
     recipes = []
-    with open(path, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for i, row in enumerate(reader):
-            if limit and i >= limit:
-                break
-            parsed = parse_recipenlg_row(row)
-            if parsed:
-                recipes.append(parsed)
+    for batch in iter_recipenlg_batches(path, limit=limit, workers=workers,
+                                        chunk_size=chunk_size):
+        recipes.extend(batch)
 
     logger.info(f"Loaded {len(recipes)} recipes from RecipeNLG")
     return recipes
@@ -192,34 +299,86 @@ class IngredientVocab:
         return vocab
 
 
+def encode_recipes(
+    recipes: list[dict],
+    vocab: IngredientVocab,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Encode recipe ingredient lists as one flat id stream plus offsets.
+
+    Out-of-vocabulary ingredients are dropped. Recipe ``i`` owns
+    ``ids[offsets[i]:offsets[i + 1]]``.
+
+    Returns:
+        (ids, offsets) — int32 ingredient ids and int64 offsets of
+        length ``len(recipes) + 1``.
+    """
+    word2idx = vocab.word2idx
+    ids: list[int] = []
+    offsets = np.zeros(len(recipes) + 1, dtype=np.int64)
+
+    for i, recipe in enumerate(recipes):
+        for ing in recipe["ingredients"]:
+            idx = word2idx.get(ing)
+            if idx is not None:
+                ids.append(idx)
+        offsets[i + 1] = len(ids)
+
+    return np.asarray(ids, dtype=np.int32), offsets
+
+
 def build_cooccurrence_matrix(
     recipes: list[dict],
     vocab: IngredientVocab,
     window: Optional[int] = None,
+    encoded: Optional[tuple[np.ndarray, np.ndarray]] = None,
 ) -> "np.ndarray":
     """Build ingredient co-occurrence matrix from recipes.
 
+    Recipes are encoded once into a flat id stream and the counts are
+    produced with bulk sparse construction instead of per-cell writes.
+
     Args:
         recipes: List of recipe dicts with 'ingredients' key.
         vocab: Fitted IngredientVocab.
         window: If None, all ingredients in a recipe co-occur.
                 If set, only ingredients within `window` positions co-occur.
+        encoded: Optional (ids, offsets) from ``encode_recipes``.
 
     Returns:
         Symmetric co-occurrence matrix (vocab.size × vocab.size).
     """
     n = vocab.size
-    matrix = lil_matrix((n, n), dtype=np.float32)
-
-    for recipe in recipes:
-        indices = [vocab.encode(ing) for ing in recipe["ingredients"]]
-        indices = [i for i in indices if i is not None]
-
-        for i, idx_a in enumerate(indices):
-            neighbors = indices if window is None else indices[max(0, i - window):i + window + 1]
-            for idx_b in neighbors:
-                if idx_a != idx_b:
-                    matrix[idx_a, idx_b] += 1
+    ids, offsets = encoded if encoded is not None else encode_recipes(recipes, vocab)
+    lengths = np.diff(offsets)
+    recipe_of = np.repeat(np.arange(len(lengths), dtype=np.int64), lengths)
+
+    if window is None:
+        # (recipe × ingredient)ᵀ · (recipe × ingredient) counts every
+        # ordered pair of positions within a recipe
+        incidence = coo_matrix(
+            (np.ones(len(ids), dtype=np.float32), (recipe_of, ids)),
+            shape=(len(lengths), n),
+        ).tocsr()
+        matrix = (incidence.T @ incidence).tocoo()
+        off_diag = matrix.row != matrix.col
+        rows, cols = matrix.row[off_diag], matrix.col[off_diag]
+        data = matrix.data[off_diag]
+    else:
+        # One vectorized pass per positional distance d: pair each position
+        # with the one d steps later inside the same recipe
+        max_len = int(lengths.max()) if len(lengths) else 0
+        row_parts, col_parts = [], []
+        for d in range(1, min(window, max_len - 1) + 1):
+            same_recipe = recipe_of[:-d] == recipe_of[d:]
+            a, b = ids[:-d][same_recipe], ids[d:][same_recipe]
+            keep = a != b
+            row_parts += [a[keep], b[keep]]
+            col_parts += [b[keep], a[keep]]
+        rows = np.concatenate(row_parts) if row_parts else np.empty(0, dtype=np.int32)
+        cols = np.concatenate(col_parts) if col_parts else np.empty(0, dtype=np.int32)
+        data = np.ones(len(rows), dtype=np.float32)
+
+    matrix = coo_matrix((data, (rows, cols)), shape=(n, n), dtype=np.float32).tocsr()
 
     # Symmetrize
     matrix = matrix + matrix.T
@@ -232,27 +391,40 @@ def build_cooccurrence_matrix(
 def build_recipe_ingredient_matrix(
     recipes: list[dict],
     vocab: IngredientVocab,
+    dtype=np.float32,
+    encoded: Optional[tuple[np.ndarray, np.ndarray]] = None,
 ) -> "np.ndarray":
     """Build binary recipe×ingredient matrix for collaborative filtering.
 
+    Args:
+        recipes: List of recipe dicts with 'ingredients' key.
+        vocab: Fitted IngredientVocab.
+        dtype: Value dtype. ``np.uint8`` or ``bool`` store the same binary
+               matrix in a quarter of the memory of ``np.float32``.
+        encoded: Optional (ids, offsets) from ``encode_recipes`` to skip
+                 re-encoding when the stream is already available.
+
     Returns:
         Sparse binary matrix (num_recipes × vocab.size).
     """
     n_recipes = len(recipes)
     n_ingredients = vocab.size
-    matrix = lil_matrix((n_recipes, n_ingredients), dtype=np.float32)
+    ids, offsets = encoded if encoded is not None else encode_recipes(recipes, vocab)
+    rows = np.repeat(np.arange(n_recipes, dtype=np.int32), np.diff(offsets))
 
-    for i, recipe in enumerate(recipes):
-        for ing in recipe["ingredients"]:
-            idx = vocab.encode(ing)
-            if idx is not None:
-                matrix[i, idx] = 1.0
+    matrix = csr_matrix(
+        (np.ones(len(ids), dtype=dtype), (rows, ids)),
+        shape=(n_recipes, n_ingredients),
+    )
+    # Repeated ingredients within a recipe are summed on construction;
+    # clamp back to a binary matrix
+    matrix.data[:] = 1
 
     logger.info(
         f"Recipe-ingredient matrix: {n_recipes}×{n_ingredients}, "
         f"density={matrix.nnz / (n_recipes * n_ingredients):.4f}"
     )
-    return matrix.tocsr()
+    return matrix
 
 
 # ── FlavorDB loader ──────────────────────────────────────────────────────
@@ -300,40 +472,62 @@ def run_pipeline(
     limit: int = 100_000,
     min_count: int = 10,
     output_dir: Optional[Path] = None,
+    recipe_ingredient_dtype=np.float32,
+    workers: Optional[int] = None,
 ) -> dict:
     """Run the full data pipeline: load → normalize → build matrices.
 
+    Parsed batches are streamed from ``iter_recipenlg_batches`` and only
+    each recipe's title and ingredient list are kept, with every distinct
+    ingredient string stored once. The full parsed recipe list is never
+    built. The lean records are still held for the whole run, because the
+    vocabulary needs every count before the matrices can be encoded and
+    ``recipes_meta.json`` lists every recipe.
+
     Args:
         recipenlg_path: Path to RecipeNLG full_dataset.csv
         limit: Max recipes to process
         min_count: Minimum ingredient frequency for vocabulary
         output_dir: Where to save outputs (default: DATA_DIR)
+        recipe_ingredient_dtype: Value dtype of the saved recipe×ingredient
+            matrix (``np.uint8`` cuts its size by 4x)
+        workers: Parser processes for loading (None = os.cpu_count())
 
     Returns:
-        Dict with recipes, vocab, cooccurrence, and recipe_ingredient matrices.
+        Dict with recipes (title and ingredients only), vocab, cooccurrence,
+        and recipe_ingredient matrices.
     """
     output_dir = output_dir or DATA_DIR
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Load and parse
-    recipes = load_recipenlg(recipenlg_path, limit=limit)
+    # Load and parse, keeping only what the outputs need
+    recipes = []
+    names: dict[str, str] = {}
+    for batch in iter_recipenlg_batches(recipenlg_path, limit=limit, workers=workers):
+        for r in batch:
+            # Parsed batches carry a fresh copy of every ingredient string
+            ingredients = [names.setdefault(ing, ing) for ing in r["ingredients"]]
+            recipes.append({"title": r["title"], "ingredients": ingredients})
+    logger.info(f"Loaded {len(recipes)} recipes from RecipeNLG ({len(names)} distinct ingredients)")
 
     # Build vocabulary
     vocab = IngredientVocab(min_count=min_count)
     vocab.fit(recipes)
     vocab.save(output_dir / "vocab.json")
 
-    # Build matrices
-    cooccurrence = build_cooccurrence_matrix(recipes, vocab)
-    recipe_ingredient = build_recipe_ingredient_matrix(recipes, vocab)
+    # Build matrices from a single encoding pass
+    encoded = encode_recipes(recipes, vocab)
+    cooccurrence = build_cooccurrence_matrix(recipes, vocab, encoded=encoded)
+    recipe_ingredient = build_recipe_ingredient_matrix(
+        recipes, vocab, dtype=recipe_ingredient_dtype, encoded=encoded
+    )
 
     save_npz(output_dir / "cooccurrence.npz", cooccurrence)
     save_npz(output_dir / "recipe_ingredient.npz", recipe_ingredient)
 
     # Save recipe metadata (titles + ingredient lists)
-    meta = [{"title": r["title"], "ingredients": r["ingredients"]} for r in recipes]
     with open(output_dir / "recipes_meta.json", "w") as f:
-        json.dump(meta, f)
+        json.dump(recipes, f)
 
     logger.info(f"Pipeline complete. Outputs saved to {output_dir}")
 
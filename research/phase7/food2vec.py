@@ -39,6 +39,7 @@ class Food2Vec:
         self.epochs = epochs
         self.seed = seed
         self.model = None
+        self._store: Optional["EmbeddingStore"] = None
 
     def train(self, recipes: list[dict]) -> "Food2Vec":
         """Train Word2Vec on recipe ingredient lists.
@@ -65,6 +66,7 @@ class Food2Vec:
             workers=4,
             sg=1,  # Skip-gram (better for small datasets)
         )
+        self._store = None
 
         logger.info(f"Trained on {len(self.model.wv)} ingredients")
         return self
@@ -73,6 +75,8 @@ class Food2Vec:
         """Find most similar ingredients by embedding distance."""
         if self.model is None:
             raise RuntimeError("Model not trained. Call train() first.")
+        if self._store is not None and self._store.index is not None:
+            return self._store.most_similar(ingredient, topn=topn)
         try:
             return self.model.wv.most_similar(ingredient, topn=topn)
         except KeyError:
@@ -88,6 +92,56 @@ class Food2Vec:
         except KeyError:
             return 0.0
 
+    def embedding_store(self) -> "EmbeddingStore":
+        """In-memory EmbeddingStore over this model's unit vectors (cached)."""
+        if self._store is None:
+            if self.model is None:
+                raise RuntimeError("Model not trained. Call train() first.")
+            self._store = EmbeddingStore(
+                self.model.wv.get_normed_vectors(), list(self.model.wv.index_to_key)
+            )
+        return self._store
+
+    def similarity_many(self, pairs: list[tuple[str, str]]) -> np.ndarray:
+        """Cosine similarity for many ingredient pairs at once."""
+        if self.model is None:
+            raise RuntimeError("Model not trained. Call train() first.")
+        return self.embedding_store().similarity_many(pairs)
+
+    def similarity_matrix(self, ingredients: list[str]) -> np.ndarray:
+        """Pairwise cosine similarity for a set of ingredients."""
+        if self.model is None:
+            raise RuntimeError("Model not trained. Call train() first.")
+        return self.embedding_store().similarity_matrix(ingredients)
+
+    def most_similar_many(
+        self, ingredients: list[str], topn: int = 10
+    ) -> list[list[tuple[str, float]]]:
+        """``most_similar`` for many ingredients with one matrix product."""
+        if self.model is None:
+            raise RuntimeError("Model not trained. Call train() first.")
+        return self.embedding_store().most_similar_many(ingredients, topn=topn)
+
+    def build_index(self, backend: str = "ivf", **kwargs) -> "Food2Vec":
+        """Serve ``most_similar`` from an approximate index over the unit vectors.
+
+        Worth it once the vocabulary is large (tens of thousands of
+        ingredients) and lookups are issued in loops, e.g. pair mining.
+        """
+        self.embedding_store().build_index(backend, **kwargs)
+        return self
+
+    def export_embeddings(self, directory: Path):
+        """Write the serving artifacts: unit vectors (.npy) + vocabulary index.
+
+        Training-only state (syn1neg, vocab counts) is dropped, so the
+        export can be memory-mapped by ``EmbeddingStore.load`` without
+        gensim.
+        """
+        if self.model is None:
+            raise RuntimeError("No model to export.")
+        self.embedding_store().save(directory)
+
     def analogy(
         self,
         positive: list[str],
@@ -141,6 +195,186 @@ class Food2Vec:
         return instance
 
 
+EMBEDDING_VECTORS = "food2vec_vectors.npy"
+EMBEDDING_VOCAB = "food2vec_vocab.json"
+
+
+class EmbeddingStore:
+    """Read-only serving view of food2vec embeddings.
+
+    Holds unit-normalized vectors plus a vocabulary index and answers
+    ``most_similar``/``similarity`` with plain NumPy, matching gensim's
+    results. Loaded with ``mmap_mode='r'``, the vector file is shared
+    through the page cache by every worker process on the host.
+    """
+
+    def __init__(self, vectors: np.ndarray, index_to_key: list[str]):
+        self.vectors = vectors
+        self.index_to_key = index_to_key
+        self.key_to_index = {key: i for i, key in enumerate(index_to_key)}
+        self.index = None
+
+    def build_index(self, backend: str = "ivf", **kwargs) -> "EmbeddingStore":
+        """Answer ``most_similar`` from an approximate index (see ann_index).
+
+        ``backend="exact"`` restores exact search.
+        """
+        if backend == "exact":
+            self.index = None
+            return self
+        from ann_index import build_index
+
+        self.index = build_index(self.vectors, backend=backend, **kwargs)
+        logger.info(f"Built {self.index.name} index over {len(self.index_to_key)} ingredients")
+        return self
+
+    @classmethod
+    def load(cls, directory: Path, mmap_mode: Optional[str] = "r") -> "EmbeddingStore":
+        directory = Path(directory)
+        vectors = np.load(directory / EMBEDDING_VECTORS, mmap_mode=mmap_mode)
+        with open(directory / EMBEDDING_VOCAB) as f:
+            index_to_key = json.load(f)
+        logger.info(f"Embedding store loaded from {directory}: {len(index_to_key)} ingredients")
+        return cls(vectors, index_to_key)
+
+    def save(self, directory: Path):
+        directory = Path(directory)
+        np.save(directory / EMBEDDING_VECTORS, np.asarray(self.vectors, dtype=np.float32))
+        with open(directory / EMBEDDING_VOCAB, "w") as f:
+            json.dump(self.index_to_key, f)
+        logger.info(f"Embedding store saved to {directory}")
+
+    @property
+    def vocabulary(self) -> list[str]:
+        return list(self.index_to_key)
+
+    @property
+    def vector_size(self) -> int:
+        return self.vectors.shape[1]
+
+    def _indices(self, ingredients: list[str]) -> np.ndarray:
+        """Vocabulary row per ingredient, -1 where unknown."""
+        key_to_index = self.key_to_index
+        return np.array([key_to_index.get(ing, -1) for ing in ingredients], dtype=np.int64)
+
+    def get_vector(self, ingredient: str) -> Optional[np.ndarray]:
+        """Unit-normalized embedding for an ingredient."""
+        idx = self.key_to_index.get(ingredient)
+        return None if idx is None else np.asarray(self.vectors[idx])
+
+    def similarity(self, ing_a: str, ing_b: str) -> float:
+        """Cosine similarity between two ingredient embeddings."""
+        a, b = self.key_to_index.get(ing_a), self.key_to_index.get(ing_b)
+        if a is None or b is None:
+            return 0.0
+        return float(np.dot(self.vectors[a], self.vectors[b]))
+
+    def similarity_many(self, pairs: list[tuple[str, str]]) -> np.ndarray:
+        """Cosine similarity for many pairs from one Gram-matrix product.
+
+        Unknown ingredients score 0.0, as in ``similarity``.
+        """
+        if not pairs:
+            return np.zeros(0, dtype=np.float32)
+        rows = self._indices([ing for pair in pairs for ing in pair]).reshape(-1, 2)
+        known = (rows >= 0).all(axis=1)
+
+        unique, inverse = np.unique(rows[known], return_inverse=True)
+        vectors = self.vectors[unique]
+        gram = vectors @ vectors.T
+        inverse = inverse.reshape(-1, 2)
+
+        sims = np.zeros(len(pairs), dtype=np.float32)
+        sims[known] = gram[inverse[:, 0], inverse[:, 1]]
+        return sims
+
+    def similarity_matrix(self, ingredients: list[str]) -> np.ndarray:
+        """Pairwise cosine similarity for a set of ingredients.
+
+        Unknown ingredients get zero rows and columns, as in ``similarity``.
+        """
+        rows = self._indices(ingredients)
+        known = np.flatnonzero(rows >= 0)
+        result = np.zeros((len(rows), len(rows)), dtype=np.float32)
+        if len(known):
+            vectors = np.asarray(self.vectors[rows[known]])
+            result[np.ix_(known, known)] = vectors @ vectors.T
+        return result
+
+    def _rank(self, queries: np.ndarray, exclude: list[list[int]], topn: int):
+        """Top-n (index, score) per query row, skipping excluded indices."""
+        if self.index is not None:
+            return self._rank_approximate(queries, exclude, topn)
+        sims = queries @ self.vectors.T
+        for row, skip in enumerate(exclude):
+            sims[row, skip] = -np.inf
+        k = min(topn, sims.shape[1] - min(len(skip) for skip in exclude))
+        if k <= 0:
+            return [[] for _ in exclude]
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(sims, top, axis=1), axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        return [
+            [(self.index_to_key[j], float(sims[row, j])) for j in top[row]
+             if np.isfinite(sims[row, j])]
+            for row in range(len(exclude))
+        ]
+
+    def _rank_approximate(self, queries: np.ndarray, exclude: list[list[int]], topn: int):
+        width = topn + max(len(skip) for skip in exclude)
+        indices, scores = self.index.search(queries, min(width, len(self.index_to_key)))
+        results = []
+        for row, skip in enumerate(exclude):
+            skip = set(skip)
+            results.append([
+                (self.index_to_key[j], float(score))
+                for j, score in zip(indices[row].tolist(), scores[row].tolist())
+                if j >= 0 and j not in skip
+            ][:topn])
+        return results
+
+    def most_similar(self, ingredient: str, topn: int = 10) -> list[tuple[str, float]]:
+        """Find most similar ingredients by embedding distance."""
+        return self.most_similar_many([ingredient], topn=topn)[0]
+
+    def most_similar_many(
+        self, ingredients: list[str], topn: int = 10
+    ) -> list[list[tuple[str, float]]]:
+        """``most_similar`` for many ingredients with one matrix product."""
+        rows = self._indices(ingredients)
+        results: list[list[tuple[str, float]]] = [[] for _ in ingredients]
+        for i in np.flatnonzero(rows < 0):
+            logger.warning(f"'{ingredients[i]}' not in vocabulary")
+        known = np.flatnonzero(rows >= 0)
+        if len(known) == 0:
+            return results
+
+        ranked = self._rank(
+            np.asarray(self.vectors[rows[known]]), [[int(r)] for r in rows[known]], topn
+        )
+        for i, row in zip(known, ranked):
+            results[i] = row
+        return results
+
+    def analogy(
+        self,
+        positive: list[str],
+        negative: list[str],
+        topn: int = 5,
+    ) -> list[tuple[str, float]]:
+        """Ingredient analogy: positive - negative ≈ ? (gensim semantics)."""
+        try:
+            pos = [self.key_to_index[k] for k in positive]
+            neg = [self.key_to_index[k] for k in negative]
+        except KeyError as e:
+            logger.warning(f"Analogy failed: {e}")
+            return []
+        mean = self.vectors[pos].sum(axis=0) - self.vectors[neg].sum(axis=0)
+        mean = mean / len(pos + neg)
+        mean = mean / np.linalg.norm(mean)
+        return self._rank(mean[None, :], [pos + neg], topn)[0]
+
+
 # ── Evaluation utilities ─────────────────────────────────────────────────
 
 def evaluate_neighbors(
@@ -170,9 +404,11 @@ def evaluate_affinity_vs_compounds(
 ) -> dict:
     """Evaluate: do food2vec neighbors share more flavor compounds?
 
-    Compares compound overlap for top-N neighbors vs. random pairs.
+    Compares compound overlap for top-N neighbors vs. random pairs. All
+    pairs are collected first and scored in one batched
+    ``CompoundAffinity.overlap_many`` call.
     """
-    from data_pipeline import compound_overlap_score
+    from affinity_models import CompoundAffinity
 
     # Get ingredients that exist in both model and FlavorDB
     shared = [ing for ing in model.vocabulary if ing in flavordb]
@@ -182,26 +418,31 @@ def evaluate_affinity_vs_compounds(
     rng = np.random.RandomState(42)
     sample = rng.choice(shared, size=min(sample_size, len(shared)), replace=False)
 
-    neighbor_overlaps = []
-    random_overlaps = []
+    if hasattr(model, "most_similar_many"):
+        all_neighbors = model.most_similar_many(list(sample), topn=topn)
+    else:
+        all_neighbors = [model.most_similar(ing, topn=topn) for ing in sample]
 
-    for ing in sample:
-        neighbors = model.most_similar(ing, topn=topn)
+    neighbor_pairs = []
+    random_pairs = []
+    for ing, neighbors in zip(sample, all_neighbors):
         for neighbor, _ in neighbors:
             if neighbor in flavordb:
-                score = compound_overlap_score(ing, neighbor, flavordb)
-                neighbor_overlaps.append(score)
+                neighbor_pairs.append((ing, neighbor))
 
         # Random comparison
         randoms = rng.choice(shared, size=topn, replace=False)
         for rand_ing in randoms:
             if rand_ing != ing:
-                score = compound_overlap_score(ing, rand_ing, flavordb)
-                random_overlaps.append(score)
+                random_pairs.append((ing, rand_ing))
+
+    compounds = CompoundAffinity(flavordb)
+    neighbor_overlaps = compounds.overlap_many(neighbor_pairs)
+    random_overlaps = compounds.overlap_many(random_pairs)
 
     result = {
-        "mean_neighbor_overlap": float(np.mean(neighbor_overlaps)) if neighbor_overlaps else 0,
-        "mean_random_overlap": float(np.mean(random_overlaps)) if random_overlaps else 0,
+        "mean_neighbor_overlap": float(np.mean(neighbor_overlaps)) if len(neighbor_overlaps) else 0,
+        "mean_random_overlap": float(np.mean(random_overlaps)) if len(random_overlaps) else 0,
         "n_neighbor_pairs": len(neighbor_overlaps),
         "n_random_pairs": len(random_overlaps),
         "lift": 0.0,
@@ -292,6 +533,7 @@ if __name__ == "__main__":
         print("  python food2vec.py train <recipenlg_csv> [limit]")
         print("  python food2vec.py similar <ingredient>")
         print("  python food2vec.py eval")
+        print("  python food2vec.py export")
         sys.exit(1)
 
     cmd = sys.argv[1]
@@ -307,6 +549,7 @@ if __name__ == "__main__":
         model = Food2Vec(vector_size=100, window=10, min_count=10, epochs=30)
         model.train(recipes)
         model.save(model_path)
+        model.export_embeddings(DATA_DIR)
 
         # Quick evaluation
         test_items = [
@@ -337,3 +580,7 @@ if __name__ == "__main__":
         ]
         print("\n── Nearest Neighbors ──")
         evaluate_neighbors(model, test_items, topn=5)
+
+    elif cmd == "export":
+        model = Food2Vec.load(model_path)
+        model.export_embeddings(DATA_DIR)
@@ -151,15 +151,13 @@ class FoodKnowledgeGraph:
 
     def add_technique_triples(self, recipes: list[dict], vocab):
         """Add same_technique triples from recipe instructions."""
-        from affinity_models import extract_techniques_from_instructions
+        from affinity_models import extract_techniques_many
 
         technique_ingredients: dict[str, set[str]] = defaultdict(set)
 
-        for recipe in recipes:
-            instructions = recipe.get("instructions", "")
-            if not instructions:
-                continue
-            techniques = extract_techniques_from_instructions(instructions)
+        recipes = [recipe for recipe in recipes if recipe.get("instructions", "")]
+        all_techniques = extract_techniques_many([r["instructions"] for r in recipes])
+        for recipe, techniques in zip(recipes, all_techniques):
             ingredients = [
                 ing for ing in recipe["ingredients"]
                 if vocab.encode(ing) is not None
@@ -183,16 +181,14 @@ class FoodKnowledgeGraph:
         Only adds triples where an ingredient-technique pair appears in
         at least `min_count` recipes.
         """
-        from affinity_models import extract_techniques_from_instructions
+        from affinity_models import extract_techniques_many
         from collections import Counter
 
         pair_counts: Counter = Counter()
 
-        for recipe in recipes:
-            directions = recipe.get("directions", "")
-            if not directions:
-                continue
-            techniques = extract_techniques_from_instructions(directions)
+        recipes = [recipe for recipe in recipes if recipe.get("directions", "")]
+        all_techniques = extract_techniques_many([r["directions"] for r in recipes])
+        for recipe, techniques in zip(recipes, all_techniques):
             ingredients = [
                 ing for ing in recipe["ingredients"]
                 if vocab.encode(ing) is not None
@@ -27,7 +27,7 @@ from data_pipeline import (
     normalize_ingredient,
 )
 from food2vec import Food2Vec, evaluate_neighbors
-from affinity_models import IngredientCF, CombinedAffinity
+from affinity_models import IngredientCF, CombinedAffinity, TechniqueIndex
 
 logging.basicConfig(
     level=logging.INFO,
@@ -107,6 +107,9 @@ def run_pipeline(recipes: list[dict], min_count: int = 3) -> dict:
     with open(DATA_DIR / "recipes_meta.json", "w") as f:
         json.dump(meta, f)
 
+    # Precompute ingredient×technique counts so the service need not re-extract
+    TechniqueIndex.from_recipes(recipes).save(DATA_DIR)
+
     return {"vocab": vocab, "cooccurrence": cooc, "recipe_ingredient": ri_matrix}
 
 
@@ -121,6 +124,7 @@ def train_food2vec(recipes: list[dict], min_count: int = 3) -> Food2Vec:
     )
     model.train(recipes)
     model.save(DATA_DIR / "food2vec.model")
+    model.export_embeddings(DATA_DIR)
     return model
 
 
@@ -128,6 +132,7 @@ def train_cf(ri_matrix, vocab) -> IngredientCF:
     """Train collaborative filtering model."""
     cf = IngredientCF(n_neighbors=20)
     cf.fit(ri_matrix, vocab)
+    cf.save_neighbors(DATA_DIR)
     return cf
 
 
@@ -0,0 +1,84 @@
+"""Tests for Phase 7 approximate nearest-neighbor indexes."""
+
+import sys
+import os
+import pytest
+import numpy as np
+
+# Add research/phase7 to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'research', 'phase7'))
+
+
+@pytest.fixture
+def vectors():
+    from bench_common import synthetic_embeddings
+    return synthetic_embeddings(3000, dim=32, n_clusters=40)
+
+
+class TestExactIndex:
+    def test_matches_brute_force(self, vectors):
+        from ann_index import ExactIndex
+        indices, scores = ExactIndex(vectors).search(vectors[:5], k=4)
+        expected = np.argsort(-(vectors[:5] @ vectors.T), axis=1)[:, :4]
+        np.testing.assert_array_equal(indices, expected)
+        assert (np.diff(scores, axis=1) <= 0).all()
+
+
+class TestIVFIndex:
+    def test_recall_is_high(self, vectors):
+        from ann_index import ExactIndex, IVFIndex, recall_at_k
+        index = IVFIndex(vectors, n_probe=8)
+        assert recall_at_k(index, ExactIndex(vectors), vectors[:200], k=10) >= 0.95
+
+    def test_probing_every_list_is_exact(self, vectors):
+        from ann_index import ExactIndex, IVFIndex
+        index = IVFIndex(vectors, n_lists=16)
+        index.n_probe = 16
+        got, got_scores = index.search(vectors[:20], k=5)
+        expected, expected_scores = ExactIndex(vectors).search(vectors[:20], k=5)
+        np.testing.assert_array_equal(got, expected)
+        np.testing.assert_allclose(got_scores, expected_scores, atol=1e-5)
+
+    def test_every_vector_in_one_list(self, vectors):
+        from ann_index import IVFIndex
+        index = IVFIndex(vectors)
+        assert sorted(index.ids.tolist()) == list(range(len(vectors)))
+        assert index.offsets[-1] == len(vectors)
+
+    def test_pads_when_probed_lists_are_small(self):
+        from ann_index import IVFIndex
+        vectors = np.eye(4, dtype=np.float32)
+        index = IVFIndex(vectors, n_lists=4, n_probe=1)
+        indices, scores = index.search(vectors[:1], k=3)
+        assert indices[0, 0] == 0
+        assert (indices[0, 1:] == -1).all()
+        assert np.isneginf(scores[0, 1:]).all()
+
+
+class TestBuildIndex:
+    def test_unknown_backend_raises(self, vectors):
+        from ann_index import build_index
+        with pytest.raises(ValueError):
+            build_index(vectors, backend="annoy")
+
+    def test_missing_optional_backend_falls_back(self, vectors):
+        from ann_index import build_index
+        try:
+            import hnswlib  # noqa: F401
+            pytest.skip("hnswlib installed")
+        except ImportError:
+            pass
+        assert build_index(vectors, backend="hnswlib").name == "ivf"
+
+    def test_embedding_store_uses_index(self, vectors):
+        from food2vec import EmbeddingStore
+        keys = [f"ingredient_{i}" for i in range(len(vectors))]
+        exact = EmbeddingStore(vectors, keys).most_similar_many(keys[:10], topn=5)
+        approx = EmbeddingStore(vectors, keys).build_index("ivf", n_probe=16)
+        assert approx.index is not None
+        results = approx.most_similar_many(keys[:10], topn=5)
+        for query, row, expected in zip(keys, results, exact):
+            assert query not in [name for name, _ in row]
+            assert len(row) == 5
+            overlap = {n for n, _ in row} & {n for n, _ in expected}
+            assert len(overlap) >= 4
@@ -96,3 +96,124 @@ class TestWebSocketEndpoint:
             data = json.loads(response)
             assert data["type"] == "error"
             assert "Unknown message type" in data["detail"]
+
+
+class TestReadyEndpoint:
+    def test_ready_when_warmup_disabled(self, client):
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["warmup"] == "disabled"
+
+    def test_not_ready_while_warming(self, client):
+        import server
+        service = MagicMock(warm=False)
+        service.warmup_status.return_value = {"food2vec": {"status": "loading", "seconds": None, "error": None}}
+        with patch.object(server, "ML_WARMUP", ["food2vec"]), \
+             patch.object(server, "CulinaryMLService", return_value=service):
+            response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["models"]["food2vec"]["status"] == "loading"
+
+    def test_ready_once_warm(self, client):
+        import server
+        service = MagicMock(warm=True)
+        service.warmup_status.return_value = {"food2vec": {"status": "ready", "seconds": 0.5, "error": None}}
+        with patch.object(server, "ML_WARMUP", ["food2vec"]), \
+             patch.object(server, "CulinaryMLService", return_value=service):
+            response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
+
+    def test_startup_starts_warmup(self, client):
+        import server
+        service = MagicMock(warm=True)
+        with patch.object(server, "ML_WARMUP", ["all"]), \
+             patch.object(server, "CulinaryMLService", return_value=service):
+            with TestClient(server.app):
+                pass
+        service.warmup.assert_called_once_with(None)
+
+    def test_websocket_refused_until_warm(self, client):
+        import server
+        from starlette.websockets import WebSocketDisconnect
+        service = MagicMock(warm=False)
+        with patch.object(server, "ML_WARMUP", ["food2vec"]), \
+             patch.object(server, "ML_REQUIRE_WARM", True), \
+             patch.object(server, "CulinaryMLService", return_value=service):
+            with client.websocket_connect("/ws/test-session") as ws:
+                data = json.loads(ws.receive_text())
+                assert data["type"] == "error"
+                assert "warming up" in data["detail"]
+                with pytest.raises(WebSocketDisconnect) as exc:
+                    ws.receive_text()
+                assert exc.value.code == 1013
+
+
+class TestConcurrentSessions:
+    """The chain runs off the event loop: sessions and /health don't queue."""
+
+    @pytest.fixture
+    def load_test(self, tmp_path):
+        import load_test
+        return load_test, tmp_path
+
+    def test_sessions_progress_concurrently(self, load_test):
+        import asyncio
+        harness, tmp_path = load_test
+        stub = harness.StubChain(llm_latency=0.1, steps=2)
+        server = harness.load_server(stub, str(tmp_path / "sessions"))
+
+        result = asyncio.run(harness.run_load(server.app, 8))
+
+        # Serialized, 8 turns x 2 blocking LLM calls would take 1.6 s
+        assert result["wall"] < 0.8
+        assert max(result["health"]) < 0.1
+        for i, received in enumerate(result["turns"]):
+            types = [message["type"] for _, message in received]
+            assert types == ["agent_event", "agent_event", "agent_response",
+                             "graph_update", "recipe_update"]
+            # Tools in the worker thread saw this session's ContextVars
+            response = received[2][1]["content"]
+            assert response.endswith(os.path.join(f"load-{i}", "recipe_graph.json"))
+
+    def test_turns_run_after_a_lifespan_ends(self, load_test):
+        import asyncio
+        harness, tmp_path = load_test
+        server = harness.load_server(harness.StubChain(llm_latency=0, steps=1), str(tmp_path / "sessions"))
+        for attempt in range(2):
+            with TestClient(server.app):
+                pass
+            received = asyncio.run(harness.websocket_turn(server.app, f"after-{attempt}"))
+            assert received[-1][1]["type"] == "recipe_update"
+
+    def test_chain_error_reaches_client(self, load_test):
+        import asyncio
+        harness, tmp_path = load_test
+        stub = MagicMock()
+        stub.stream.side_effect = RuntimeError("LLM unavailable")
+        server = harness.load_server(stub, str(tmp_path / "sessions"))
+
+        received = asyncio.run(harness.websocket_turn(server.app, "broken"))
+        assert received[-1][1]["type"] == "error"
+        assert "LLM unavailable" in received[-1][1]["detail"]
+
+    def test_overflow_turns_are_queued(self, load_test):
+        import asyncio
+        harness, tmp_path = load_test
+        server = harness.load_server(harness.StubChain(llm_latency=0.05, steps=1),
+                                     str(tmp_path / "sessions"))
+        server.turn_scheduler.max_concurrent = 2
+
+        result = asyncio.run(harness.run_load(server.app, 4))
+
+        queued = [[m["position"] for _, m in received if m["type"] == "queued"]
+                  for received in result["turns"]]
+        assert sum(1 for positions in queued if positions) == 2
+        for received in result["turns"]:
+            assert received[-1][1]["type"] == "recipe_update"
+
+        metrics = TestClient(server.app).get("/metrics").json()["turns"]
+        assert metrics["max_concurrent"] == 2
+        assert metrics["turns_completed"] == 4
+        assert metrics["max_queue_depth"] == 2
+        assert metrics["wait_ms"]["max"] > 0
@@ -0,0 +1,123 @@
+"""Tests for the async ML service facade."""
+
+import asyncio
+import os
+import sys
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'cauldron-app'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'research', 'phase7'))
+
+
+@pytest.fixture(autouse=True)
+def reset_singleton():
+    from ml_service import CulinaryMLService
+    CulinaryMLService.reset()
+    yield
+    CulinaryMLService.reset()
+
+
+def _facade(service, **kwargs):
+    from async_ml_service import AsyncCulinaryMLService
+    return AsyncCulinaryMLService(service, executor="thread", **kwargs)
+
+
+class TestAsyncCulinaryMLService:
+    def test_runs_calls_off_the_event_loop(self):
+        service = MagicMock()
+        callers = []
+
+        def suggest(ingredient, n=5):
+            callers.append(threading.current_thread().name)
+            return [{"name": "margarine", "score": 0.9, "source": "food2vec"}]
+
+        service.suggest_substitutions.side_effect = suggest
+        facade = _facade(service)
+        result = asyncio.run(facade.suggest_substitutions("butter", n=3))
+        facade.shutdown()
+
+        assert result[0]["name"] == "margarine"
+        service.suggest_substitutions.assert_called_once_with("butter", n=3)
+        assert callers[0].startswith("ml")
+
+    def test_batch_calls_use_their_own_executor(self):
+        service = MagicMock()
+        callers = []
+        service.score_affinity_many.side_effect = lambda pairs: callers.append(
+            threading.current_thread().name) or []
+        facade = _facade(service)
+        asyncio.run(facade.score_affinity_many([("a", "b")]))
+        facade.shutdown()
+        assert callers[0].startswith("ml-batch")
+
+    def test_coalesces_identical_concurrent_calls(self):
+        service = MagicMock()
+        release = threading.Event()
+
+        def slow(ing_a, ing_b):
+            release.wait(5)
+            return {"score": 0.5, "food2vec_score": 0.5, "source": "food2vec"}
+
+        service.score_affinity.side_effect = slow
+
+        async def scenario(facade):
+            calls = [asyncio.create_task(facade.score_affinity("garlic", "butter")) for _ in range(10)]
+            other = asyncio.create_task(facade.score_affinity("salt", "pepper"))
+            await asyncio.sleep(0.05)
+            release.set()
+            return await asyncio.gather(*calls), await other
+
+        facade = _facade(service)
+        results, _ = asyncio.run(scenario(facade))
+        facade.shutdown()
+
+        assert service.score_affinity.call_count == 2
+        assert facade.stats()["coalesced"] == 9
+        assert facade.stats()["in_flight"] == 0
+        # Each waiter gets its own copy
+        results[0]["score"] = 1.0
+        assert results[1]["score"] == 0.5
+
+    def test_loop_stays_responsive(self):
+        service = MagicMock()
+        release = threading.Event()
+        service.suggest_substitutions_many.side_effect = lambda *a, **k: release.wait(5) and []
+
+        async def scenario(facade):
+            heavy = asyncio.create_task(facade.suggest_substitutions_many(["butter"]))
+            # The loop keeps serving other coroutines while the batch runs
+            ticks = 0
+            for _ in range(5):
+                await asyncio.sleep(0.001)
+                ticks += 1
+            release.set()
+            await heavy
+            return ticks
+
+        facade = _facade(service)
+        assert asyncio.run(scenario(facade)) == 5
+        facade.shutdown()
+
+    def test_process_executor(self, tmp_path):
+        from async_ml_service import AsyncCulinaryMLService
+        from food2vec import EmbeddingStore
+        from ml_service import CulinaryMLService
+        vectors = np.array([[1, 0], [0.6, 0.8], [0, 1]], dtype=np.float32)
+        EmbeddingStore(vectors, ["butter", "margarine", "basil"]).save(tmp_path)
+
+        service = CulinaryMLService(models_dir=str(tmp_path))
+        facade = AsyncCulinaryMLService(service, executor="process", max_workers=1, batch_workers=1)
+        try:
+            result = asyncio.run(facade.score_affinity("butter", "margarine"))
+        finally:
+            facade.shutdown()
+        assert result["score"] == 0.6
+
+    def test_unknown_executor_raises(self):
+        from async_ml_service import AsyncCulinaryMLService
+        with pytest.raises(ValueError, match="Unknown executor"):
+            AsyncCulinaryMLService(MagicMock(), executor="gpu")
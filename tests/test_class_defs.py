@@ -242,6 +242,42 @@ class TestRecipeGraph:
         graph = RecipeGraph()
         assert graph.get_recipe() is None
 
+    def test_get_recipe_returns_isolated_copy(self, sample_graph, sample_recipe):
+        from class_defs import Ingredient
+        from pydantic import ValidationError
+        recipe = sample_graph.get_recipe()
+        assert recipe.model_dump() == sample_recipe.model_dump()
+        recipe.ingredients.append(Ingredient(name="salt", quantity=1, unit="tsp"))
+        recipe.instructions.append("Rest")
+        recipe.tags.append("changed")
+        # Ingredients are shared between copies, so they cannot change in place
+        with pytest.raises(ValidationError):
+            recipe.ingredients[0].quantity = 99
+        stored = sample_graph.get_recipe()
+        assert stored.model_dump() == sample_recipe.model_dump()
+        assert stored is not recipe
+
+    def test_update_modification_leaves_earlier_version(self, sample_graph, sample_update_modification):
+        from class_defs import ModsList
+        first = sample_graph.foundational_recipe_node
+        mods = ModsList()
+        mods.suggest_mod(sample_update_modification)
+        mod, success = mods.apply_mod(sample_graph)
+        assert success
+        assert sample_graph.get_foundational_recipe().ingredients[0].quantity == 3.0
+        assert sample_graph.get_recipe(first).ingredients[0].quantity == 2.0
+
+    def test_set_foundational_from_get_recipe(self, sample_graph, sample_recipe):
+        from class_defs import Recipe, Ingredient
+        first = sample_graph.foundational_recipe_node
+        node_id = sample_graph.add_node(Recipe(
+            name="V2", ingredients=[Ingredient(name="rye", quantity=1, unit="cup")],
+            instructions=["Mix"], tags=[], sources=[]))
+        sample_graph.foundational_recipe_node = first
+        # The copy keeps its node's ID, so it can be set as foundational again
+        sample_graph.set_foundational_recipe(sample_graph.get_recipe(node_id))
+        assert sample_graph.foundational_recipe_node == node_id
+
     def test_get_recipe_nonexistent_node(self, sample_graph):
         with pytest.raises(KeyError):
             sample_graph.get_recipe("nonexistent-node-id")
@@ -622,3 +658,240 @@ class TestFileIOErrors:
         loaded = load_pot_from_file(filepath)
         assert len(loaded.recipes) == 1
         assert len(loaded.urlList) == 1
+
+
+class TestGraphJournal:
+    def _recipe(self, name):
+        from class_defs import Recipe, Ingredient
+        return Recipe(name=name, ingredients=[Ingredient(name="flour", quantity=1, unit="cup")],
+                      instructions=["Mix"], tags=[], sources=[])
+
+    def _saved_graph(self, tmp_path, n_nodes):
+        from class_defs import RecipeGraph, save_graph_to_file, load_graph_from_file
+        filepath = str(tmp_path / f"graph_{n_nodes}.json")
+        graph = RecipeGraph()
+        graph.create_recipe_graph(self._recipe("V0"))
+        for i in range(1, n_nodes):
+            graph.add_node(self._recipe(f"V{i}"))
+        save_graph_to_file(graph, filepath)
+        return filepath, load_graph_from_file(filepath)
+
+    def test_save_appends_and_load_replays(self, tmp_path):
+        import os
+        from class_defs import save_graph_to_file, load_graph_from_file, graph_journal_file
+        filepath, graph = self._saved_graph(tmp_path, 2)
+        snapshot = open(filepath).read()
+
+        node_id = graph.add_node(self._recipe("V2"))
+        save_graph_to_file(graph, filepath)
+        assert open(filepath).read() == snapshot
+        assert os.path.exists(graph_journal_file(filepath))
+
+        loaded = load_graph_from_file(filepath)
+        assert loaded.get_graph_size() == 3
+        assert loaded.foundational_recipe_node == node_id
+        assert loaded.get_foundational_recipe().name == "V2"
+        assert loaded.get_graph().number_of_edges() == 2
+
+    def test_append_cost_independent_of_graph_size(self, tmp_path):
+        import os
+        from class_defs import save_graph_to_file, graph_journal_file
+        appended = []
+        for n_nodes in (40, 300):
+            filepath, graph = self._saved_graph(tmp_path, n_nodes)
+            graph.add_node(self._recipe("next"))
+            save_graph_to_file(graph, filepath)
+            appended.append(os.path.getsize(graph_journal_file(filepath)))
+        # Same record size; only the event numbers differ
+        assert appended[0] == appended[1]
+
+    def test_compaction(self, tmp_path, monkeypatch):
+        import os
+        import class_defs
+        monkeypatch.setattr(class_defs, "GRAPH_COMPACT_EVERY", 7)
+        filepath, graph = self._saved_graph(tmp_path, 1)
+        journal = class_defs.graph_journal_file(filepath)
+        for i in range(3):
+            graph.add_node(self._recipe(f"more{i}"))
+            class_defs.save_graph_to_file(graph, filepath)
+        # 3 events per node: the third save would pass 7 records
+        assert not os.path.exists(journal)
+        assert class_defs.load_graph_from_file(filepath).get_graph_size() == 4
+
+    def test_damaged_tail_is_discarded(self, tmp_path):
+        from class_defs import save_graph_to_file, load_graph_from_file, graph_journal_file
+        filepath, graph = self._saved_graph(tmp_path, 1)
+        graph.add_node(self._recipe("kept"))
+        save_graph_to_file(graph, filepath)
+        journal = graph_journal_file(filepath)
+        with open(journal, "a") as f:
+            f.write('{"seq": 99, "op": "add_no')
+
+        loaded = load_graph_from_file(filepath)
+        assert loaded.get_graph_size() == 2
+        assert open(journal).read().endswith("\n")
+        # Appends after recovery stay readable
+        loaded.add_node(self._recipe("after"))
+        save_graph_to_file(loaded, filepath)
+        assert load_graph_from_file(filepath).get_foundational_recipe().name == "after"
+
+    def test_records_already_in_snapshot_are_skipped(self, tmp_path):
+        import shutil
+        from class_defs import save_graph_to_file, load_graph_from_file, compact_graph_file, graph_journal_file
+        filepath, graph = self._saved_graph(tmp_path, 1)
+        graph.add_node(self._recipe("V1"))
+        save_graph_to_file(graph, filepath)
+        journal = graph_journal_file(filepath)
+        shutil.copy(journal, str(tmp_path / "old.journal"))
+        compact_graph_file(graph, filepath)
+        # Crash between writing the snapshot and removing the journal
+        shutil.copy(str(tmp_path / "old.journal"), journal)
+
+        loaded = load_graph_from_file(filepath)
+        assert loaded.get_graph_size() == 2
+        assert loaded.get_foundational_recipe().name == "V1"
+
+    def test_save_refuses_when_another_writer_saved(self, tmp_path):
+        from class_defs import save_graph_to_file, load_graph_from_file
+        filepath, first = self._saved_graph(tmp_path, 1)
+        second = load_graph_from_file(filepath)
+        first.add_node(self._recipe("first"))
+        save_graph_to_file(first, filepath)
+
+        second.add_node(self._recipe("second"))
+        with pytest.raises(RuntimeError, match="another writer"):
+            save_graph_to_file(second, filepath)
+        # The first writer keeps appending
+        first.add_node(self._recipe("again"))
+        save_graph_to_file(first, filepath)
+        assert load_graph_from_file(filepath).get_graph_size() == 3
+
+    def test_skipped_record_missing_from_snapshot_is_logged(self, tmp_path):
+        from unittest.mock import patch
+        from class_defs import load_graph_from_file, compact_graph_file, graph_journal_file
+        filepath, graph = self._saved_graph(tmp_path, 1)
+        graph.add_node(self._recipe("V1"))
+        compact_graph_file(graph, filepath)
+        with open(graph_journal_file(filepath), "w") as f:
+            f.write(json.dumps({"seq": 1, "op": "add_node", "node_id": "lost", "recipe": None}) + "\n")
+
+        with patch("class_defs.logger.warning") as warning:
+            loaded = load_graph_from_file(filepath)
+        assert "lost" not in loaded.get_graph()
+        assert "Skipping journal record 1" in warning.call_args[0][0]
+
+    def test_fresh_graph_drops_old_journal(self, tmp_path):
+        import os
+        from class_defs import fresh_graph, load_graph_from_file, save_graph_to_file, graph_journal_file
+        filepath, graph = self._saved_graph(tmp_path, 1)
+        graph.add_node(self._recipe("V1"))
+        save_graph_to_file(graph, filepath)
+        fresh_graph(filepath)
+        assert not os.path.exists(graph_journal_file(filepath))
+        assert load_graph_from_file(filepath).get_graph_size() == 0
+
+
+class TestRecipeVersionStorage:
+    def _long_session(self, n_versions):
+        """A graph where each version swaps one ingredient of its parent."""
+        from class_defs import Recipe, Ingredient, RecipeGraph
+        graph = RecipeGraph()
+        graph.create_recipe_graph(Recipe(
+            name="Loaf",
+            ingredients=[Ingredient(name=f"ing{i}", quantity=i + 1, unit="g") for i in range(50)],
+            instructions=[f"Step {i}: fold and rest" for i in range(40)],
+            tags=["bread"], sources=[]))
+        for k in range(n_versions):
+            recipe = graph.get_foundational_recipe()
+            recipe.new_ID()
+            recipe.ingredients[k % 50] = Ingredient(name=f"swap{k}", quantity=k, unit="g")
+            if k % 10 == 0:
+                recipe.instructions.append(f"Extra step {k}")
+            graph.add_node(recipe)
+        return graph
+
+    @staticmethod
+    def _recipes(graph):
+        return {n: d["recipe"].model_dump() for n, d in graph.get_graph().nodes(data=True)}
+
+    def test_delta_roundtrip(self):
+        from class_defs import Recipe, Ingredient
+        base = Recipe(name="A", ingredients=[Ingredient(name="flour", quantity=1, unit="cup"),
+                                             Ingredient(name="salt", quantity=1, unit="tsp")],
+                      instructions=["Mix", "Bake"], tags=["t"], sources=[])
+        new = base.clone()
+        new.name = "B"
+        new.ingredients[1] = Ingredient(name="sugar", quantity=2, unit="tbsp")
+        new.instructions.insert(1, "Rest")
+        new.tags = None
+        delta = json.loads(json.dumps(new.delta_from(base)))
+        assert "sources" not in delta
+
+        rebuilt = base.apply_delta(delta)
+        assert rebuilt.model_dump() == new.model_dump()
+        assert rebuilt.get_ID() != base.get_ID()
+        assert rebuilt.ingredients[0] is base.ingredients[0]
+
+    def test_versions_share_ingredients(self, tmp_path):
+        from class_defs import RecipeGraph
+        graph = self._long_session(300)
+        for loaded in (graph, RecipeGraph.from_dict(json.loads(json.dumps(graph.to_dict(deltas=True))))):
+            distinct = {id(ing) for _, d in loaded.get_graph().nodes(data=True) for ing in d["recipe"].ingredients}
+            # The original 50 plus one per change, not 301 x 50
+            assert len(distinct) == 350
+
+    def test_storage_scales_with_changes(self):
+        graph = self._long_session(300)
+        full = len(json.dumps(graph.to_dict()))
+        compact = len(json.dumps(graph.to_dict(deltas=True)))
+        assert compact * 5 < full
+
+    def test_delta_chains_are_bounded(self, monkeypatch):
+        import class_defs
+        monkeypatch.setattr(class_defs, "RECIPE_CHECKPOINT_EVERY", 8)
+        graph = self._long_session(40)
+        nodes = graph.to_dict(deltas=True)["nodes"]
+        base_of = {n["node_id"]: n.get("base") for n in nodes}
+        assert sum("recipe" in n for n in nodes) == 6
+        for node_id in base_of:
+            chain = 0
+            while base_of[node_id]:
+                node_id, chain = base_of[node_id], chain + 1
+            assert chain < 8
+
+    def test_delta_snapshot_loads_identically(self, tmp_path):
+        from class_defs import RecipeGraph, compact_graph_file, load_graph_from_file
+        graph = self._long_session(60)
+        filepath = str(tmp_path / "graph.json")
+        compact_graph_file(graph, filepath)
+        loaded = load_graph_from_file(filepath)
+        assert self._recipes(loaded) == self._recipes(graph)
+        assert loaded.foundational_recipe_node == graph.foundational_recipe_node
+        # Node order in the file does not matter
+        data = graph.to_dict(deltas=True)
+        data["nodes"].reverse()
+        assert self._recipes(RecipeGraph.from_dict(data)) == self._recipes(graph)
+
+    def test_journal_records_deltas(self, tmp_path):
+        from class_defs import save_graph_to_file, load_graph_from_file, graph_journal_file
+        graph = self._long_session(3)
+        filepath = str(tmp_path / "graph.json")
+        save_graph_to_file(graph, filepath)
+        loaded = load_graph_from_file(filepath)
+        recipe = loaded.get_foundational_recipe()
+        recipe.new_ID()
+        recipe.ingredients[0] = recipe.ingredients[0].model_copy(update={"quantity": 99})
+        loaded.add_node(recipe)
+        save_graph_to_file(loaded, filepath)
+
+        with open(graph_journal_file(filepath)) as f:
+            added = [r for r in map(json.loads, f) if r["op"] == "add_node"][-1]
+        assert "recipe" not in added and added["base"]
+        assert self._recipes(load_graph_from_file(filepath)) == self._recipes(loaded)
+
+    def test_full_snapshot_still_loads(self, tmp_path):
+        from class_defs import load_graph_from_file
+        graph = self._long_session(5)
+        filepath = tmp_path / "legacy.json"
+        filepath.write_text(json.dumps(graph.to_dict()))
+        assert self._recipes(load_graph_from_file(str(filepath))) == self._recipes(graph)
@@ -156,11 +156,11 @@ class TestMLServiceExplainPairing:
             "tomato": {"descriptors": ["sweet", "green"], "compounds_with_profiles": {"linalool": ["floral"]}},
             "basil": {"descriptors": ["sweet", "herbal"], "compounds_with_profiles": {"linalool": ["floral"]}},
         }
-        service._flavor_profiles = FlavorProfileAffinity(profiles)
+        service._models.flavor_profiles = FlavorProfileAffinity(profiles)
 
         mock_f2v = MagicMock()
         mock_f2v.similarity.return_value = 0.65
-        service._food2vec = mock_f2v
+        service._models.food2vec = mock_f2v
 
         with patch.object(service, '_normalize', side_effect=lambda x: x.lower()):
             result = service.explain_pairing("tomato", "basil")
@@ -4,11 +4,25 @@ import sys
 import os
 import json
 import pytest
+import numpy as np
 from pathlib import Path
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'research', 'phase7'))
 
 
+class _BatchMock:
+    """Mock model base: CombinedAffinity calls the pairwise and batch scoring API."""
+
+    def similarity(self, a, b):
+        return dict(self.similar_ingredients(a, topn=50)).get(b, 0.0)
+
+    def similarity_many(self, pairs):
+        return np.array([self.similarity(a, b) for a, b in pairs])
+
+    def similarity_matrix(self, names):
+        return np.array([[self.similarity(a, b) for b in names] for a in names])
+
+
 class TestCompoundAffinity:
     @pytest.fixture
     def sample_flavordb(self):
@@ -71,17 +85,55 @@ class TestCompoundAffinity:
         ca = CompoundAffinity(sample_flavordb)
         assert ca.coverage == 5
 
+    def test_shared_compounds_sorted_and_unknown(self, sample_flavordb):
+        from affinity_models import CompoundAffinity
+        ca = CompoundAffinity(sample_flavordb)
+        assert ca.shared_compounds("tomato", "basil") == ["eugenol", "geraniol", "linalool"]
+        assert ca.shared_compounds("unicorn", "basil") == []
+
+    def test_overlap_many_matches_pairwise(self, sample_flavordb):
+        from affinity_models import CompoundAffinity
+        ca = CompoundAffinity(sample_flavordb)
+        pairs = [("tomato", "basil"), ("garlic", "chocolate"),
+                 ("cinnamon", "cinnamon"), ("unicorn", "basil")]
+        np.testing.assert_allclose(ca.overlap_many(pairs), [ca.overlap(a, b) for a, b in pairs])
+        assert len(ca.overlap_many([])) == 0
+
+    def test_overlap_matrix_matches_pairwise(self, sample_flavordb):
+        from affinity_models import CompoundAffinity
+        ca = CompoundAffinity(sample_flavordb)
+        matrix = ca.overlap_matrix(["basil", "unicorn"])
+        names = list(sample_flavordb)
+        np.testing.assert_allclose(matrix[0], [ca.overlap("basil", n) for n in names])
+        assert not matrix[1].any()
+
+    def test_matches_set_based_reference(self):
+        """Differential check against the set-based compound_overlap_score."""
+        from affinity_models import CompoundAffinity
+        from data_pipeline import compound_overlap_score
+        rng = np.random.default_rng(0)
+        compounds = [f"c{i}" for i in range(60)]
+        flavordb = {f"ing{i}": list(rng.choice(compounds, size=rng.integers(0, 12)))
+                    for i in range(80)}
+        ca = CompoundAffinity(flavordb)
+
+        for ing in list(flavordb)[:20]:
+            expected = [(o, compound_overlap_score(ing, o, flavordb))
+                        for o in flavordb if o != ing]
+            expected = sorted([e for e in expected if e[1] > 0], key=lambda x: -x[1])[:10]
+            assert ca.most_similar(ing, topn=10) == expected
+
 
 class TestCombinedAffinityWithCompounds:
     def test_three_signal_blend(self):
         from affinity_models import CompoundAffinity, CombinedAffinity
 
-        class MockF2V:
+        class MockF2V(_BatchMock):
             def similarity(self, a, b): return 0.8
             def most_similar(self, ing, topn=10):
                 return [("butter", 0.8)]
 
-        class MockCF:
+        class MockCF(_BatchMock):
             def similar_ingredients(self, ing, topn=10):
                 return [("butter", 0.7)]
 
@@ -96,11 +148,11 @@ class TestCombinedAffinityWithCompounds:
     def test_without_compounds_redistributes_weight(self):
         from affinity_models import CombinedAffinity
 
-        class MockF2V:
+        class MockF2V(_BatchMock):
             def similarity(self, a, b): return 0.8
             def most_similar(self, ing, topn=10): return [("b", 0.8)]
 
-        class MockCF:
+        class MockCF(_BatchMock):
             def similar_ingredients(self, ing, topn=10): return [("b", 0.6)]
 
         combined = CombinedAffinity(MockF2V(), MockCF(), None, alpha=0.4, beta=0.4, gamma=0.2)
@@ -112,12 +164,12 @@ class TestCombinedAffinityWithCompounds:
     def test_top_affinities_includes_compound_candidates(self):
         from affinity_models import CompoundAffinity, CombinedAffinity
 
-        class MockF2V:
+        class MockF2V(_BatchMock):
             def similarity(self, a, b): return 0.5
             def most_similar(self, ing, topn=10):
                 return [("a", 0.9)]
 
-        class MockCF:
+        class MockCF(_BatchMock):
             def similar_ingredients(self, ing, topn=10):
                 return [("b", 0.8)]
 
@@ -1,8 +1,10 @@
 """Tests for the production ML service layer."""
 
 import sys
+import json
 import os
 import pytest
+import numpy as np
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 
@@ -63,8 +65,8 @@ class TestSuggestSubstitutions:
         mock_model.most_similar.return_value = [
             ("margarine", 0.93), ("oleo", 0.77), ("shortening", 0.55)
         ]
-        service._food2vec = mock_model
-        service._canonical_map = MagicMock()
+        service._models.food2vec = mock_model
+        service._models.canonical_map = MagicMock()
 
         with patch.object(service, '_normalize', return_value='butter'):
             results = service.suggest_substitutions("butter", n=3)
@@ -83,7 +85,7 @@ class TestSuggestSubstitutions:
     def test_returns_empty_when_no_model(self):
         from ml_service import CulinaryMLService
         service = CulinaryMLService()
-        service._food2vec = None
+        service._models.food2vec = None
         # Force _load_food2vec to return None
         with patch.object(service, '_load_food2vec', return_value=None):
             assert service.suggest_substitutions("butter") == []
@@ -93,7 +95,7 @@ class TestSuggestSubstitutions:
         service = CulinaryMLService()
         mock_model = MagicMock()
         mock_model.most_similar.return_value = []
-        service._food2vec = mock_model
+        service._models.food2vec = mock_model
 
         with patch.object(service, '_normalize', return_value=''):
             results = service.suggest_substitutions("xyzzy")
@@ -109,7 +111,7 @@ class TestCompleteRecipe:
         mock_cf.suggest_ingredients.return_value = [
             ("flour", 0.96), ("vanilla", 0.89), ("eggs", 0.84)
         ]
-        service._cf = mock_cf
+        service._models.cf = mock_cf
 
         with patch.object(service, '_normalize', side_effect=lambda x: x.lower()):
             results = service.complete_recipe(["chocolate", "butter", "sugar"], n=3)
@@ -128,13 +130,163 @@ class TestCompleteRecipe:
         from ml_service import CulinaryMLService
         service = CulinaryMLService()
         mock_cf = MagicMock()
-        service._cf = mock_cf
+        service._models.cf = mock_cf
 
         with patch.object(service, '_normalize', return_value=''):
             results = service.complete_recipe([])
         assert results == []
 
 
+class TestLoadCF:
+    def test_loads_saved_neighbor_table(self, tmp_path):
+        from ml_service import CulinaryMLService
+        from data_pipeline import IngredientVocab, build_recipe_ingredient_matrix
+        from affinity_models import IngredientCF
+
+        recipes = [
+            {"ingredients": ["garlic", "butter", "parsley"]},
+            {"ingredients": ["garlic", "olive oil", "basil"]},
+            {"ingredients": ["butter", "flour", "sugar"]},
+        ] * 5
+        vocab = IngredientVocab(min_count=2).fit(recipes)
+        vocab.save(tmp_path / "vocab.json")
+        matrix = build_recipe_ingredient_matrix(recipes, vocab)
+        IngredientCF(n_neighbors=3).fit(matrix, vocab).save_neighbors(tmp_path)
+
+        service = CulinaryMLService(models_dir=str(tmp_path))
+        cf = service._load_cf()
+        assert cf is not None
+        assert cf._matrix is None  # served from the table, no refit
+        assert len(cf.similar_ingredients("garlic", topn=3)) == 3
+
+
+class TestLoadFood2Vec:
+    def test_prefers_embedding_store(self, tmp_path):
+        from ml_service import CulinaryMLService
+        from food2vec import EmbeddingStore
+
+        vectors = np.eye(3, dtype=np.float32)
+        vectors[1] = [0.6, 0.8, 0.0]
+        EmbeddingStore(vectors, ["butter", "margarine", "basil"]).save(tmp_path)
+
+        service = CulinaryMLService(models_dir=str(tmp_path))
+        assert service.available
+        model = service._load_food2vec()
+        assert isinstance(model, EmbeddingStore)
+        with patch.object(service, '_normalize', side_effect=lambda x: x.lower()):
+            results = service.suggest_substitutions("butter", n=1)
+        assert results == [{"name": "margarine", "score": 0.6, "source": "food2vec"}]
+
+    def test_builds_selected_ann_index(self, tmp_path):
+        from ml_service import CulinaryMLService
+        from food2vec import EmbeddingStore
+
+        vectors = np.eye(3, dtype=np.float32)
+        EmbeddingStore(vectors, ["butter", "margarine", "basil"]).save(tmp_path)
+
+        service = CulinaryMLService(models_dir=str(tmp_path), ann_backend="ivf")
+        model = service._load_food2vec()
+        assert model.index is not None
+        assert model.index.name == "ivf"
+
+    def test_unknown_ann_backend_rejected_at_construction(self, tmp_path):
+        from ml_service import CulinaryMLService
+        with pytest.raises(ValueError, match="Unknown ANN backend"):
+            CulinaryMLService(models_dir=str(tmp_path), ann_backend="annoy")
+
+
+class TestLoadTechniques:
+    def test_loads_saved_artifact(self, tmp_path):
+        from affinity_models import TechniqueIndex
+        from ml_service import CulinaryMLService
+        recipes = [
+            {"ingredients": ["garlic", "butter"], "directions": "Saute the garlic in butter."},
+            {"ingredients": ["garlic"], "directions": "Roast the garlic, then saute."},
+        ]
+        TechniqueIndex.from_recipes(recipes).save(tmp_path)
+
+        service = CulinaryMLService(models_dir=str(tmp_path))
+        with patch.object(service, '_normalize', side_effect=lambda x: x.lower()):
+            results = service.suggest_techniques("garlic", n=2)
+        assert results == [
+            {"technique": "saute", "score": 0.6667, "source": "technique_cooccurrence"},
+            {"technique": "roast", "score": 0.3333, "source": "technique_cooccurrence"},
+        ]
+
+    def test_falls_back_to_recipes_meta(self, tmp_path):
+        from ml_service import CulinaryMLService
+        with open(tmp_path / "recipes_meta.json", "w") as f:
+            json.dump([{"ingredients": ["garlic"], "directions": "Grill it."}], f)
+
+        service = CulinaryMLService(models_dir=str(tmp_path))
+        assert service._load_technique_data().top_techniques("garlic") == [("grill", 1.0)]
+
+    def test_no_data_returns_empty(self, tmp_path):
+        from ml_service import CulinaryMLService
+        service = CulinaryMLService(models_dir=str(tmp_path))
+        assert service.suggest_techniques("garlic") == []
+
+
+class TestWarmup:
+    def test_reports_status_per_model(self, tmp_path):
+        from ml_service import CulinaryMLService
+        from food2vec import EmbeddingStore
+        EmbeddingStore(np.eye(2, dtype=np.float32), ["butter", "basil"]).save(tmp_path)
+
+        service = CulinaryMLService(models_dir=str(tmp_path))
+        status = service.warmup(["food2vec", "cf", "techniques"], wait=True)
+        assert service.warm
+        assert status["food2vec"]["status"] == "ready"
+        assert status["cf"]["status"] == "unavailable"
+        assert status["techniques"]["status"] == "ready"
+        assert all(entry["seconds"] is not None for entry in status.values())
+        assert service._models.food2vec is not None
+
+    def test_loads_in_parallel(self, tmp_path):
+        import threading
+        import time
+        from ml_service import CulinaryMLService
+        service = CulinaryMLService(models_dir=str(tmp_path))
+        release = threading.Event()
+
+        def slow_load():
+            release.wait(5)
+            return object()
+
+        with patch.object(service, '_load_food2vec', side_effect=slow_load), \
+             patch.object(service, '_load_cf', side_effect=slow_load):
+            service.warmup(["food2vec", "cf"])
+            time.sleep(0.05)
+            assert not service.warm
+            assert {e["status"] for e in service.warmup_status().values()} == {"loading"}
+            release.set()
+            deadline = time.time() + 5
+            while not service.warm and time.time() < deadline:
+                time.sleep(0.01)
+        assert service.warm
+
+    def test_failure_is_reported(self, tmp_path):
+        from ml_service import CulinaryMLService
+        service = CulinaryMLService(models_dir=str(tmp_path))
+        with patch.object(service, '_load_cf', side_effect=RuntimeError("corrupt npz")):
+            status = service.warmup(["cf"], wait=True)
+        assert status["cf"]["status"] == "failed"
+        assert "corrupt npz" in status["cf"]["error"]
+        assert service.warm
+
+    def test_unknown_model_raises(self):
+        from ml_service import CulinaryMLService
+        with pytest.raises(ValueError, match="Unknown models"):
+            CulinaryMLService().warmup(["gpt"])
+
+    def test_disabled_is_noop(self):
+        from ml_service import CulinaryMLService
+        service = CulinaryMLService()
+        service._enabled = False
+        assert service.warmup() == {}
+        assert service.warm
+
+
 class TestScoreAffinity:
     def test_returns_score_dict(self):
         from ml_service import CulinaryMLService
@@ -142,7 +294,7 @@ class TestScoreAffinity:
 
         mock_model = MagicMock()
         mock_model.similarity.return_value = 0.73
-        service._food2vec = mock_model
+        service._models.food2vec = mock_model
 
         with patch.object(service, '_normalize', side_effect=lambda x: x.lower()):
             result = service.score_affinity("garlic", "butter")
@@ -162,13 +314,74 @@ class TestScoreAffinity:
         from ml_service import CulinaryMLService
         service = CulinaryMLService()
         mock_model = MagicMock()
-        service._food2vec = mock_model
+        service._models.food2vec = mock_model
 
         with patch.object(service, '_normalize', return_value=''):
             result = service.score_affinity("garlic", "xyzzy")
         assert result["source"] == "unknown_ingredient"
 
 
+class TestBatchAPI:
+    def test_score_affinity_many(self):
+        import numpy as np
+        from ml_service import CulinaryMLService
+        service = CulinaryMLService()
+
+        mock_model = MagicMock()
+        mock_model.similarity_many.return_value = np.array([0.73, 0.41])
+        service._models.food2vec = mock_model
+
+        normalize = lambda xs: ["" if x == "xyzzy" else x.lower() for x in xs]
+        with patch.object(service, '_normalize_many', side_effect=normalize):
+            results = service.score_affinity_many(
+                [("Garlic", "butter"), ("garlic", "xyzzy"), ("salt", "pepper")]
+            )
+
+        mock_model.similarity_many.assert_called_once_with(
+            [("garlic", "butter"), ("salt", "pepper")]
+        )
+        assert results[0] == {"score": 0.73, "food2vec_score": 0.73, "source": "food2vec"}
+        assert results[1]["source"] == "unknown_ingredient"
+        assert results[2]["score"] == 0.41
+
+    def test_suggest_substitutions_many(self):
+        from ml_service import CulinaryMLService
+        service = CulinaryMLService()
+
+        mock_model = MagicMock()
+        mock_model.most_similar_many.return_value = [[("margarine", 0.93)], [("shallot", 0.8)]]
+        service._models.food2vec = mock_model
+
+        with patch.object(service, '_normalize_many', return_value=["butter", "", "onion"]):
+            results = service.suggest_substitutions_many(["butter", "xyzzy", "onion"], n=1)
+
+        assert results[0] == [{"name": "margarine", "score": 0.93, "source": "food2vec"}]
+        assert results[1] == []
+        assert results[2][0]["name"] == "shallot"
+
+    def test_suggest_techniques_many(self):
+        from affinity_models import TechniqueIndex
+        from ml_service import CulinaryMLService
+        service = CulinaryMLService()
+        service._models.techniques = TechniqueIndex.from_counts({"garlic": {"saute": 3, "roast": 1}})
+
+        with patch.object(service, '_normalize_many', return_value=["garlic", "xyzzy"]):
+            results = service.suggest_techniques_many(["garlic", "xyzzy"], n=1)
+
+        assert results == [
+            [{"technique": "saute", "score": 0.75, "source": "technique_cooccurrence"}],
+            [],
+        ]
+
+    def test_batch_disabled(self):
+        from ml_service import CulinaryMLService
+        service = CulinaryMLService()
+        service._enabled = False
+        assert service.suggest_substitutions_many(["a", "b"]) == [[], []]
+        assert service.score_affinity_many([("a", "b")])[0]["source"] == "unavailable"
+        assert service.explain_pairing_many([("a", "b")]) == [{"error": "ML features disabled"}]
+
+
 class TestIntegrationWithRealModels:
     """Integration tests that run only when model files exist."""
 
@@ -202,3 +415,167 @@ class TestIntegrationWithRealModels:
         service = CulinaryMLService(models_dir=str(models_dir))
         result = service.score_affinity("garlic", "butter")
         assert result["score"] > 0
+
+
+class TestHotReload:
+    @staticmethod
+    def _publish(registry, tmp_path, version, vectors):
+        from food2vec import EmbeddingStore
+        build = tmp_path / f"build-{version}"
+        build.mkdir()
+        EmbeddingStore(np.asarray(vectors, dtype=np.float32), ["butter", "margarine", "basil"]).save(build)
+        return registry.publish(build, version=version)
+
+    def test_serves_latest_version(self, tmp_path):
+        from ml_service import CulinaryMLService
+        from model_registry import ModelRegistry
+        registry = ModelRegistry(tmp_path / "models")
+        self._publish(registry, tmp_path, "v1", np.eye(3))
+        self._publish(registry, tmp_path, "v2", np.eye(3))
+
+        service = CulinaryMLService(models_dir=str(registry.root))
+        assert service.version == "v2"
+        assert service.available
+        assert not service.reload()
+
+    def test_reload_swaps_warm_models(self, tmp_path):
+        from ml_service import CulinaryMLService
+        from model_registry import ModelRegistry
+        import gc
+        registry = ModelRegistry(tmp_path / "models")
+        self._publish(registry, tmp_path, "v1", np.eye(3))
+        service = CulinaryMLService(models_dir=str(registry.root))
+        with patch.object(service, '_normalize', side_effect=lambda x: x):
+            assert service.score_affinity("butter", "margarine")["score"] == 0.0
+
+            self._publish(registry, tmp_path, "v2", [[1, 0, 0], [0.6, 0.8, 0], [0, 0, 1]])
+            assert service.reload()
+            assert service.version == "v2"
+            # food2vec was in use on v1, so v2 comes up with it preloaded
+            assert service._models.loaded() == ["food2vec"]
+            assert service.score_affinity("butter", "margarine")["score"] == 0.6
+
+        gc.collect()
+        assert service.retired_versions == []
+
+    def test_in_flight_call_finishes_on_old_version(self, tmp_path):
+        from ml_service import CulinaryMLService
+        from model_registry import ModelRegistry
+        registry = ModelRegistry(tmp_path / "models")
+        self._publish(registry, tmp_path, "v1", np.eye(3))
+        service = CulinaryMLService(models_dir=str(registry.root))
+        old_model = service._load_food2vec()
+        seen = []
+
+        def normalize_and_reload(name):
+            # A reload lands between the call's first load and its next one
+            if not seen:
+                self._publish(registry, tmp_path, "v2", np.eye(3))
+                assert service.reload()
+            seen.append(service._load_food2vec())
+            return name
+
+        with patch.object(service, '_normalize', side_effect=normalize_and_reload):
+            service.score_affinity("butter", "basil")
+        assert all(model is old_model for model in seen)
+        assert service._load_food2vec() is not old_model
+
+    def test_failed_version_keeps_serving_old(self, tmp_path):
+        from ml_service import CulinaryMLService
+        from model_registry import ModelRegistry
+        registry = ModelRegistry(tmp_path / "models")
+        self._publish(registry, tmp_path, "v1", np.eye(3))
+        service = CulinaryMLService(models_dir=str(registry.root))
+        service._load_food2vec()
+        self._publish(registry, tmp_path, "v2", np.eye(3))
+
+        with patch.object(service, '_load_food2vec', side_effect=OSError("bad file")):
+            assert not service.reload()
+        assert service.version == "v1"
+        # Not retried on every poll
+        assert not service.reload()
+
+    def test_watcher_picks_up_new_version(self, tmp_path):
+        import time
+        from ml_service import CulinaryMLService
+        from model_registry import ModelRegistry
+        registry = ModelRegistry(tmp_path / "models")
+        self._publish(registry, tmp_path, "v1", np.eye(3))
+        service = CulinaryMLService(models_dir=str(registry.root))
+        service.start_watching(interval=0.01)
+        try:
+            self._publish(registry, tmp_path, "v2", np.eye(3))
+            deadline = time.time() + 5
+            while service.version != "v2" and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            service.stop_watching()
+        assert service.version == "v2"
+
+
+class TestResultCaching:
+    @staticmethod
+    def _service():
+        from ml_service import CulinaryMLService
+        service = CulinaryMLService()
+        model = MagicMock()
+        model.most_similar.return_value = [("margarine", 0.93)]
+        model.similarity.return_value = 0.5
+        model.similarity_many.side_effect = lambda pairs: np.full(len(pairs), 0.5)
+        service._models.food2vec = model
+        return service, model
+
+    def test_repeat_queries_hit_cache(self):
+        service, model = self._service()
+        with patch.object(service, '_normalize', side_effect=lambda x: x.lower()):
+            first = service.suggest_substitutions("Butter", n=3)
+            second = service.suggest_substitutions("butter", n=3)
+            service.suggest_substitutions("butter", n=5)
+        assert first == second
+        assert model.most_similar.call_count == 2  # n is part of the key
+        stats = service.cache_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+
+    def test_score_affinity_is_symmetric(self):
+        service, model = self._service()
+        with patch.object(service, '_normalize', side_effect=lambda x: x):
+            service.score_affinity("garlic", "butter")
+            service.score_affinity("butter", "garlic")
+            results = service.score_affinity_many([("garlic", "butter"), ("butter", "salt")])
+        assert model.similarity.call_count == 1
+        model.similarity_many.assert_called_once_with([("butter", "salt")])
+        assert results[0]["score"] == 0.5
+
+    def test_cached_results_are_copies(self):
+        service, _ = self._service()
+        with patch.object(service, '_normalize', side_effect=lambda x: x):
+            service.suggest_substitutions("butter")[0]["name"] = "mutated"
+            assert service.suggest_substitutions("butter")[0]["name"] == "margarine"
+
+    def test_unavailable_results_not_cached(self):
+        from ml_service import CulinaryMLService
+        service = CulinaryMLService()
+        with patch.object(service, '_load_food2vec', return_value=None):
+            assert service.suggest_substitutions("butter") == []
+        assert service.cache_stats()["misses"] == 0
+
+    def test_reload_invalidates(self, tmp_path):
+        from ml_service import CulinaryMLService
+        from model_registry import ModelRegistry
+        from food2vec import EmbeddingStore
+        registry = ModelRegistry(tmp_path / "models")
+
+        def publish(version, vectors):
+            build = tmp_path / version
+            build.mkdir()
+            EmbeddingStore(np.asarray(vectors, dtype=np.float32), ["butter", "margarine"]).save(build)
+            registry.publish(build, version=version)
+
+        publish("v1", np.eye(2))
+        service = CulinaryMLService(models_dir=str(registry.root))
+        with patch.object(service, '_normalize', side_effect=lambda x: x):
+            assert service.score_affinity("butter", "margarine")["score"] == 0.0
+            publish("v2", [[1, 0], [0.6, 0.8]])
+            service.reload()
+            assert len(service._cache) == 0
+            assert service.score_affinity("butter", "margarine")["score"] == 0.6
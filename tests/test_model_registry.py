@@ -0,0 +1,66 @@
+"""Tests for the versioned model registry."""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'cauldron-app'))
+
+from model_registry import MANIFEST, UNVERSIONED, ModelRegistry
+
+
+@pytest.fixture
+def artifacts(tmp_path):
+    source = tmp_path / "build"
+    source.mkdir()
+    (source / "vocab.json").write_text('{"ingredients": []}')
+    (source / "food2vec_vectors.npy").write_bytes(b"\x00" * 64)
+    return source
+
+
+class TestModelRegistry:
+    def test_flat_directory_is_unversioned(self, tmp_path):
+        registry = ModelRegistry(tmp_path)
+        assert registry.versions() == []
+        resolved = registry.resolve()
+        assert resolved.version == UNVERSIONED
+        assert resolved.path == tmp_path
+
+    def test_publish_and_resolve_latest(self, tmp_path, artifacts):
+        registry = ModelRegistry(tmp_path / "models")
+        registry.publish(artifacts, version="v1")
+        v2 = registry.publish(artifacts, version="v2")
+
+        assert [v.version for v in registry.versions()] == ["v1", "v2"]
+        assert registry.resolve() == v2
+        assert (v2.path / "vocab.json").exists()
+        manifest = json.loads((v2.path / MANIFEST).read_text())
+        assert manifest["files"] == {"food2vec_vectors.npy": 64, "vocab.json": 19}
+
+    def test_publish_refuses_existing_version(self, tmp_path, artifacts):
+        registry = ModelRegistry(tmp_path)
+        registry.publish(artifacts, version="v1")
+        with pytest.raises(FileExistsError):
+            registry.publish(artifacts, version="v1")
+
+    def test_ignores_incomplete_versions(self, tmp_path, artifacts):
+        registry = ModelRegistry(tmp_path)
+        v1 = registry.publish(artifacts, version="v1")
+        # Still being copied: no manifest yet
+        (tmp_path / "v2").mkdir()
+        (tmp_path / "v2" / "vocab.json").write_text("{}")
+        # Truncated artifact
+        v3 = registry.publish(artifacts, version="v3")
+        (v3.path / "food2vec_vectors.npy").write_bytes(b"\x00")
+
+        assert registry.resolve() == v1
+
+    def test_prune_keeps_newest_and_in_use(self, tmp_path, artifacts):
+        registry = ModelRegistry(tmp_path)
+        for version in ("v1", "v2", "v3", "v4"):
+            registry.publish(artifacts, version=version)
+        removed = registry.prune(keep=2, in_use=["v1"])
+        assert removed == ["v2"]
+        assert [v.version for v in registry.versions()] == ["v1", "v3", "v4"]
@@ -9,6 +9,19 @@ import numpy as np
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'research', 'phase7'))
 
 
+class _BatchMock:
+    """Mock model base: CombinedAffinity calls the pairwise and batch scoring API."""
+
+    def similarity(self, a, b):
+        return dict(self.similar_ingredients(a, topn=50)).get(b, 0.0)
+
+    def similarity_many(self, pairs):
+        return np.array([self.similarity(a, b) for a, b in pairs])
+
+    def similarity_matrix(self, names):
+        return np.array([[self.similarity(a, b) for b in names] for a in names])
+
+
 # ── Ingredient normalization ─────────────────────────────────────────────
 
 class TestNormalizeIngredient:
@@ -56,6 +69,55 @@ class TestNormalizeIngredient:
         assert result == ""
 
 
+def _reference_normalize(raw: str) -> str:
+    """The original step-by-step normalizer, kept as a differential oracle."""
+    import re
+    from data_pipeline import FRACTIONS, UNITS
+    text = raw.lower().strip()
+    text = re.sub(r"\(.*?\)", "", text)
+    for frac in FRACTIONS:
+        text = text.replace(frac, "")
+    text = re.sub(r"\d+/\d+", "", text)
+    text = re.sub(r"\d+\.?\d*", "", text)
+    text = re.sub(r"[^\w\s-]", "", text)
+    tokens = [t for t in text.split() if t not in UNITS and len(t) > 1]
+    return " ".join(tokens).strip()
+
+
+class TestIngredientNormalizer:
+    def test_matches_reference_on_search_terms(self):
+        from data_pipeline import IngredientNormalizer
+        path = os.path.join(os.path.dirname(__file__), '..', 'ingredients', 'search_terms.txt')
+        with open(path, encoding="cp1252") as f:
+            terms = f.read().splitlines()
+        normalizer = IngredientNormalizer()
+        assert normalizer.normalize_many(terms) == [_reference_normalize(t) for t in terms]
+
+    @pytest.mark.parametrize("raw", [
+        "1.5/2 cups milk", "1 (x)/2 flour", "½(¼ cup) sugar", "3 1/2 oz. cream-cheese",
+        "2\n(note)\n eggs", "٣ limes", "x² y", "",
+    ])
+    def test_matches_reference_edge_cases(self, raw):
+        from data_pipeline import IngredientNormalizer
+        assert IngredientNormalizer()(raw) == _reference_normalize(raw)
+
+    def test_caches_repeated_strings(self):
+        from data_pipeline import IngredientNormalizer
+        normalizer = IngredientNormalizer(cache_size=16)
+        normalizer.normalize_many(["2 cups flour", "2 cups flour", "1 tsp salt"])
+        info = normalizer.cache_info()
+        assert info.hits == 1
+        assert info.misses == 2
+
+    def test_applies_canonical_map(self):
+        from data_pipeline import IngredientNormalizer, normalize_ingredient
+        from vocab_canonicalize import CanonicalMap
+        cmap = CanonicalMap(synonyms={"scallion": "green onion"}, blocklist={"amounts"})
+        normalizer = IngredientNormalizer(canonical_map=cmap)
+        for raw in ["2 scallion", "amounts", "1 cup rice"]:
+            assert normalizer(raw) == normalize_ingredient(raw, canonical_map=cmap)
+
+
 # ── RecipeNLG parsing ────────────────────────────────────────────────────
 
 class TestParseRecipeNLG:
@@ -94,6 +156,53 @@ class TestParseRecipeNLG:
         assert len(result["ingredients"]) == len(set(result["ingredients"]))
 
 
+class TestLoadRecipeNLG:
+    @pytest.fixture
+    def csv_path(self, tmp_path):
+        import csv
+        path = tmp_path / "full_dataset.csv"
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["title", "ingredients", "NER", "source"])
+            writer.writeheader()
+            for i in range(25):
+                ner = '["water"]' if i % 5 == 0 else f'["salt", "pepper", "item {chr(97 + i)}"]'
+                writer.writerow({"title": f"Recipe {i}", "ingredients": "[]",
+                                 "NER": ner, "source": "test"})
+        return path
+
+    def test_batches_preserve_order(self, csv_path):
+        from data_pipeline import iter_recipenlg_batches
+        batches = list(iter_recipenlg_batches(csv_path, workers=1, chunk_size=4))
+        assert len(batches) == 7
+        titles = [r["title"] for batch in batches for r in batch]
+        assert titles == [f"Recipe {i}" for i in range(25) if i % 5 != 0]
+
+    def test_process_pool_matches_serial(self, csv_path):
+        from data_pipeline import load_recipenlg
+        serial = load_recipenlg(csv_path, workers=1)
+        parallel = load_recipenlg(csv_path, workers=2, chunk_size=3)
+        assert parallel == serial
+
+    def test_limit_counts_rows(self, csv_path):
+        from data_pipeline import load_recipenlg
+        recipes = load_recipenlg(csv_path, limit=10, workers=2, chunk_size=3)
+        assert [r["title"] for r in recipes] == [f"Recipe {i}" for i in range(10) if i % 5 != 0]
+
+    def test_run_pipeline_streams_lean_records(self, csv_path, tmp_path):
+        import json
+        from data_pipeline import run_pipeline, load_recipenlg
+        result = run_pipeline(csv_path, min_count=1, output_dir=tmp_path / "out", workers=2)
+
+        expected = [{"title": r["title"], "ingredients": r["ingredients"]}
+                    for r in load_recipenlg(csv_path, workers=1)]
+        assert result["recipes"] == expected
+        assert json.loads((tmp_path / "out" / "recipes_meta.json").read_text()) == expected
+        assert result["recipe_ingredient"].shape == (len(expected), result["vocab"].size)
+        # Equal ingredient names are one string object
+        salts = {id(r["ingredients"][0]) for r in result["recipes"]}
+        assert len(salts) == 1
+
+
 # ── Vocabulary ───────────────────────────────────────────────────────────
 
 class TestIngredientVocab:
@@ -176,6 +285,59 @@ class TestCooccurrenceMatrix:
         for i in range(vocab.size):
             assert matrix[i, i] == 0
 
+    def test_counts_match_pairwise_loop(self):
+        from data_pipeline import IngredientVocab, build_cooccurrence_matrix
+        recipes = [
+            {"ingredients": ["a", "b", "c"]},
+            {"ingredients": ["a", "b"]},
+            {"ingredients": ["c", "d", "unknown"]},
+        ]
+        vocab = IngredientVocab(min_count=1).fit(recipes)
+        matrix = build_cooccurrence_matrix(recipes, vocab)
+
+        expected = np.zeros((vocab.size, vocab.size), dtype=np.float32)
+        for recipe in recipes:
+            idx = [vocab.encode(i) for i in recipe["ingredients"]]
+            for a in idx:
+                for b in idx:
+                    if a != b:
+                        expected[a, b] += 2  # both directions, then symmetrized
+        np.testing.assert_array_equal(matrix.toarray(), expected)
+
+    def test_window_limits_pairs(self):
+        from data_pipeline import IngredientVocab, build_cooccurrence_matrix
+        recipes = [{"ingredients": ["a", "b", "c", "d"]}]
+        vocab = IngredientVocab(min_count=1).fit(recipes)
+        matrix = build_cooccurrence_matrix(recipes, vocab, window=1)
+
+        a, b, c, d = (vocab.encode(x) for x in "abcd")
+        assert matrix[a, b] == 2
+        assert matrix[b, c] == 2
+        assert matrix[a, c] == 0
+        assert matrix[a, d] == 0
+
+    def test_returns_csr(self):
+        from data_pipeline import IngredientVocab, build_cooccurrence_matrix
+        recipes = [{"ingredients": ["a", "b"]}]
+        vocab = IngredientVocab(min_count=1).fit(recipes)
+        assert build_cooccurrence_matrix(recipes, vocab).format == "csr"
+
+
+class TestEncodeRecipes:
+    def test_flat_ids_and_offsets(self):
+        from data_pipeline import IngredientVocab, encode_recipes
+        recipes = [
+            {"ingredients": ["a", "b", "rare"]},
+            {"ingredients": ["a", "b"]},
+            {"ingredients": ["also rare"]},
+        ]
+        vocab = IngredientVocab(min_count=2).fit(recipes)
+        ids, offsets = encode_recipes(recipes, vocab)
+
+        assert ids.dtype == np.int32
+        assert offsets.tolist() == [0, 2, 4, 4]
+        assert [vocab.decode(int(i)) for i in ids[offsets[0]:offsets[1]]] == ["a", "b"]
+
 
 # ── Recipe-ingredient matrix ────────────────────────────────────────────
 
@@ -204,6 +366,35 @@ class TestRecipeIngredientMatrix:
         dense = matrix.toarray()
         assert dense.min() == 0.0
 
+    def test_repeated_ingredient_stays_binary(self):
+        from data_pipeline import IngredientVocab, build_recipe_ingredient_matrix
+        recipes = [{"ingredients": ["a", "b", "a"]}, {"ingredients": ["a", "b"]}]
+        vocab = IngredientVocab(min_count=1).fit(recipes)
+        matrix = build_recipe_ingredient_matrix(recipes, vocab)
+        assert matrix.max() == 1.0
+        assert matrix.format == "csr"
+
+    def test_compact_dtype(self):
+        from data_pipeline import IngredientVocab, build_recipe_ingredient_matrix
+        recipes = [{"ingredients": ["a", "b", "c"]}, {"ingredients": ["a", "c"]}]
+        vocab = IngredientVocab(min_count=1).fit(recipes)
+        dense = build_recipe_ingredient_matrix(recipes, vocab)
+        compact = build_recipe_ingredient_matrix(recipes, vocab, dtype=np.uint8)
+        assert compact.dtype == np.uint8
+        np.testing.assert_array_equal(compact.toarray(), dense.toarray())
+
+    def test_accepts_pre_encoded_stream(self):
+        from data_pipeline import (
+            IngredientVocab, build_recipe_ingredient_matrix, encode_recipes,
+        )
+        recipes = [{"ingredients": ["a", "b"]}, {"ingredients": ["b", "c"]}]
+        vocab = IngredientVocab(min_count=1).fit(recipes)
+        encoded = encode_recipes(recipes, vocab)
+        matrix = build_recipe_ingredient_matrix(recipes, vocab, encoded=encoded)
+        np.testing.assert_array_equal(
+            matrix.toarray(), build_recipe_ingredient_matrix(recipes, vocab).toarray()
+        )
+
 
 # ── Compound overlap ────────────────────────────────────────────────────
 
@@ -291,12 +482,78 @@ class TestFood2Vec:
         loaded_vec = loaded.get_vector("garlic")
         np.testing.assert_array_almost_equal(original_vec, loaded_vec)
 
+    def test_similarity_many_matches_pairwise(self, trained_model):
+        pairs = [("garlic", "butter"), ("soy sauce", "ginger"),
+                 ("garlic", "garlic"), ("garlic", "unicorn tears")]
+        batch = trained_model.similarity_many(pairs)
+        expected = [trained_model.similarity(a, b) for a, b in pairs]
+        np.testing.assert_allclose(batch, expected, atol=1e-5)
+
+    def test_most_similar_many_matches_single(self, trained_model):
+        queries = ["garlic", "unicorn tears", "butter"]
+        batch = trained_model.most_similar_many(queries, topn=3)
+        assert batch[1] == []
+        for query, row in zip(queries, batch):
+            single = trained_model.most_similar(query, topn=3)
+            np.testing.assert_allclose([s for _, s in row], [s for _, s in single], atol=1e-5)
+
+    def test_evaluate_affinity_vs_compounds_batched(self, trained_model):
+        from food2vec import evaluate_affinity_vs_compounds
+        from data_pipeline import compound_overlap_score
+        flavordb = {ing: ["c_common", f"c_{ing}"] for ing in trained_model.vocabulary}
+        flavordb["garlic"].append("c_butter")
+        flavordb["butter"].append("c_garlic")
+
+        result = evaluate_affinity_vs_compounds(trained_model, flavordb, sample_size=5, topn=3)
+
+        rng = np.random.RandomState(42)
+        shared = [ing for ing in trained_model.vocabulary if ing in flavordb]
+        sample = rng.choice(shared, size=5, replace=False)
+        neighbor, random = [], []
+        for ing in sample:
+            for other, _ in trained_model.most_similar(ing, topn=3):
+                neighbor.append(compound_overlap_score(ing, other, flavordb))
+            for other in rng.choice(shared, size=3, replace=False):
+                if other != ing:
+                    random.append(compound_overlap_score(ing, other, flavordb))
+        assert result["n_neighbor_pairs"] == len(neighbor)
+        assert result["n_random_pairs"] == len(random)
+        assert result["mean_neighbor_overlap"] == pytest.approx(np.mean(neighbor))
+        assert result["mean_random_overlap"] == pytest.approx(np.mean(random))
+
     def test_untrained_model_raises(self):
         from food2vec import Food2Vec
         model = Food2Vec()
         with pytest.raises(RuntimeError):
             model.most_similar("garlic")
 
+    def test_embedding_store_matches_gensim(self, trained_model, tmp_path):
+        from food2vec import EmbeddingStore
+        trained_model.export_embeddings(tmp_path)
+        store = EmbeddingStore.load(tmp_path)
+
+        assert isinstance(store.vectors, np.memmap)
+        assert store.vocabulary == trained_model.vocabulary
+        for query in ["garlic", "butter", "soy sauce"]:
+            expected = trained_model.most_similar(query, topn=5)
+            got = store.most_similar(query, topn=5)
+            assert [n for n, _ in got] == [n for n, _ in expected]
+            np.testing.assert_allclose([s for _, s in got], [s for _, s in expected], atol=1e-5)
+        assert store.similarity("garlic", "butter") == pytest.approx(
+            trained_model.similarity("garlic", "butter"), abs=1e-5)
+        assert store.similarity("garlic", "unicorn tears") == 0.0
+        assert store.most_similar("unicorn tears") == []
+
+    def test_embedding_store_analogy_matches_gensim(self, trained_model, tmp_path):
+        from food2vec import EmbeddingStore
+        trained_model.export_embeddings(tmp_path)
+        store = EmbeddingStore.load(tmp_path)
+
+        expected = trained_model.analogy(["butter", "basil"], ["parsley"], topn=3)
+        got = store.analogy(["butter", "basil"], ["parsley"], topn=3)
+        assert [n for n, _ in got] == [n for n, _ in expected]
+        assert store.analogy(["unicorn tears"], ["garlic"]) == []
+
 
 # ── Collaborative Filtering ─────────────────────────────────────────────
 
@@ -335,6 +592,50 @@ class TestIngredientCF:
         cf, vocab = cf_setup
         assert cf.similar_ingredients("dragon fruit") == []
 
+    def test_fits_compact_matrix(self):
+        from data_pipeline import IngredientVocab, build_recipe_ingredient_matrix
+        from affinity_models import IngredientCF
+        recipes = [
+            {"ingredients": ["garlic", "butter", "parsley"]},
+            {"ingredients": ["garlic", "olive oil", "basil"]},
+            {"ingredients": ["butter", "flour", "sugar"]},
+        ] * 10
+        vocab = IngredientVocab(min_count=2).fit(recipes)
+        compact = build_recipe_ingredient_matrix(recipes, vocab, dtype=np.uint8)
+        dense = build_recipe_ingredient_matrix(recipes, vocab)
+        a = IngredientCF(n_neighbors=5).fit(compact, vocab).similar_ingredients("garlic", topn=3)
+        b = IngredientCF(n_neighbors=5).fit(dense, vocab).similar_ingredients("garlic", topn=3)
+        assert [n for n, _ in a] == [n for n, _ in b]
+
+    def test_neighbor_table_shape_and_order(self, cf_setup):
+        cf, vocab = cf_setup
+        indices, scores = cf._neighbor_indices, cf._neighbor_scores
+        assert indices.shape == scores.shape == (vocab.size, min(5, vocab.size - 1))
+        assert not (indices == np.arange(vocab.size)[:, None]).any()
+        assert (np.diff(scores, axis=1) <= 1e-6).all()
+
+    def test_table_matches_brute_force_cosine(self, cf_setup):
+        from sklearn.metrics.pairwise import cosine_similarity
+        cf, vocab = cf_setup
+        sims = cosine_similarity(cf._matrix.T)
+        idx = vocab.encode("garlic")
+        expected = sorted((s for j, s in enumerate(sims[idx]) if j != idx), reverse=True)[:3]
+        got = [s for _, s in cf.similar_ingredients("garlic", topn=3)]
+        np.testing.assert_allclose(got, expected, atol=1e-5)
+
+    def test_wider_than_table_falls_back_to_exact(self, cf_setup):
+        cf, vocab = cf_setup
+        results = cf.similar_ingredients("garlic", topn=vocab.size)
+        assert len(results) == vocab.size - 1
+
+    def test_save_load_neighbors_mmap(self, cf_setup, tmp_path):
+        from affinity_models import IngredientCF
+        cf, vocab = cf_setup
+        cf.save_neighbors(tmp_path)
+        loaded = IngredientCF.load_neighbors(tmp_path, vocab)
+        assert isinstance(loaded._neighbor_indices, np.memmap)
+        assert loaded.similar_ingredients("garlic", topn=3) == cf.similar_ingredients("garlic", topn=3)
+
     def test_suggest_ingredients(self, cf_setup):
         cf, vocab = cf_setup
         suggestions = cf.suggest_ingredients(["garlic", "butter"], topn=5)
@@ -343,9 +644,92 @@ class TestIngredientCF:
         assert "garlic" not in names
         assert "butter" not in names
 
+    def test_suggest_ingredients_sums_neighbor_scores(self, cf_setup):
+        cf, vocab = cf_setup
+        current = ["garlic", "butter"]
+        expected: dict[str, float] = {}
+        for ing in current:
+            for name, sim in cf.similar_ingredients(ing, topn=20):
+                if name not in current:
+                    expected[name] = expected.get(name, 0) + sim
+        suggestions = dict(cf.suggest_ingredients(current, topn=len(expected)))
+        assert suggestions.keys() == expected.keys()
+        for name, score in expected.items():
+            assert abs(suggestions[name] - score) < 1e-5
+
+    def test_wide_table_built_once_under_concurrency(self, cf_setup):
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        cf, vocab = cf_setup
+        build = cf._cosine_neighbor_table
+        calls = []
+
+        def slow_build(k):
+            calls.append(k)
+            time.sleep(0.05)
+            return build(k)
+
+        cf._cosine_neighbor_table = slow_build
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(
+                lambda _: cf.suggest_ingredients(["garlic"], topn=3, neighbors_per_ingredient=8), range(4)))
+        assert len(calls) == 1
+        assert all(r == results[0] for r in results)
+
+    def test_suggest_ingredients_unknown_only(self, cf_setup):
+        cf, vocab = cf_setup
+        assert cf.suggest_ingredients(["dragon fruit"]) == []
+
+    def test_pairwise_similarity_is_exact_cosine(self, cf_setup):
+        from sklearn.metrics.pairwise import cosine_similarity
+        cf, vocab = cf_setup
+        sims = cosine_similarity(cf._matrix.T)
+        for a, b in [("garlic", "butter"), ("soy sauce", "flour"), ("garlic", "garlic")]:
+            expected = sims[vocab.encode(a), vocab.encode(b)]
+            assert cf.similarity(a, b) == pytest.approx(expected, abs=1e-5)
+        assert cf.similarity("garlic", "dragon fruit") == 0.0
+
+    def test_similarity_matrix_matches_pairwise(self, cf_setup):
+        cf, vocab = cf_setup
+        names = ["garlic", "butter", "dragon fruit", "flour", "garlic"]
+        matrix = cf.similarity_matrix(names)
+        expected = [[cf.similarity(a, b) for b in names] for a in names]
+        np.testing.assert_allclose(matrix, expected, atol=1e-5)
+
+    def test_table_only_similarity_falls_back_to_table(self, cf_setup, tmp_path):
+        from affinity_models import IngredientCF
+        cf, vocab = cf_setup
+        cf.save_neighbors(tmp_path, include_items=False)
+        loaded = IngredientCF.load_neighbors(tmp_path, vocab)
+        assert loaded._items is None
+
+        top, score = cf.similar_ingredients("garlic", topn=1)[0]
+        assert loaded.similarity("garlic", top) == pytest.approx(score)
+        assert loaded.similarity(top, "garlic") == pytest.approx(score)
+        matrix = loaded.similarity_matrix(["garlic", top])
+        np.testing.assert_allclose(matrix, [[1.0, score], [score, 1.0]], atol=1e-6)
+
+    def test_saved_item_vectors_keep_exact_similarity(self, cf_setup, tmp_path):
+        from affinity_models import IngredientCF
+        cf, vocab = cf_setup
+        cf.save_neighbors(tmp_path)
+        loaded = IngredientCF.load_neighbors(tmp_path, vocab)
+        assert loaded.similarity("soy sauce", "flour") == pytest.approx(
+            cf.similarity("soy sauce", "flour"))
+
 
 # ── Technique extraction ─────────────────────────────────────────────────
 
+def _reference_extract_techniques(instructions: str) -> list[str]:
+    """The original per-technique regex extractor, kept as a differential oracle."""
+    import re
+    import unicodedata
+    from affinity_models import COOKING_TECHNIQUES
+    text = unicodedata.normalize("NFKD", instructions.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return [t for t in COOKING_TECHNIQUES if re.search(rf"\b{re.escape(t)}\w*\b", text)]
+
+
 class TestTechniqueExtraction:
     def test_extracts_basic_techniques(self):
         from affinity_models import extract_techniques_from_instructions
@@ -372,6 +756,64 @@ class TestTechniqueExtraction:
         # "mix" is not in our technique list
         assert "mix" not in techniques
 
+    def test_overlapping_techniques(self):
+        from affinity_models import extract_techniques_from_instructions
+        techniques = extract_techniques_from_instructions("Deep fry, then stir-fry.")
+        assert techniques == ["fry", "deep fry"]
+
+    def test_matches_reference_on_fuzzed_text(self):
+        import random
+        from affinity_models import COOKING_TECHNIQUES, extract_techniques_from_instructions
+        rng = random.Random(0)
+        words = COOKING_TECHNIQUES + [t + "ed" for t in COOKING_TECHNIQUES] + [
+            "Sautéed", "crème", "DEEP FRY", "deep  fry", "pan_fry", "re-bake",
+            "1bake", "restaurant", "café", "ﬁne",
+        ]
+        seps = [" ", ", ", "-", "_", ".", "\n", "é", "2", ""]
+        for _ in range(2000):
+            text = "".join(rng.choice(words) + rng.choice(seps) for _ in range(rng.randint(0, 12)))
+            assert extract_techniques_from_instructions(text) == _reference_extract_techniques(text)
+
+    def test_technique_index_matches_counter_reference(self, tmp_path):
+        from collections import Counter
+        from affinity_models import TechniqueIndex, extract_techniques_from_instructions
+        recipes = [
+            {"ingredients": ["garlic", "butter"], "directions": "Saute garlic in butter. Simmer."},
+            {"ingredients": ["garlic", "chicken"], "directions": "Roast chicken with garlic."},
+            {"ingredients": ["butter", "flour"], "directions": "Cream butter, bake, then rest."},
+            {"ingredients": ["garlic"], "directions": ""},
+        ]
+        expected: dict[str, Counter] = {}
+        for recipe in recipes:
+            if not recipe["directions"]:
+                continue
+            for ing in recipe["ingredients"]:
+                expected.setdefault(ing, Counter()).update(
+                    extract_techniques_from_instructions(recipe["directions"]))
+
+        TechniqueIndex.from_recipes(recipes).save(tmp_path)
+        index = TechniqueIndex.load(tmp_path)
+        for ing, counts in expected.items():
+            total = sum(counts.values())
+            got = index.top_techniques(ing, n=10)
+            assert dict(got) == pytest.approx({t: c / total for t, c in counts.items()})
+        # saute/simmer/roast tie for garlic: the earliest technique wins
+        assert index.top_techniques("garlic", n=1)[0][0] == "roast"
+        assert index.top_techniques("unicorn") == []
+
+    def test_technique_index_ties_follow_technique_order(self):
+        from affinity_models import TechniqueIndex
+        index = TechniqueIndex.from_counts({"garlic": {"roast": 2, "bake": 2, "fry": 5}})
+        assert [t for t, _ in index.top_techniques("garlic", n=2)] == ["fry", "bake"]
+        assert [t for t, _ in index.top_techniques("garlic", n=3)] == ["fry", "bake", "roast"]
+
+    def test_batch_matches_single(self):
+        from affinity_models import extract_techniques_many, extract_techniques_from_instructions
+        texts = ["Bake the bread.", "", "Sauté and simmer.", "Serve cold."] * 3
+        expected = [extract_techniques_from_instructions(t) for t in texts]
+        assert extract_techniques_many(texts) == expected
+        assert extract_techniques_many(texts, workers=2, chunk_size=5) == expected
+
 
 # ── Combined Affinity ────────────────────────────────────────────────────
 
@@ -380,12 +822,12 @@ class TestCombinedAffinity:
         from affinity_models import CombinedAffinity
 
         # Mock food2vec
-        class MockF2V:
+        class MockF2V(_BatchMock):
             def similarity(self, a, b): return 0.8
             def most_similar(self, ing, topn=10):
                 return [("butter", 0.8), ("salt", 0.6)]
 
-        class MockCF:
+        class MockCF(_BatchMock):
             def similar_ingredients(self, ing, topn=10):
                 return [("butter", 0.7), ("pepper", 0.5)]
 
@@ -397,12 +839,12 @@ class TestCombinedAffinity:
     def test_top_affinities_unions_candidates(self):
         from affinity_models import CombinedAffinity
 
-        class MockF2V:
+        class MockF2V(_BatchMock):
             def similarity(self, a, b): return 0.5
             def most_similar(self, ing, topn=10):
                 return [("a", 0.9), ("b", 0.7)]
 
-        class MockCF:
+        class MockCF(_BatchMock):
             def similar_ingredients(self, ing, topn=10):
                 return [("b", 0.8), ("c", 0.6)]
 
@@ -412,3 +854,66 @@ class TestCombinedAffinity:
         assert "a" in names
         assert "b" in names
         assert "c" in names
+
+    @pytest.fixture
+    def trained_models(self):
+        from food2vec import Food2Vec
+        from data_pipeline import IngredientVocab, build_recipe_ingredient_matrix
+        from affinity_models import IngredientCF
+        recipes = [
+            {"ingredients": ["garlic", "butter", "parsley", "salt"]},
+            {"ingredients": ["garlic", "olive oil", "basil", "tomato"]},
+            {"ingredients": ["butter", "flour", "sugar", "eggs"]},
+            {"ingredients": ["tomato", "basil", "mozzarella", "olive oil"]},
+        ] * 20
+        food2vec = Food2Vec(vector_size=16, window=5, min_count=5, epochs=5).train(recipes)
+        vocab = IngredientVocab(min_count=2).fit(recipes)
+        cf = IngredientCF(n_neighbors=3).fit(build_recipe_ingredient_matrix(recipes, vocab), vocab)
+        return food2vec, cf
+
+    def test_affinity_uses_direct_cf_similarity(self):
+        from affinity_models import CombinedAffinity
+
+        class MockF2V(_BatchMock):
+            def similarity(self, a, b): return 0.5
+
+        class MockCF(_BatchMock):
+            def similarity(self, a, b): return 0.3
+            def similar_ingredients(self, ing, topn=10): return []
+
+        combined = CombinedAffinity(MockF2V(), MockCF(), alpha=0.5, beta=0.5, gamma=0.0)
+        assert combined.affinity("garlic", "butter") == pytest.approx(0.5 * 0.5 + 0.5 * 0.3)
+
+    def test_affinity_matrix_matches_pairwise(self, trained_models):
+        from affinity_models import CombinedAffinity, CompoundAffinity
+        food2vec, cf = trained_models
+        compounds = CompoundAffinity({"garlic": ["a", "b"], "butter": ["b", "c"], "basil": ["a"]})
+        combined = CombinedAffinity(food2vec, cf, compounds)
+
+        names = ["garlic", "butter", "basil", "dragon fruit"]
+        matrix = combined.affinity_matrix(names)
+        expected = [[combined.affinity(a, b) for b in names] for a in names]
+        np.testing.assert_allclose(matrix, expected, atol=1e-5)
+
+    def test_top_affinities_rescores_every_candidate(self, trained_models):
+        from affinity_models import CombinedAffinity, CompoundAffinity
+        food2vec, cf = trained_models
+        compounds = CompoundAffinity({"garlic": ["a", "b"], "butter": ["b", "c"], "basil": ["a"]})
+        combined = CombinedAffinity(food2vec, cf, compounds, pool_size=3)
+
+        results = combined.top_affinities("garlic", topn=5)
+        assert results
+        assert "garlic" not in [name for name, _ in results]
+        for name, score in results:
+            assert score == pytest.approx(combined.affinity("garlic", name), abs=1e-5)
+        assert [s for _, s in results] == sorted((s for _, s in results), reverse=True)
+
+    def test_top_affinities_pool_size_override(self, trained_models):
+        from affinity_models import CombinedAffinity
+        food2vec, cf = trained_models
+        combined = CombinedAffinity(food2vec, cf, pool_size=1)
+        narrow = combined.top_affinities("garlic", topn=10)
+        wide = combined.top_affinities("garlic", topn=10, pool_size=20)
+        assert len(narrow) <= 2
+        assert len(wide) > len(narrow)
+
@@ -0,0 +1,54 @@
+"""Tests for the ML result cache."""
+
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'cauldron-app'))
+
+from result_cache import ResultCache
+
+
+class TestResultCache:
+    def test_hit_and_miss_counters(self):
+        cache = ResultCache(maxsize=4)
+        assert cache.get("a") == (False, None)
+        cache.put("a", 1)
+        assert cache.get("a") == (True, 1)
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_evicts_least_recently_used(self):
+        cache = ResultCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")  # "b" is now the oldest
+        cache.put("c", 3)
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire_after_ttl(self):
+        cache = ResultCache(maxsize=4, ttl=10)
+        with patch("result_cache.time.monotonic", return_value=100.0):
+            cache.put("a", 1)
+        with patch("result_cache.time.monotonic", return_value=105.0):
+            assert cache.get("a") == (True, 1)
+        with patch("result_cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") == (False, None)
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_zero_size_disables(self):
+        cache = ResultCache(maxsize=0)
+        cache.put("a", 1)
+        assert cache.get("a") == (False, None)
+
+    def test_clear_keeps_counters(self):
+        cache = ResultCache()
+        cache.put("a", 1)
+        cache.get("a")
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats()["hits"] == 1
@@ -0,0 +1,133 @@
+"""Tests for api/scheduler.py — turn admission and per-session ordering."""
+
+import sys
+import os
+import asyncio
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+from scheduler import TurnScheduler
+
+
+async def _turn(scheduler, session_id, log, hold=0.01, positions=None):
+    async def on_queued(position):
+        if positions is not None:
+            positions.append(position)
+
+    async with scheduler.turn(session_id, on_queued=on_queued):
+        log.append(("start", session_id))
+        await asyncio.sleep(hold)
+        log.append(("end", session_id))
+
+
+class TestTurnScheduler:
+    def test_global_limit(self):
+        scheduler = TurnScheduler(max_concurrent=2)
+        peak = 0
+
+        async def turn(i):
+            nonlocal peak
+            async with scheduler.turn(f"s{i}"):
+                peak = max(peak, len(scheduler._running))
+                await asyncio.sleep(0.01)
+
+        async def main():
+            await asyncio.gather(*(turn(i) for i in range(6)))
+
+        asyncio.run(main())
+        assert peak == 2
+        stats = scheduler.stats()
+        assert stats["turns_started"] == stats["turns_completed"] == 6
+        assert stats["running"] == stats["queued"] == 0
+        assert stats["max_queue_depth"] == 4
+
+    def test_same_session_serialized_in_order(self):
+        scheduler = TurnScheduler(max_concurrent=4)
+        log = []
+
+        async def main():
+            tasks = [asyncio.create_task(_turn(scheduler, "s", log)) for _ in range(3)]
+            await asyncio.gather(*tasks)
+
+        asyncio.run(main())
+        # Never two turns of the session at once
+        assert [event for event, _ in log] == ["start", "end"] * 3
+
+    def test_blocked_session_does_not_hold_up_others(self):
+        scheduler = TurnScheduler(max_concurrent=4)
+        log = []
+
+        async def main():
+            first = asyncio.create_task(_turn(scheduler, "a", log, hold=0.05))
+            await asyncio.sleep(0)
+            second = asyncio.create_task(_turn(scheduler, "a", log))
+            other = asyncio.create_task(_turn(scheduler, "b", log))
+            await asyncio.gather(first, second, other)
+
+        asyncio.run(main())
+        assert log.index(("start", "b")) < log.index(("end", "a"))
+
+    def test_queued_positions_reported(self):
+        scheduler = TurnScheduler(max_concurrent=1)
+        log, positions = [], []
+
+        async def main():
+            tasks = [asyncio.create_task(_turn(scheduler, f"s{i}", log)) for i in range(3)]
+            await asyncio.sleep(0)
+            last = asyncio.create_task(_turn(scheduler, "last", log, positions=positions))
+            await asyncio.gather(*tasks, last)
+
+        asyncio.run(main())
+        assert positions == [3, 2, 1]
+
+    def test_cancel_while_queued_gives_up_place(self):
+        scheduler = TurnScheduler(max_concurrent=1)
+        log = []
+
+        async def main():
+            holder = asyncio.create_task(_turn(scheduler, "a", log, hold=0.05))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(_turn(scheduler, "b", log))
+            await asyncio.sleep(0.01)
+            assert scheduler.stats()["queued"] == 1
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            assert scheduler.stats()["queued"] == 0
+            await holder
+
+        asyncio.run(main())
+        assert ("start", "b") not in log
+        stats = scheduler.stats()
+        assert stats["turns_started"] == stats["turns_completed"] == 1
+
+    def test_slot_released_when_turn_raises(self):
+        scheduler = TurnScheduler(max_concurrent=1)
+
+        async def failing():
+            async with scheduler.turn("a"):
+                raise RuntimeError("boom")
+
+        async def main():
+            with pytest.raises(RuntimeError):
+                await failing()
+            log = []
+            await _turn(scheduler, "a", log)
+            return log
+
+        assert asyncio.run(main()) == [("start", "a"), ("end", "a")]
+        assert scheduler.stats()["running"] == 0
+
+    def test_wait_percentiles(self):
+        scheduler = TurnScheduler(max_concurrent=1)
+        assert scheduler.stats()["wait_ms"] == {"p50": 0.0, "p95": 0.0, "max": 0.0}
+
+        async def main():
+            log = []
+            await asyncio.gather(*(_turn(scheduler, f"s{i}", log, hold=0.02) for i in range(3)))
+
+        asyncio.run(main())
+        wait = scheduler.stats()["wait_ms"]
+        assert wait["max"] >= 30
+        assert wait["p50"] <= wait["p95"] <= wait["max"]
@@ -88,3 +88,34 @@ class TestSessionManager:
         pot2 = load_pot_from_file(s2_pot_file)
         assert len(pot2.recipes) == 0
         assert len(pot1.recipes) == 1
+
+    def test_session_scope_uses_in_memory_state(self, tmp_path):
+        from session import SessionManager
+        from agent_tools import _session_state, add_url_to_pot, examine_pot
+
+        mgr = SessionManager(sessions_dir=str(tmp_path))
+        session_id = mgr.create_session()
+
+        with mgr.session_scope(session_id):
+            state = _session_state.get()
+            assert state is mgr.get_state(session_id)
+            add_url_to_pot.invoke({"url": "https://example.com/live"})
+            assert "example.com/live" in examine_pot.invoke({})
+        assert _session_state.get() is None
+
+        # Still live for the next turn; written out on flush
+        with mgr.session_scope(session_id):
+            assert _session_state.get() is state
+        mgr.flush_all()
+        from class_defs import load_pot_from_file
+        pot_file = os.path.join(mgr.get_session_dir(session_id), "recipe_pot.json")
+        assert load_pot_from_file(pot_file).urlList == ["https://example.com/live"]
+
+    def test_remove_session_drops_state(self, tmp_path):
+        from session import SessionManager
+        mgr = SessionManager(sessions_dir=str(tmp_path))
+        session_id = mgr.create_session()
+        state = mgr.get_state(session_id)
+        mgr.remove_session(session_id)
+        assert session_id not in mgr._states
+        assert not state.dirty
@@ -0,0 +1,168 @@
+"""Tests for session_state.py — in-memory session state with write-behind."""
+
+import os
+import time
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture
+def state(state_dir):
+    from session_state import SessionState
+    return SessionState(
+        os.path.join(state_dir, "recipe_graph.json"),
+        os.path.join(state_dir, "mods_list.json"),
+        os.path.join(state_dir, "recipe_pot.json"),
+        flush_delay=60,
+    )
+
+
+def _pot_urls(state_dir):
+    from class_defs import load_pot_from_file
+    return load_pot_from_file(os.path.join(state_dir, "recipe_pot.json")).urlList
+
+
+class TestSessionState:
+    def test_objects_stay_live_between_calls(self, state):
+        with state.read("graph") as first:
+            pass
+        with state.edit("graph") as second:
+            pass
+        assert first is second
+
+    def test_read_never_writes(self, state):
+        entry = state._entries["graph"]
+        with patch.object(entry, "save") as mock_save:
+            with state.read("graph") as graph:
+                assert graph.get_graph_size() == 1
+            state.flush()
+        mock_save.assert_not_called()
+        assert not state.dirty
+
+    def test_edits_are_written_behind_and_coalesced(self, state, state_dir):
+        for i in range(5):
+            with state.edit("pot") as pot:
+                pot.add_url(f"https://example.com/{i}")
+        assert state.dirty
+        assert _pot_urls(state_dir) == []
+
+        state.flush()
+        assert len(_pot_urls(state_dir)) == 5
+        assert state.writes == 1
+        assert not state.dirty
+
+    def test_timer_flushes(self, state, state_dir):
+        state.flush_delay = 0.05
+        with state.edit("pot") as pot:
+            pot.add_url("https://example.com/timer")
+        deadline = time.monotonic() + 2
+        while state.dirty and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _pot_urls(state_dir) == ["https://example.com/timer"]
+
+    def test_failed_background_flush_is_kept_and_retried(self, state, state_dir):
+        entry = state._entries["pot"]
+        state.flush_delay = 0.02
+        with patch.object(entry, "save", side_effect=OSError("disk full")) as mock_save:
+            with state.edit("pot") as pot:
+                pot.add_url("https://example.com/retry")
+            deadline = time.monotonic() + 2
+            while mock_save.call_count < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            # Retried, still dirty, and the failure is on record
+            assert mock_save.call_count >= 2
+            assert state.dirty
+            assert isinstance(state.flush_error, OSError)
+            with pytest.raises(OSError, match="disk full"):
+                state.flush()
+
+        # The next retry succeeds once the disk is back
+        deadline = time.monotonic() + 2
+        while state.dirty and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _pot_urls(state_dir) == ["https://example.com/retry"]
+        assert state.flush_error is None
+
+    def test_flush_writes_other_files_when_one_fails(self, state, state_dir):
+        with state.edit("graph"):
+            pass
+        with state.edit("pot") as pot:
+            pot.add_url("https://example.com/kept")
+        with patch.object(state._entries["graph"], "save", side_effect=OSError("graph failed")):
+            with pytest.raises(OSError):
+                state.flush()
+        assert _pot_urls(state_dir) == ["https://example.com/kept"]
+        assert state._entries["graph"].dirty
+        state.discard()
+
+    def test_zero_delay_writes_through(self, state, state_dir):
+        state.flush_delay = 0
+        with state.edit("pot") as pot:
+            pot.add_url("https://example.com/now")
+        assert _pot_urls(state_dir) == ["https://example.com/now"]
+
+    def test_external_rewrite_is_picked_up(self, state, state_dir):
+        from class_defs import Pot, save_pot_to_file
+        with state.read("pot") as pot:
+            assert pot.urlList == []
+        external = Pot()
+        external.add_url("https://example.com/external")
+        time.sleep(0.01)
+        save_pot_to_file(external, os.path.join(state_dir, "recipe_pot.json"))
+        with state.read("pot") as pot:
+            assert pot.urlList == ["https://example.com/external"]
+
+    def test_journal_append_by_other_writer_is_picked_up(self, state, state_dir):
+        from session_state import SessionState
+        from class_defs import Recipe
+        other = SessionState(*(entry.path for entry in state._entries.values()), flush_delay=0)
+        with state.read("graph") as graph:
+            assert graph.get_graph_size() == 1
+        snapshot = os.stat(os.path.join(state_dir, "recipe_graph.json"))
+        time.sleep(0.01)
+        with other.edit("graph") as graph:
+            graph.add_node(Recipe(name="V2", ingredients=[], instructions=[], tags=[], sources=[]))
+        # Only the journal changed
+        assert os.stat(os.path.join(state_dir, "recipe_graph.json")).st_mtime_ns == snapshot.st_mtime_ns
+        with state.read("graph") as graph:
+            assert graph.get_graph_size() == 2
+
+    def test_failed_edit_is_discarded(self, state):
+        with pytest.raises(ValueError):
+            with state.edit("pot") as pot:
+                pot.add_url("https://example.com/partial")
+                raise ValueError("tool failed")
+        with state.read("pot") as pot:
+            assert pot.urlList == []
+        assert not state.dirty
+
+    def test_discard_drops_unsaved_edits(self, state, state_dir):
+        with state.edit("pot") as pot:
+            pot.add_url("https://example.com/dropped")
+        state.discard()
+        assert not state.dirty
+        with state.read("pot") as pot:
+            assert pot.urlList == []
+
+
+class TestToolsInSession:
+    def test_tools_share_live_state(self, state, state_dir):
+        import agent_tools
+        token = agent_tools._session_state.set(state)
+        try:
+            entry = state._entries["graph"]
+            with patch.object(entry, "load", wraps=entry.load) as mock_load:
+                agent_tools.add_node.invoke({"recipe_str": {
+                    "name": "V2", "ingredients": [{"name": "rye", "quantity": 1, "unit": "cup"}],
+                    "instructions": ["Mix"], "tags": [], "sources": []}})
+                assert "2" in agent_tools.get_graph_size.invoke({})
+                assert "V2" in agent_tools.get_foundational_recipe.invoke({})
+            # One parse for the whole sequence, nothing written yet
+            assert mock_load.call_count == 1
+            assert state.writes == 0
+            state.flush()
+        finally:
+            agent_tools._session_state.reset(token)
+
+        from class_defs import load_graph_from_file
+        assert load_graph_from_file(os.path.join(state_dir, "recipe_graph.json")).get_graph_size() == 2
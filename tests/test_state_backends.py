@@ -0,0 +1,309 @@
+"""Contract tests for class_defs storage backends — every backend must pass them."""
+
+import os
+import sys
+import shutil
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def backend(request, tmp_path):
+    from class_defs import JsonBackend, SqliteBackend
+    if request.param == "json":
+        yield JsonBackend()
+    else:
+        db = SqliteBackend(str(tmp_path / "state.db"))
+        yield db
+        db.close()
+
+
+@pytest.fixture
+def paths(tmp_path):
+    session_dir = tmp_path / "session-a"
+    session_dir.mkdir()
+    return {
+        "graph": str(session_dir / "recipe_graph.json"),
+        "mods": str(session_dir / "mods_list.json"),
+        "pot": str(session_dir / "recipe_pot.json"),
+    }
+
+
+def _recipe(name, n_ingredients=2):
+    from class_defs import Recipe, Ingredient
+    return Recipe(
+        name=name,
+        ingredients=[Ingredient(name=f"ing{i}", quantity=i + 1, unit="g") for i in range(n_ingredients)],
+        instructions=["Mix", "Bake"],
+        tags=["t"],
+        sources=[],
+    )
+
+
+class TestStateBackendContract:
+    def test_missing_state_raises(self, backend, paths):
+        with pytest.raises(FileNotFoundError):
+            backend.load_graph(paths["graph"])
+        with pytest.raises(FileNotFoundError):
+            backend.load_mods_list(paths["mods"])
+        with pytest.raises(FileNotFoundError):
+            backend.load_pot(paths["pot"])
+
+    def test_graph_roundtrip(self, backend, paths):
+        from class_defs import RecipeGraph
+        graph = RecipeGraph()
+        graph.create_recipe_graph(_recipe("V0"))
+        graph.add_node(_recipe("V1", 3))
+        backend.save_graph(graph, paths["graph"])
+
+        loaded = backend.load_graph(paths["graph"])
+        assert loaded.get_graph_size() == 2
+        assert list(loaded.get_graph().nodes) == list(graph.get_graph().nodes)
+        assert list(loaded.get_graph().edges) == list(graph.get_graph().edges)
+        assert loaded.foundational_recipe_node == graph.foundational_recipe_node
+        assert loaded.get_foundational_recipe().model_dump() == _recipe("V1", 3).model_dump()
+
+    def test_graph_incremental_saves(self, backend, paths):
+        from class_defs import RecipeGraph
+        graph = RecipeGraph()
+        graph.create_recipe_graph(_recipe("V0"))
+        backend.save_graph(graph, paths["graph"])
+
+        for i in range(1, 3):
+            loaded = backend.load_graph(paths["graph"])
+            loaded.add_node(_recipe(f"V{i}"))
+            backend.save_graph(loaded, paths["graph"])
+
+        loaded = backend.load_graph(paths["graph"])
+        v3 = _recipe("V3")
+        loaded.add_node(v3)
+        backend.save_graph(loaded, paths["graph"])
+        loaded.add_node(_recipe("V4"))
+        loaded.set_foundational_recipe(v3)
+        backend.save_graph(loaded, paths["graph"])
+
+        final = backend.load_graph(paths["graph"])
+        assert final.get_graph_size() == 5
+        assert final.get_graph().number_of_edges() == 4
+        assert final.foundational_recipe_node == v3.get_ID()
+        assert final.get_foundational_recipe().name == "V3"
+
+    def test_long_version_chain_roundtrip(self, backend, paths):
+        from class_defs import RecipeGraph, Ingredient
+        graph = RecipeGraph()
+        graph.create_recipe_graph(_recipe("V0", 5))
+        backend.save_graph(graph, paths["graph"])
+        for i in range(1, 40):
+            recipe = graph.get_foundational_recipe()
+            recipe.new_ID()
+            recipe.name = f"V{i}"
+            recipe.ingredients[i % 5] = Ingredient(name=f"swap{i}", quantity=i, unit="g")
+            graph.add_node(recipe)
+            if i % 7 == 0:
+                backend.save_graph(graph, paths["graph"])
+        backend.save_graph(graph, paths["graph"])
+
+        loaded = backend.load_graph(paths["graph"])
+        assert ({n: d["recipe"].model_dump() for n, d in loaded.get_graph().nodes(data=True)}
+                == {n: d["recipe"].model_dump() for n, d in graph.get_graph().nodes(data=True)})
+
+    def test_stale_writer_is_refused(self, backend, paths):
+        from class_defs import RecipeGraph
+        graph = RecipeGraph()
+        graph.create_recipe_graph(_recipe("V0"))
+        backend.save_graph(graph, paths["graph"])
+        first = backend.load_graph(paths["graph"])
+        second = backend.load_graph(paths["graph"])
+
+        first.add_node(_recipe("first"))
+        backend.save_graph(first, paths["graph"])
+        second.add_node(_recipe("second"))
+        with pytest.raises(RuntimeError, match="another writer"):
+            backend.save_graph(second, paths["graph"])
+
+        stored = backend.load_graph(paths["graph"])
+        assert stored.get_foundational_recipe().name == "first"
+        assert stored.get_graph_size() == 2
+        # The up-to-date writer keeps saving
+        first.add_node(_recipe("again"))
+        backend.save_graph(first, paths["graph"])
+        assert backend.load_graph(paths["graph"]).get_graph_size() == 3
+
+    def test_new_graph_replaces_stored_one(self, backend, paths):
+        from class_defs import RecipeGraph
+        graph = RecipeGraph()
+        graph.create_recipe_graph(_recipe("old"))
+        graph.add_node(_recipe("older"))
+        backend.save_graph(graph, paths["graph"])
+
+        backend.save_graph(RecipeGraph(), paths["graph"])
+        loaded = backend.load_graph(paths["graph"])
+        assert loaded.get_graph_size() == 0
+        assert loaded.foundational_recipe_node is None
+
+    def test_files_in_one_directory_are_separate(self, backend, paths, tmp_path):
+        from class_defs import RecipeGraph, Pot
+        for name in ("a", "b"):
+            graph = RecipeGraph()
+            graph.create_recipe_graph(_recipe(name.upper()))
+            backend.save_graph(graph, str(tmp_path / f"{name}.json"))
+            pot = Pot()
+            pot.add_url(f"https://example.com/{name}")
+            backend.save_pot(pot, str(tmp_path / f"{name}_pot.json"))
+        assert backend.load_graph(str(tmp_path / "a.json")).get_foundational_recipe().name == "A"
+        assert backend.load_graph(str(tmp_path / "b.json")).get_foundational_recipe().name == "B"
+        assert backend.load_pot(str(tmp_path / "a_pot.json")).urlList == ["https://example.com/a"]
+
+    def test_mods_list_roundtrip_keeps_order(self, backend, paths):
+        from class_defs import ModsList, RecipeModification, Ingredient
+        mods = ModsList()
+        for priority in (3, 1, 5, 2):
+            mods.suggest_mod(RecipeModification(priority=priority, add_tag=f"p{priority}"))
+        mods.suggest_mod(RecipeModification(priority=4, add_ingredient=Ingredient(name="salt", quantity=1, unit="tsp")))
+        backend.save_mods_list(mods, paths["mods"])
+
+        loaded = backend.load_mods_list(paths["mods"])
+        # Mod IDs are not persisted, so compare contents
+        assert [(p, m.model_dump()) for p, m in loaded.queue] == [(p, m.model_dump()) for p, m in mods.queue]
+        assert [m.priority for m in loaded.get_mods_list()] == [m.priority for m in mods.get_mods_list()]
+
+        loaded.apply_mod(_graph_with(_recipe("base")))
+        backend.save_mods_list(loaded, paths["mods"])
+        assert len(backend.load_mods_list(paths["mods"]).queue) == 4
+
+    def test_pot_roundtrip(self, backend, paths):
+        from class_defs import Pot
+        pot = Pot()
+        pot.add_recipe(_recipe("a"))
+        pot.add_recipe(_recipe("b"))
+        pot.add_url("https://example.com/1")
+        backend.save_pot(pot, paths["pot"])
+
+        loaded = backend.load_pot(paths["pot"])
+        assert [r.name for r in loaded.recipes] == ["a", "b"]
+        assert loaded.urlList == ["https://example.com/1"]
+
+        loaded.clear_pot()
+        backend.save_pot(loaded, paths["pot"])
+        empty = backend.load_pot(paths["pot"])
+        assert empty.recipes == [] and empty.urlList == []
+
+    def test_sessions_are_isolated(self, backend, paths, tmp_path):
+        from class_defs import RecipeGraph, Pot
+        other_dir = tmp_path / "session-b"
+        other_dir.mkdir()
+        graph = RecipeGraph()
+        graph.create_recipe_graph(_recipe("mine"))
+        backend.save_graph(graph, paths["graph"])
+        backend.save_graph(RecipeGraph(), str(other_dir / "recipe_graph.json"))
+        pot = Pot()
+        pot.add_url("https://example.com/mine")
+        backend.save_pot(pot, paths["pot"])
+
+        assert backend.load_graph(paths["graph"]).get_graph_size() == 1
+        assert backend.load_graph(str(other_dir / "recipe_graph.json")).get_graph_size() == 0
+        with pytest.raises(FileNotFoundError):
+            backend.load_pot(str(other_dir / "recipe_pot.json"))
+
+    def test_dropped_session_is_gone(self, backend, paths):
+        from class_defs import RecipeGraph, ModsList, Pot
+        backend.save_graph(RecipeGraph(), paths["graph"])
+        backend.save_mods_list(ModsList(), paths["mods"])
+        backend.save_pot(Pot(), paths["pot"])
+        session_dir = os.path.dirname(paths["graph"])
+
+        backend.drop_session(session_dir)
+        shutil.rmtree(session_dir)
+        for load, key in ((backend.load_graph, "graph"), (backend.load_mods_list, "mods"), (backend.load_pot, "pot")):
+            with pytest.raises(FileNotFoundError):
+                load(paths[key])
+
+    def test_wrapper_functions_and_tools_use_backend(self, backend, tmp_path):
+        import agent_tools
+        from class_defs import set_state_backend, load_pot_from_file, load_graph_from_file
+        from session_state import SessionState
+        set_state_backend(backend)
+        try:
+            from session import SessionManager
+            mgr = SessionManager(sessions_dir=str(tmp_path / "sessions"))
+            session_id = mgr.create_session("s1")
+            with mgr.session_scope(session_id):
+                assert isinstance(agent_tools._session_state.get(), SessionState)
+                agent_tools.add_url_to_pot.invoke({"url": "https://example.com/tool"})
+                agent_tools.create_recipe_graph.invoke({"recipe": _recipe("tool").model_dump()})
+            mgr.flush_all()
+            session_dir = mgr.get_session_dir(session_id)
+            assert load_pot_from_file(os.path.join(session_dir, "recipe_pot.json")).urlList == ["https://example.com/tool"]
+            assert load_graph_from_file(os.path.join(session_dir, "recipe_graph.json")).get_graph_size() == 1
+        finally:
+            set_state_backend(None)
+
+
+def _graph_with(recipe):
+    from class_defs import RecipeGraph
+    graph = RecipeGraph()
+    graph.create_recipe_graph(recipe)
+    return graph
+
+
+def test_incomplete_backend_cannot_be_created():
+    from class_defs import StateBackend, JsonBackend
+
+    class GraphsOnly(StateBackend):
+        load_graph = JsonBackend.load_graph
+        save_graph = JsonBackend.save_graph
+
+    with pytest.raises(TypeError):
+        GraphsOnly()
+
+
+class TestSqliteBackend:
+    @pytest.fixture
+    def db(self, tmp_path):
+        from class_defs import SqliteBackend
+        db = SqliteBackend(str(tmp_path / "state.db"))
+        yield db
+        db.close()
+
+    def test_wal_mode(self, db):
+        assert db._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_graph_save_writes_only_new_rows(self, db, paths):
+        from class_defs import RecipeGraph
+        graph = RecipeGraph()
+        graph.create_recipe_graph(_recipe("V0"))
+        for i in range(1, 30):
+            graph.add_node(_recipe(f"V{i}"))
+        db.save_graph(graph, paths["graph"])
+
+        loaded = db.load_graph(paths["graph"])
+        loaded.add_node(_recipe("next"))
+        before = db._conn.total_changes
+        db.save_graph(loaded, paths["graph"])
+        # One recipe row, one edge row, the graph row
+        assert db._conn.total_changes - before == 3
+
+    def test_cross_session_query(self, db, tmp_path):
+        from class_defs import RecipeGraph
+        for name in ("a", "b"):
+            (tmp_path / name).mkdir()
+            graph = RecipeGraph()
+            graph.create_recipe_graph(_recipe(f"bread-{name}"))
+            db.save_graph(graph, str(tmp_path / name / "recipe_graph.json"))
+        rows = db._conn.execute("SELECT session_id FROM recipes WHERE name LIKE 'bread-%' ORDER BY name").fetchall()
+        assert [os.path.basename(sid) for sid, in rows] == ["a", "b"]
+
+    def test_configured_backend(self, tmp_path, monkeypatch):
+        import config
+        from class_defs import get_state_backend, set_state_backend, SqliteBackend
+        monkeypatch.setattr(config, "STATE_BACKEND", "sqlite")
+        monkeypatch.setattr(config, "STATE_DB_FILE", str(tmp_path / "configured.db"))
+        set_state_backend(None)
+        try:
+            backend = get_state_backend()
+            assert isinstance(backend, SqliteBackend)
+            assert backend.db_path == str(tmp_path / "configured.db")
+            backend.close()
+        finally:
+            set_state_backend(None)
@@ -170,11 +170,12 @@ class TestMLServiceTechniques:
         CulinaryMLService.reset()
 
     def test_suggest_techniques_with_mock(self):
+        from affinity_models import TechniqueIndex
         from ml_service import CulinaryMLService
         service = CulinaryMLService()
-        service._technique_data = {
+        service._models.techniques = TechniqueIndex.from_counts({
             "chicken": Counter({"roast": 50, "grill": 30, "fry": 20, "braise": 10}),
-        }
+        })
         with patch.object(service, '_normalize', return_value='chicken'):
             results = service.suggest_techniques("chicken", n=3)
         assert len(results) == 3